@@ -0,0 +1,763 @@
+#!/usr/bin/env python3
+"""
+Async Transfer Engine
+Runs the downloads from Zoom and the resumable uploads to Google Drive as
+tasks on one asyncio event loop instead of one OS thread per stream, with
+semaphores for the number of files, segments and connections in flight.
+
+Used by download_zoom_recordings.py and zoom_to_drive.py with --engine async.
+Only the network I/O is async: the resume state, range planning, part files,
+checksums and upload journal are the threaded engine's own helpers, run off
+the loop with asyncio.to_thread(), so either engine can pick up a file the
+other left half done.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from urllib.parse import urlparse
+
+try:
+    import httpx
+    from google.auth.transport.requests import Request
+except ImportError as e:
+    print(f"Error: Missing required dependency - {e}")
+    print("\nThe async engine needs httpx:")
+    print("  pip install httpx")
+    sys.exit(1)
+
+from transfer_control import RetryPolicy, RetryCounter, TransferInterrupted, UNLIMITED
+from transfer_integrity import TransferDigest, ChecksumManifest, IntegrityError
+from transfer_metrics import NO_METRICS
+from download_zoom_recordings import (
+    USER_AGENT, READ_BUFFER_SIZE, CombinedProgress, RangeWriter, StreamWriter, download_info,
+    download_mode, prepare_ranges, check_range_response, finish_download, record_download,
+    plan_downloads
+)
+from upload_to_google_drive import MiB
+
+
+# Drive's media upload endpoint
+DRIVE_UPLOAD_URL = 'https://www.googleapis.com/upload/drive/v3/files'
+
+# File fields returned once an upload finishes, as for the threaded uploader
+UPLOAD_FIELDS = 'id, name, webViewLink, size, md5Checksum'
+
+# Seconds to wait for a connection or a read before it counts as dropped
+TIMEOUT = 30
+
+
+class _NoLimit:
+    """Async context manager that doesn't limit anything."""
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class AsyncLimiter:
+    """
+    A TransferLimiter for coroutines.
+    
+    The bytes are paced by the limiter's own token bucket, so a rate is
+    shared with any threads using it too, but deficits are slept off with
+    asyncio.sleep(). The per-host cap becomes one asyncio.Semaphore per
+    host, kept in ``slots``; limiters built on the same HostLimiter with
+    the same dict share their caps, like the threaded ones do.
+    """
+    
+    def __init__(self, limiter=None, slots=None):
+        limiter = limiter if limiter is not None else UNLIMITED
+        self.rate = limiter.rate
+        self.bucket = limiter.bucket
+        self.hosts = limiter.hosts
+        self._slots = slots if slots is not None else {}
+    
+    async def consume(self, amount):
+        """Account for amount bytes moved, sleeping if over the rate."""
+        if self.bucket is not None and amount > 0:
+            wait = self.bucket.reserve(amount)
+            if wait:
+                await asyncio.sleep(wait)
+    
+    def connection(self, url):
+        """Async context manager to hold while a request to url is open."""
+        if self.hosts is None:
+            return _NoLimit()
+        key = (id(self.hosts), urlparse(url).netloc)
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(self.hosts.per_host)
+        return self._slots[key]
+
+
+class _GateSlots:
+    """
+    Hands out the slots of a RetryPolicy's ConcurrencyGate to coroutines.
+    
+    The gate may be shared with threaded transfers, so waiting for it
+    blocks; that happens on a pool with a thread per job, which keeps both
+    the event loop and the default pool doing the file I/O free.
+    """
+    
+    def __init__(self, gate, jobs):
+        self.gate = gate
+        self._executor = ThreadPoolExecutor(max_workers=jobs) if gate is not None else None
+    
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one of the gate's slots (if there is a gate) for the enclosed transfer."""
+        if self.gate is None:
+            yield
+            return
+        
+        waiting = asyncio.get_running_loop().run_in_executor(self._executor, self.gate.__enter__)
+        try:
+            await asyncio.shield(waiting)
+        except asyncio.CancelledError:
+            # Give the slot back as soon as the abandoned wait gets it
+            waiting.add_done_callback(lambda _: self.gate.__exit__(asyncio.CancelledError, None, None))
+            raise
+        
+        try:
+            yield
+        except BaseException as e:
+            self.gate.__exit__(type(e), e, e.__traceback__)
+            raise
+        self.gate.__exit__(None, None, None)
+    
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+def _retryable(error):
+    """
+    httpx's connection errors aren't OSErrors; present them as
+    TransferInterrupted so RetryPolicy treats them like a dropped requests
+    connection.
+    """
+    if isinstance(error, (httpx.NetworkError, httpx.TimeoutException, httpx.RemoteProtocolError)):
+        return TransferInterrupted(f"Connection failed: {error}")
+    return error
+
+
+def _message(error):
+    """One line describing error; httpx adds a documentation link to status errors."""
+    error = _retryable(error)
+    lines = str(error).splitlines()
+    return lines[0] if lines else type(error).__name__
+
+
+async def _raise_for_status(response):
+    """raise_for_status() for a streamed response, with the body loaded for RetryPolicy."""
+    if response.is_error:
+        await response.aread()
+        response.raise_for_status()
+
+
+async def _gather(coros):
+    """Run coros concurrently; if one fails, cancel the others and re-raise."""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class AsyncTransferEngine:
+    """
+    Downloads (and optionally uploads) the files of one recording as
+    asyncio tasks over a single pooled httpx client.
+    
+    Use it as an async context manager so the client is closed again.
+    Downloads behave like download_file(): they resume from the ``.part``
+    file and its ``.part.json`` state, split large files into byte ranges,
+    retry under ``retry`` while holding one of its ConcurrencyGate slots,
+    and record their checksums and metrics.
+    """
+    
+    def __init__(self, jobs=4, segments=4, cookies=None, referer=None, retry=None, limiter=None,
+                 checksums=None, slots=None, metrics=None):
+        """
+        Args:
+            jobs: Files downloading at the same time
+            segments: Parallel byte ranges per large file
+            cookies: Cookies from the Playwright context, as for
+                create_download_session()
+            referer: Page URL to send as Referer
+            retry: RetryPolicy for dropped connections and 429/5xx responses
+            limiter: TransferLimiter for the download bandwidth and open
+                requests per host
+            checksums: ChecksumManifest to record each file's checksums in
+            slots: Per-host semaphores shared with an AsyncDriveUploader
+            metrics: TransferMetrics to record each download in
+        """
+        self.jobs = max(1, jobs)
+        self.segments = max(1, segments)
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.limiter = AsyncLimiter(limiter, slots)
+        self.checksums = checksums
+        self.metrics = metrics if metrics is not None else NO_METRICS
+        
+        headers = {'User-Agent': USER_AGENT}
+        if referer:
+            headers['Referer'] = referer
+        jar = httpx.Cookies()
+        for cookie in cookies or []:
+            jar.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''),
+                    path=cookie.get('path', '/'))
+        self._client_options = dict(
+            headers=headers, cookies=jar, follow_redirects=True, timeout=TIMEOUT,
+            limits=httpx.Limits(max_connections=self.jobs * self.segments)
+        )
+        self.http = None
+        self._job_slots = None
+        self._gate = None
+    
+    async def __aenter__(self):
+        self.http = httpx.AsyncClient(**self._client_options)
+        self._job_slots = asyncio.Semaphore(self.jobs)
+        self._gate = _GateSlots(self.retry.gate, self.jobs)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.http.aclose()
+        self._gate.close()
+        return False
+    
+    async def probe(self, url):
+        """probe_download() over the async client."""
+        try:
+            response = await self.http.head(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return download_info()
+        return download_info(response.headers)
+    
+    async def download_file(self, url, filepath, progress):
+        """
+        Download url to filepath, reporting to the shared progress bar.
+        
+        Returns:
+            True on success, False (after printing why) on failure
+        """
+        filepath = Path(filepath)
+        try:
+            async with self._job_slots, self._gate.slot():
+                with self.metrics.transfer('download', filepath.name) as timer:
+                    await self._download_file(url, filepath, progress, timer)
+            return True
+        except Exception as e:
+            progress.write(f"Error downloading file: {_message(e)}")
+            return False
+    
+    async def _download_file(self, url, filepath, progress, timer):
+        part_path = filepath.with_name(filepath.name + '.part')
+        timer.request()
+        info = await self.probe(url)
+        
+        mode = await asyncio.to_thread(download_mode, filepath, part_path, info)
+        if mode == 'done':
+            timer.skipped = True
+            progress.write(f"  ✓ Already downloaded: {filepath.name}")
+            return
+        
+        digest = self.checksums.digest() if self.checksums is not None else TransferDigest()
+        if mode == 'ranges':
+            await self._download_ranges(url, filepath, part_path, info, progress, timer, digest)
+        else:
+            await self._download_stream(url, filepath, part_path, info, progress, timer, digest)
+        
+        await asyncio.to_thread(record_download, self.checksums, filepath, info, digest)
+    
+    async def _download_ranges(self, url, filepath, part_path, info, progress, timer, digest):
+        """_download_ranges() with one task per byte range."""
+        state, ranges = await asyncio.to_thread(prepare_ranges, url, part_path, info, self.segments, digest)
+        done = state.completed_bytes()
+        
+        progress.add_total(info['size'])
+        if done:
+            progress.write(f"  ↻ Resuming {filepath.name} at {done / (1024 * 1024):.1f} MB")
+            progress.update(done)
+        
+        try:
+            await _gather(self._download_range(url, part_path, start, end, progress, state, timer,
+                                               digest if digest.complete else None)
+                          for start, end in ranges)
+        finally:
+            await asyncio.to_thread(state.save)
+        
+        await asyncio.to_thread(finish_download, filepath, part_path, state.completed_bytes(), info['size'],
+                                state)
+    
+    async def _download_range(self, url, part_path, start, end, progress, state, timer, digest):
+        """Fetch bytes start..end (inclusive) into part_path, retrying from the last byte written."""
+        position = start
+        retries = RetryCounter(self.retry, timer)
+        while True:
+            resumed_at = position
+            try:
+                async with self.limiter.connection(url):
+                    timer.request()
+                    async with self.http.stream('GET', url, headers={'Range': f'bytes={position}-{end}'}) as response:
+                        await _raise_for_status(response)
+                        check_range_response(response.status_code)
+                        
+                        part = await asyncio.to_thread(RangeWriter, part_path, position, state, digest)
+                        try:
+                            async for block in response.aiter_bytes(READ_BUFFER_SIZE):
+                                block = block[:end + 1 - position]
+                                position = await asyncio.to_thread(part.write, block)
+                                timer.add(len(block))
+                                progress.update(len(block))
+                                await self.limiter.consume(len(block))
+                                if position > end:
+                                    break
+                        finally:
+                            await asyncio.to_thread(part.close)
+                
+                if position <= end:
+                    raise TransferInterrupted(f"Range {start}-{end} ended early at byte {position}")
+                return
+            except Exception as e:
+                if position > resumed_at:
+                    retries.reset()  # Still making progress
+                await asyncio.sleep(retries.delay(_retryable(e)))
+    
+    async def _download_stream(self, url, filepath, part_path, info, progress, timer, digest):
+        """_download_stream() over the async client."""
+        retries = RetryCounter(self.retry, timer)
+        part = await asyncio.to_thread(StreamWriter, part_path, digest)
+        try:
+            while True:
+                resumed_at = part.written
+                try:
+                    async with self.limiter.connection(url):
+                        timer.request()
+                        headers = part.resume_headers(info['accepts_ranges'])
+                        async with self.http.stream('GET', url, headers=headers) as response:
+                            await _raise_for_status(response)
+                            await asyncio.to_thread(part.start, response.status_code, response.headers, progress)
+                            resumed_at = min(resumed_at, part.written)
+                            
+                            async for block in response.aiter_bytes(READ_BUFFER_SIZE):
+                                await asyncio.to_thread(part.write, block)
+                                timer.add(len(block))
+                                progress.update(len(block))
+                                await self.limiter.consume(len(block))
+                    
+                    part.check_complete()
+                    break
+                except Exception as e:
+                    if part.written > resumed_at:
+                        retries.reset()  # Still making progress
+                    await asyncio.sleep(retries.delay(_retryable(e)))
+        finally:
+            await asyncio.to_thread(part.close)
+        
+        await asyncio.to_thread(finish_download, filepath, part_path, part.written, part.total_size or None)
+    
+    async def download_all(self, download_links, download_folder):
+        """
+        Download every link into download_folder.
+        
+        Returns:
+            (successful, failed) counts
+        """
+        planned = plan_downloads(download_links, download_folder)
+        for i, (link, filename, filepath, file_type) in enumerate(planned, 1):
+            print(f"[{i}/{len(planned)}] {file_type}")
+            print(f"  → {filename}")
+        print(f"\n⚡ Downloading {len(planned)} files with {min(self.jobs, len(planned))} parallel jobs (async)\n")
+        
+        progress = CombinedProgress(description="  Downloading")
+        
+        async def download(filename, filepath, url):
+            if await self.download_file(url, filepath, progress):
+                progress.write(f"  ✓ Saved to {filepath}")
+                return True
+            progress.write(f"  ✗ Failed to download {filename}")
+            return False
+        
+        try:
+            results = await asyncio.gather(*(download(filename, filepath, link['url'])
+                                             for link, filename, filepath, file_type in planned))
+        finally:
+            progress.close()
+        
+        successful = sum(results)
+        return successful, len(results) - successful
+    
+    async def transfer(self, download_links, download_folder, uploader, folder_id):
+        """
+        Download every link and upload each file to Drive as soon as it is
+        on disk, like zoom_to_drive.transfer().
+        
+        Args:
+            uploader: AsyncDriveUploader to upload with
+            folder_id: Drive folder to upload into
+        
+        Returns:
+            Dictionary with downloaded, uploaded and failed counts
+        """
+        planned = plan_downloads(download_links, download_folder)
+        stats = {'downloaded': 0, 'uploaded': 0, 'failed': 0}
+        download_progress = CombinedProgress(description="  Downloading")
+        upload_progress = CombinedProgress(description="  Uploading")
+        
+        async def transfer_one(link, filepath):
+            if not await self.download_file(link['url'], filepath, download_progress):
+                download_progress.write(f"  ✗ Failed to download {filepath.name}")
+                stats['failed'] += 1
+                return
+            stats['downloaded'] += 1
+            upload_progress.add_total(filepath.stat().st_size)
+            file_id = await uploader.upload_file(str(filepath), folder_id, upload_progress)
+            stats['uploaded' if file_id else 'failed'] += 1
+        
+        try:
+            await asyncio.gather(*(transfer_one(link, filepath)
+                                   for link, filename, filepath, file_type in planned))
+        finally:
+            download_progress.close()
+            upload_progress.close()
+        return stats
+
+
+class AsyncDriveUploader:
+    """
+    Drive resumable uploads over httpx, for an authenticated
+    GoogleDriveUploader.
+    
+    Takes the uploader's credentials, retry policy and ConcurrencyGate,
+    bandwidth limit, chunk settings, upload journal, checksum manifest and
+    metrics. googleapiclient only speaks blocking HTTP, so the resumable
+    protocol itself is spoken here: one session per file, each chunk sent
+    as a PUT with a Content-Range, and after an error Drive is asked how
+    many bytes it kept before carrying on from there. Files smaller than
+    the uploader's multipart threshold go up in one multipart request.
+    """
+    
+    def __init__(self, uploader, jobs=2, slots=None):
+        """
+        Args:
+            uploader: GoogleDriveUploader that has already authenticated
+            jobs: Files uploading at the same time
+            slots: Per-host semaphores shared with an AsyncTransferEngine
+        """
+        self.uploader = uploader
+        self.jobs = max(1, jobs)
+        self.retry = uploader.retry
+        self.limiter = AsyncLimiter(uploader.limiter, slots)
+        self.journal = uploader.journal
+        self.metrics = uploader.metrics
+        self.http = None
+        self._job_slots = None
+        self._gate = None
+        self._auth_lock = None
+    
+    async def __aenter__(self):
+        self.http = httpx.AsyncClient(timeout=TIMEOUT, limits=httpx.Limits(max_connections=self.jobs))
+        self._job_slots = asyncio.Semaphore(self.jobs)
+        self._gate = _GateSlots(self.retry.gate, self.jobs)
+        self._auth_lock = asyncio.Lock()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.http.aclose()
+        self._gate.close()
+        return False
+    
+    async def _auth_headers(self):
+        """Authorization header, refreshing the token in a thread when it has expired."""
+        credentials = self.uploader.credentials
+        async with self._auth_lock:
+            if not credentials.valid:
+                await asyncio.to_thread(credentials.refresh, Request())
+            headers = {}
+            credentials.apply(headers)
+            return headers
+    
+    async def _send(self, method, url, timer, headers=None, **kwargs):
+        """One authorized request to Drive, counted like the threaded uploader's API calls."""
+        request_headers = await self._auth_headers()
+        request_headers.update(headers or {})
+        async with self.limiter.connection(url):
+            self.metrics.count('drive_api_calls')
+            timer.request()
+            return await self.http.request(method, url, headers=request_headers, **kwargs)
+    
+    async def _backoff(self, retries, error, sizer=None):
+        """Wait before retrying after error, or re-raise it if it can't be retried."""
+        delay = retries.delay(_retryable(error))
+        self.metrics.count('drive_retries')
+        if sizer is not None:
+            sizer.record_error()
+        await asyncio.sleep(delay)
+    
+    async def upload_file(self, file_path, parent_id=None, progress=None):
+        """
+        Upload a file to Google Drive.
+        
+        Args:
+            file_path: Path to the local file
+            parent_id: ID of the parent folder (None for root)
+            progress: Shared CombinedProgress to report to
+        
+        Returns:
+            File ID if successful, None otherwise
+        """
+        log = progress.write if progress is not None else print
+        reported = 0
+        
+        def report(uploaded):
+            nonlocal reported
+            if progress is not None:
+                progress.update(uploaded - reported)
+            reported = uploaded
+        
+        try:
+            async with self._job_slots, self._gate.slot():
+                with self.metrics.transfer('upload', os.path.basename(file_path)) as timer:
+                    response = await self._upload_file(file_path, parent_id, report, log, timer)
+        except IntegrityError as error:
+            report(0)
+            log(f"❌ Upload of {file_path} is corrupt: {error}")
+        except Exception as error:
+            report(0)
+            log(f"❌ Error uploading {file_path}: {_message(error)}")
+        else:
+            log(f"✅ Uploaded: {os.path.basename(file_path)}")
+            return response.get('id')
+        return None
+    
+    async def _upload_file(self, file_path, parent_id, report, log, timer):
+        file_name, mime_type, file_metadata = self.uploader.upload_metadata(file_path, parent_id)
+        file_size = os.path.getsize(file_path)
+        checksums = self.uploader.checksums
+        digest = checksums.digest() if checksums is not None else TransferDigest()
+        
+        def checkpoint(uploaded):
+            timer.add(uploaded - timer.bytes)
+            report(uploaded)
+        
+        if file_size < self.uploader.multipart_threshold:
+            response = await self._upload_multipart(file_path, file_metadata, mime_type, digest, timer)
+        else:
+            response = await self._upload_resumable(file_path, parent_id, file_metadata, mime_type,
+                                                    file_size, digest, checkpoint, log, timer)
+        checkpoint(file_size)
+        
+        await asyncio.to_thread(self.uploader.verify_upload, ChecksumManifest.key(file_path), file_name,
+                                file_size, digest, response)
+        return response
+    
+    async def _upload_multipart(self, file_path, file_metadata, mime_type, digest, timer):
+        """Send a small file and its metadata in one request."""
+        data = await asyncio.to_thread(Path(file_path).read_bytes)
+        digest.update(data)
+        
+        boundary = uuid.uuid4().hex
+        body = b''.join([
+            f'--{boundary}\r\nContent-Type: application/json; charset=UTF-8\r\n\r\n'.encode(),
+            json.dumps(file_metadata).encode(),
+            f'\r\n--{boundary}\r\nContent-Type: {mime_type}\r\n\r\n'.encode(),
+            data,
+            f'\r\n--{boundary}--'.encode(),
+        ])
+        
+        retries = RetryCounter(self.retry, timer)
+        while True:
+            try:
+                response = await self._send(
+                    'POST', DRIVE_UPLOAD_URL, timer, content=body,
+                    headers={'Content-Type': f'multipart/related; boundary="{boundary}"'},
+                    params={'uploadType': 'multipart', 'fields': UPLOAD_FIELDS})
+                response.raise_for_status()
+                await self.limiter.consume(len(data))
+                return response.json()
+            except Exception as e:
+                await self._backoff(retries, e)
+    
+    async def _start_session(self, file_metadata, mime_type, file_size, timer):
+        """Open a resumable upload session; returns its URI."""
+        response = await self._send(
+            'POST', DRIVE_UPLOAD_URL, timer, json=file_metadata,
+            headers={'X-Upload-Content-Type': mime_type, 'X-Upload-Content-Length': str(file_size)},
+            params={'uploadType': 'resumable', 'fields': UPLOAD_FIELDS})
+        response.raise_for_status()
+        return response.headers['location']
+    
+    @staticmethod
+    def _read_block(f, position, size, digest):
+        """Read size bytes of f at position and feed them to digest."""
+        f.seek(position)
+        block = f.read(size)
+        if not block:
+            raise IOError(f"{f.name} shrank while uploading")
+        digest.update_at(position, block)
+        return block
+    
+    async def _read_chunk(self, file_path, start, length, digest):
+        """Yield length bytes of file_path from start, hashing and pacing them."""
+        f = await asyncio.to_thread(open, file_path, 'rb')
+        try:
+            position = start
+            while position < start + length:
+                block = await asyncio.to_thread(self._read_block, f, position,
+                                                min(READ_BUFFER_SIZE, start + length - position), digest)
+                position += len(block)
+                await self.limiter.consume(len(block))
+                yield block
+        finally:
+            f.close()
+    
+    async def _put(self, session_uri, file_size, timer, start=None, length=0, file_path=None, digest=None):
+        """
+        Send the chunk of length bytes at start, or with no start only ask
+        Drive how much of the file it has.
+        
+        Returns:
+            (offset, response): the first byte Drive doesn't have yet, and
+            the file resource once the upload is complete (else None)
+        """
+        if start is None:
+            headers = {'Content-Range': f'bytes */{file_size}'}
+            content = b''
+        else:
+            headers = {'Content-Range': f'bytes {start}-{start + length - 1}/{file_size}',
+                       'Content-Length': str(length)}
+            content = self._read_chunk(file_path, start, length, digest)
+        
+        response = await self._send('PUT', session_uri, timer, headers=headers, content=content)
+        if response.status_code == 308:
+            received = response.headers.get('range')
+            return (int(received.rsplit('-', 1)[1]) + 1 if received else 0), None
+        response.raise_for_status()
+        return file_size, response.json()
+    
+    @staticmethod
+    def _hash_prefix(file_path, digest, end):
+        """Feed digest the bytes before end that a resumed session won't send again."""
+        with open(file_path, 'rb') as f:
+            f.seek(digest.position)
+            while digest.position < end:
+                block = f.read(min(READ_BUFFER_SIZE, end - digest.position))
+                if not block:
+                    return
+                digest.update(block)
+    
+    async def _upload_resumable(self, file_path, parent_id, file_metadata, mime_type, file_size, digest,
+                                report, log, timer):
+        """Upload in chunks over a resumable session, continuing a journaled one if possible."""
+        file_name = file_metadata['name']
+        sizer, chunk_size = self.uploader.chunk_settings()
+        
+        session_uri = None
+        journal_key, mtime, entry = self.uploader.journaled_session(file_path, parent_id, file_size)
+        if entry:
+            session_uri = entry['session_uri']
+            log(f"↻ Resuming {file_name} from {entry['offset'] / MiB:.1f} MiB")
+        resumed = session_uri is not None
+        
+        offset = 0
+        response = None
+        query = resumed  # Ask Drive where to continue before sending anything
+        retries = RetryCounter(self.retry, timer)
+        while response is None:
+            sent_from = offset
+            try:
+                if session_uri is None:
+                    session_uri = await self._start_session(file_metadata, mime_type, file_size, timer)
+                    offset = 0
+                if query:
+                    offset, response = await self._put(session_uri, file_size, timer)
+                    query = False
+                else:
+                    if digest.position < offset:
+                        await asyncio.to_thread(self._hash_prefix, file_path, digest, offset)
+                    length = min(sizer.chunksize if sizer else chunk_size, file_size - offset)
+                    started = time.monotonic()
+                    offset, response = await self._put(session_uri, file_size, timer, offset, length,
+                                                       file_path, digest)
+                    if sizer is not None:
+                        sizer.record_success(offset - sent_from, time.monotonic() - started)
+                report(offset)
+                if offset > sent_from:
+                    retries.reset()
+                if journal_key and response is None:
+                    await asyncio.to_thread(self.journal.record, journal_key, session_uri, offset, file_size,
+                                            mtime)
+            except httpx.HTTPStatusError as e:
+                if resumed and e.response.status_code in (404, 410):
+                    # The saved session expired; start a fresh upload
+                    log(f"↻ Upload session for {file_name} expired, starting over")
+                    await asyncio.to_thread(self.journal.remove, journal_key)
+                    session_uri = None
+                    resumed = query = False
+                    continue
+                await self._backoff(retries, e, sizer)
+                query = True
+            except Exception as e:
+                await self._backoff(retries, e, sizer)
+                query = session_uri is not None
+        
+        if journal_key:
+            await asyncio.to_thread(self.journal.remove, journal_key)
+        return response
+
+
+def download_all(download_links, download_folder, cookies=None, referer=None, jobs=4, segments=4,
+                 retry=None, limiter=None, checksums=None, metrics=None):
+    """
+    download_zoom_recordings.download_all() on the async engine.
+    
+    Args:
+        cookies: Cookies from the Playwright context
+        referer: Page URL to send as Referer
+    
+    Returns:
+        (successful, failed) counts
+    """
+    async def run():
+        async with AsyncTransferEngine(jobs=jobs, segments=segments, cookies=cookies, referer=referer,
+                                       retry=retry, limiter=limiter, checksums=checksums,
+                                       metrics=metrics) as engine:
+            return await engine.download_all(download_links, download_folder)
+    
+    return asyncio.run(run())
+
+
+def transfer(download_links, download_folder, uploader, folder_id, cookies=None, referer=None, jobs=4,
+             upload_jobs=2, segments=4, retry=None, limiter=None, checksums=None, metrics=None):
+    """
+    zoom_to_drive.transfer() on the async engine.
+    
+    ``uploader`` is an authenticated GoogleDriveUploader; its retry policy,
+    upload limiter, journal, checksum manifest and metrics are used for the
+    uploads. Per-host connection caps are shared between the two directions
+    when both limiters use the same HostLimiter.
+    
+    Returns:
+        Dictionary with downloaded, uploaded and failed counts
+    """
+    async def run():
+        slots = {}
+        async with AsyncTransferEngine(jobs=jobs, segments=segments, cookies=cookies, referer=referer,
+                                       retry=retry, limiter=limiter, checksums=checksums, slots=slots,
+                                       metrics=metrics) as engine:
+            async with AsyncDriveUploader(uploader, jobs=upload_jobs, slots=slots) as drive:
+                return await engine.transfer(download_links, download_folder, drive, folder_id)
+    
+    return asyncio.run(run())
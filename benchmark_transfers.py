@@ -0,0 +1,726 @@
+#!/usr/bin/env python3
+"""
+Transfer Benchmarks
+Measures the download, link discovery and Drive upload paths end to end
+against local stand-ins for a Zoom recording share and the Google Drive
+API, so throughput regressions show up without network access, a Zoom
+account or Google credentials.
+"""
+
+import os
+import sys
+import re
+import abc
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import itertools
+import tempfile
+import threading
+import subprocess
+from email import message_from_bytes
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs, quote, unquote
+
+from transfer_metrics import TransferMetrics
+
+
+MiB = 1024 * 1024
+
+# Synthetic files repeat one random block of this size
+PATTERN_SIZE = MiB
+
+# Replies are written in pieces of at most this size
+WRITE_SIZE = 256 * 1024
+
+GOOGLE_APIS = 'https://www.googleapis.com'
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+MEETING_TOPIC = 'Benchmark Recording'
+SHARE_ID = 'benchmark'
+
+SHARE_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>{topic}</title></head>
+<body>
+<h1 class="topic">{topic}</h1>
+<ul>
+{links}
+</ul>
+<script>fetch('/nws/recording/1.0/play/share-info/{share_id}').then(r => r.json());</script>
+</body>
+</html>
+"""
+
+SHARE_LINK = '<li><a class="download-btn" href="{url}" download="{name}">Download {name}</a></li>'
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Request handler shared by the stand-ins; routing is up to ``server.stand_in``."""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_HEAD(self):
+        self.server.stand_in.handle(self, 'HEAD')
+    
+    def do_GET(self):
+        self.server.stand_in.handle(self, 'GET')
+    
+    def do_POST(self):
+        self.server.stand_in.handle(self, 'POST')
+    
+    def do_PUT(self):
+        self.server.stand_in.handle(self, 'PUT')
+    
+    def do_PATCH(self):
+        self.server.stand_in.handle(self, 'PATCH')
+
+
+class StandInServer(abc.ABC):
+    """
+    Base for the local stand-in servers.
+    
+    Every request is counted and, with ``latency``, answered only after that
+    many seconds. With ``fault_rate``, that share of the requests that
+    move file contents fail the way a busy server fails.
+    """
+    
+    def __init__(self, latency=0.0, fault_rate=0.0, seed=0):
+        self.latency = latency
+        self.fault_rate = fault_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._httpd = None
+        self.base_url = None
+    
+    def start(self):
+        """Start serving on a free local port in a background thread."""
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stand_in = self
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+    
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def take_requests(self):
+        """Requests served since the last call."""
+        with self._lock:
+            requests, self._requests = self._requests, 0
+        return requests
+    
+    def fault(self):
+        """Whether the current request should fail."""
+        with self._lock:
+            return self._random.random() < self.fault_rate
+    
+    def handle(self, handler, method):
+        with self._lock:
+            self._requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            self.route(handler, method, urlparse(handler.path))
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up on the reply, e.g. after a timeout
+            handler.close_connection = True
+    
+    @abc.abstractmethod
+    def route(self, handler, method, url):
+        """Answer one request; url is the urlparse() result of its path."""
+    
+    @staticmethod
+    def reply(handler, status, body=b'', content_type='application/json', headers=None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        elif isinstance(body, str):
+            body = body.encode()
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.send_header('Content-Type', content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        if handler.command != 'HEAD':
+            handler.wfile.write(body)
+    
+    @staticmethod
+    def read_body(handler, sink=None):
+        """Read the request body, feeding it to sink piece by piece if given, else returning it."""
+        remaining = int(handler.headers.get('Content-Length') or 0)
+        pieces = []
+        while remaining:
+            piece = handler.rfile.read(min(remaining, WRITE_SIZE))
+            if not piece:
+                break
+            remaining -= len(piece)
+            if sink is not None:
+                sink(piece)
+            else:
+                pieces.append(piece)
+        return b''.join(pieces)
+
+
+class FakeZoomServer(StandInServer):
+    """
+    Local stand-in for a Zoom recording share.
+    
+    /rec/share/<id> is a share page listing every file both as download
+    links and in the JSON it fetches for itself, and /rec/download/<name>
+    serves the files with HEAD, Range and ETag support. The files are
+    synthetic: they repeat one random block, so they take no memory or disk
+    space however large they are. File downloads hit by ``fault_rate``
+    either get a 503 or lose the connection halfway through the body.
+    """
+    
+    def __init__(self, latency=0.0, fault_rate=0.0, seed=0):
+        super().__init__(latency, fault_rate, seed)
+        block = random.Random(seed).getrandbits(PATTERN_SIZE * 8).to_bytes(PATTERN_SIZE, 'little')
+        # Twice over, so any offset into the pattern has a contiguous block behind it
+        self._pattern = memoryview(block * 2)
+        self.files = {}
+    
+    @property
+    def share_url(self):
+        return f"{self.base_url}/rec/share/{SHARE_ID}"
+    
+    def set_files(self, sizes):
+        """Serve files of the given sizes (name -> bytes) from now on."""
+        self.files = dict(sizes)
+    
+    def file_url(self, name):
+        return f"{self.base_url}/rec/download/{quote(name)}"
+    
+    def links(self):
+        """The files in find_download_links() format."""
+        return [{'url': self.file_url(name), 'filename': name, 'type': name} for name in self.files]
+    
+    def route(self, handler, method, url):
+        if url.path.startswith('/rec/share/'):
+            links = '\n'.join(SHARE_LINK.format(url=f"/rec/download/{quote(name)}", name=name)
+                              for name in self.files)
+            page = SHARE_PAGE.format(topic=MEETING_TOPIC, links=links, share_id=SHARE_ID)
+            return self.reply(handler, 200, page, 'text/html; charset=utf-8')
+        
+        if url.path.startswith('/nws/recording/'):
+            files = [{'fileName': name, 'fileType': os.path.splitext(name)[1][1:].upper(),
+                      'fileSize': size, 'downloadUrl': f"/rec/download/{quote(name)}"}
+                     for name, size in self.files.items()]
+            return self.reply(handler, 200, {'status': True, 'result': {'topic': MEETING_TOPIC,
+                                                                         'recordFiles': files}})
+        
+        if url.path.startswith('/rec/download/'):
+            name = unquote(url.path[len('/rec/download/'):])
+            if name in self.files:
+                return self._serve_file(handler, name, self.files[name])
+        
+        return self.reply(handler, 404, {'error': 'not found'})
+    
+    def _serve_file(self, handler, name, size):
+        etag = f'"{hashlib.md5(f"{name}:{size}".encode()).hexdigest()}"'
+        headers = {'Accept-Ranges': 'bytes', 'ETag': etag}
+        start, end = 0, size - 1
+        status = 200
+        
+        match = re.match(r'bytes=(\d*)-(\d*)$', handler.headers.get('Range', ''))
+        if match and handler.headers.get('If-Range', etag) == etag:
+            first, last = match.groups()
+            if first:
+                start, end = int(first), min(int(last), size - 1) if last else size - 1
+            else:
+                start = max(0, size - int(last))
+            if start >= size or start > end:
+                return self.reply(handler, 416, headers={'Content-Range': f"bytes */{size}"})
+            status = 206
+            headers['Content-Range'] = f"bytes {start}-{end}/{size}"
+        
+        drop = False
+        if handler.command == 'GET' and self.fault():
+            if self._random.random() < 0.5:
+                return self.reply(handler, 503, {'error': 'injected'}, headers={'Retry-After': '0'})
+            drop = True
+        
+        handler.send_response(status)
+        for header, value in headers.items():
+            handler.send_header(header, value)
+        handler.send_header('Content-Type', 'video/mp4')
+        handler.send_header('Content-Length', str(end - start + 1))
+        handler.end_headers()
+        if handler.command == 'HEAD':
+            return
+        
+        if drop:
+            end = start + (end - start) // 2
+        position = start
+        while position <= end:
+            offset = position % PATTERN_SIZE
+            length = min(WRITE_SIZE, end + 1 - position)
+            handler.wfile.write(self._pattern[offset:offset + length])
+            position += length
+        if drop:
+            handler.close_connection = True
+
+
+class FakeDriveServer(StandInServer):
+    """
+    Local stand-in for the parts of the Drive v3 API the uploader uses.
+    
+    Supports files.list (with the name, parents and folder filters the
+    uploader sends), files.create for folders, multipart uploads and
+    resumable upload sessions including status queries. Uploaded contents
+    are only hashed, not kept. Upload requests hit by ``fault_rate`` get a
+    503.
+    """
+    
+    def __init__(self, latency=0.0, fault_rate=0.0, seed=0):
+        super().__init__(latency, fault_rate, seed)
+        self._ids = itertools.count(1)
+        self.files = {}
+        self._sessions = {}
+    
+    def _new_file(self, metadata, size=None, md5=None):
+        file_id = f"file{next(self._ids)}"
+        entry = {'id': file_id, 'name': metadata.get('name', 'Untitled'),
+                 'mimeType': metadata.get('mimeType', 'application/octet-stream'),
+                 'parents': metadata.get('parents', ['root']),
+                 'webViewLink': f"{self.base_url}/file/{file_id}"}
+        if size is not None:
+            entry.update(size=str(size), md5Checksum=md5)
+        with self._lock:
+            self.files[file_id] = entry
+        return entry
+    
+    def route(self, handler, method, url):
+        query = parse_qs(url.query)
+        if url.path.startswith('/upload/drive/v3/files'):
+            return self._upload(handler, method, query)
+        if url.path.rstrip('/') == '/drive/v3/files':
+            if method == 'GET':
+                return self._list(handler, query)
+            metadata = json.loads(self.read_body(handler) or b'{}')
+            return self.reply(handler, 200, self._new_file(metadata))
+        match = re.match(r'/drive/v3/files/([^/]+)$', url.path)
+        if match and method == 'GET' and match.group(1) in self.files:
+            return self.reply(handler, 200, self.files[match.group(1)])
+        return self.reply(handler, 404, {'error': {'code': 404, 'message': f"Not found: {url.path}"}})
+    
+    def _list(self, handler, query):
+        q = query.get('q', [''])[0].replace(' ', '')
+        files = list(self.files.values())
+        name = re.search(r"name='((?:[^'\\]|\\.)*)'", q)
+        if name:
+            files = [f for f in files if f['name'] == name.group(1).replace("\\'", "'")]
+        parent = re.search(r"'([^']+)'inparents", q)
+        if parent:
+            files = [f for f in files if parent.group(1) in f['parents']]
+        if f"mimeType='{FOLDER_MIME_TYPE}'" in q:
+            files = [f for f in files if f['mimeType'] == FOLDER_MIME_TYPE]
+        elif f"mimeType!='{FOLDER_MIME_TYPE}'" in q:
+            files = [f for f in files if f['mimeType'] != FOLDER_MIME_TYPE]
+        
+        page_size = int(query.get('pageSize', ['100'])[0])
+        start = int(query.get('pageToken', ['0'])[0])
+        result = {'files': files[start:start + page_size]}
+        if start + page_size < len(files):
+            result['nextPageToken'] = str(start + page_size)
+        return self.reply(handler, 200, result)
+    
+    def _upload(self, handler, method, query):
+        upload_type = query.get('uploadType', [''])[0]
+        if 'upload_id' in query:
+            return self._upload_chunk(handler, query['upload_id'][0])
+        
+        if upload_type == 'resumable':
+            metadata = json.loads(self.read_body(handler) or b'{}')
+            upload_id = f"session{next(self._ids)}"
+            with self._lock:
+                self._sessions[upload_id] = {'metadata': metadata, 'md5': hashlib.md5(),
+                                             'size': 0, 'file': None, 'lock': threading.Lock()}
+            location = f"{GOOGLE_APIS}/upload/drive/v3/files?uploadType=resumable&upload_id={upload_id}"
+            return self.reply(handler, 200, {}, headers={'Location': location})
+        
+        if upload_type == 'multipart':
+            body = self.read_body(handler)
+            if self.fault():
+                return self.reply(handler, 503, {'error': {'code': 503, 'message': 'injected'}})
+            content_type = handler.headers['Content-Type'].encode()
+            message = message_from_bytes(b'Content-Type: ' + content_type + b'\r\n\r\n' + body)
+            metadata_part, media_part = message.get_payload()
+            metadata = json.loads(metadata_part.get_payload(decode=True) or b'{}')
+            media = media_part.get_payload(decode=True) or b''
+            entry = self._new_file(metadata, len(media), hashlib.md5(media).hexdigest())
+            return self.reply(handler, 200, entry)
+        
+        return self.reply(handler, 400, {'error': {'code': 400, 'message': f"uploadType {upload_type}"}})
+    
+    def _upload_chunk(self, handler, upload_id):
+        with self._lock:
+            session = self._sessions.get(upload_id)
+        if session is None:
+            self.read_body(handler)
+            return self.reply(handler, 404, {'error': {'code': 404, 'message': 'Upload session not found'}})
+        
+        content_range = handler.headers.get('Content-Range', '')
+        match = re.match(r'bytes (\d+)-(\d+)/(\d+|\*)$', content_range)
+        if match and self.fault():
+            self.read_body(handler)
+            return self.reply(handler, 503, {'error': {'code': 503, 'message': 'injected'}})
+        
+        # A chunk resent after a timeout may arrive while the first one is still being read
+        with session['lock']:
+            if match and int(match.group(1)) == session['size']:
+                def sink(piece):
+                    session['md5'].update(piece)
+                    session['size'] += len(piece)
+                self.read_body(handler, sink)
+            else:
+                # Status queries ("bytes */<total>") and chunks out of sequence add nothing
+                self.read_body(handler)
+            total = match.group(3) if match else (content_range.rsplit('/', 1)[-1] if content_range else '*')
+            
+            size = session['size']
+            if total != '*' and size >= int(total) and session['file'] is None:
+                session['file'] = self._new_file(session['metadata'], size, session['md5'].hexdigest())
+            entry = session['file']
+        
+        if entry is not None:
+            return self.reply(handler, 200, entry)
+        headers = {'Range': f"bytes=0-{size - 1}"} if size else {}
+        return self.reply(handler, 308, b'', headers=headers)
+
+
+def connect_drive_stand_in(uploader, base_url):
+    """
+    Point a GoogleDriveUploader at a FakeDriveServer.
+    
+    Hands the uploader anonymous credentials and a transport factory whose
+    transports rewrite www.googleapis.com URLs to base_url.
+    """
+    import httplib2
+    from google.auth.credentials import AnonymousCredentials
+    
+    class LocalHttp(httplib2.Http):
+        def request(self, uri, *args, **kwargs):
+            if uri.startswith(GOOGLE_APIS):
+                uri = base_url + uri[len(GOOGLE_APIS):]
+            return super().request(uri, *args, **kwargs)
+    
+    def build_http():
+        http = LocalHttp(timeout=60)
+        # As googleapiclient's build_http(): 308 is resumable upload progress, not a redirect
+        http.redirect_codes = http.redirect_codes - {308}
+        return http
+    
+    uploader.use_credentials(AnonymousCredentials(), http_factory=build_http)
+
+
+def write_synthetic_file(path, size, seed=0):
+    """Write size bytes of repeating random data to path."""
+    block = random.Random(seed).getrandbits(PATTERN_SIZE * 8).to_bytes(PATTERN_SIZE, 'little')
+    with open(path, 'wb') as f:
+        remaining = size
+        while remaining:
+            remaining -= f.write(block[:min(remaining, PATTERN_SIZE)])
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values (None for no values)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mib():
+    """Peak resident memory of this process in MiB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return round(peak / MiB if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def transfer_seconds(log_file):
+    """Seconds each file took, from a TransferMetrics event log."""
+    seconds = []
+    with open(log_file) as f:
+        for line in f:
+            event = json.loads(line)
+            if event['event'] == 'transfer' and not event['skipped']:
+                seconds.append(event['seconds'])
+    return seconds
+
+
+def _bench_download(spec):
+    from transfer_control import RetryPolicy
+    from download_zoom_recordings import download_all, create_download_session
+    
+    metrics = TransferMetrics(spec['log_file'])
+    session = create_download_session(pool_size=spec['jobs'] * spec['segments'])
+    started = time.monotonic()
+    successful, failed = download_all(spec['links'], Path(spec['folder']), jobs=spec['jobs'],
+                                      segments=spec['segments'], session=session,
+                                      retry=RetryPolicy(base_delay=spec['retry_delay']), metrics=metrics)
+    seconds = time.monotonic() - started
+    metrics.finish()
+    return {'seconds': seconds, 'failed': failed, 'latencies': transfer_seconds(spec['log_file'])}
+
+
+def _bench_upload(spec):
+    from transfer_control import RetryPolicy
+    from upload_to_google_drive import GoogleDriveUploader
+    
+    metrics = TransferMetrics(spec['log_file'])
+    uploader = GoogleDriveUploader(chunk_size=spec['chunk_size'], journal_file=None,
+                                   manifest_file=os.path.join(spec['work_dir'], 'manifest.json'),
+                                   retry=RetryPolicy(base_delay=spec['retry_delay']), metrics=metrics)
+    connect_drive_stand_in(uploader, spec['drive_url'])
+    started = time.monotonic()
+    stats = uploader.upload_folder(spec['folder'], drive_folder_name=spec['drive_folder'],
+                                   show_progress=False, jobs=spec['jobs'])
+    seconds = time.monotonic() - started
+    metrics.finish()
+    return {'seconds': seconds, 'failed': stats['failed'], 'latencies': transfer_seconds(spec['log_file'])}
+
+
+def _bench_discovery(spec):
+    from download_zoom_recordings import (
+        sync_playwright, new_scrape_context, open_recording_page, find_download_links
+    )
+    
+    latencies = []
+    failed = 0
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            return {'skipped': str(e).splitlines()[0]}
+        context = new_scrape_context(browser)
+        started = time.monotonic()
+        for _ in range(spec['pages']):
+            page_started = time.monotonic()
+            page, collector = open_recording_page(context, spec['url'])
+            links = find_download_links(page, collector, discovery=spec['discovery'])
+            latencies.append(time.monotonic() - page_started)
+            failed += len(links) != spec['files']
+            page.close()
+        seconds = time.monotonic() - started
+        browser.close()
+    return {'seconds': seconds, 'failed': failed, 'latencies': latencies}
+
+
+SCENARIOS = {
+    'download': _bench_download,
+    'upload': _bench_upload,
+    'discovery': _bench_discovery,
+}
+
+
+def run_scenario(spec, verbose=False):
+    """
+    Run one benchmark in a fresh Python process, so its peak RSS is its
+    own and nothing is shared with earlier runs but the stand-in servers.
+    
+    Returns:
+        The scenario's result dictionary, with peak_rss_mib added
+    """
+    with tempfile.TemporaryDirectory(prefix='zoom-bench-') as work_dir:
+        spec = dict(spec, work_dir=work_dir, log_file=os.path.join(work_dir, 'metrics.jsonl'))
+        if spec['suite'] == 'download':
+            spec['folder'] = os.path.join(work_dir, 'downloads')
+            os.makedirs(spec['folder'])
+        result_file = os.path.join(work_dir, 'result.json')
+        output = None if verbose else subprocess.DEVNULL
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--scenario', json.dumps(spec),
+                        '--result-file', result_file],
+                       stdout=output, stderr=output, check=True)
+        with open(result_file) as f:
+            return json.load(f)
+
+
+def summarize(suite, params, result, requests, files, total_bytes):
+    """One result row: throughput, per-file latency percentiles, memory and requests per file."""
+    row = dict(suite=suite, **params)
+    if 'skipped' in result:
+        row['skipped'] = result['skipped']
+        return row
+    
+    latencies = result['latencies']
+    seconds = result['seconds']
+    row.update(
+        seconds=round(seconds, 3),
+        mib_per_sec=round(total_bytes / seconds / MiB, 2) if total_bytes and seconds else None,
+        p50_seconds=round(percentile(latencies, 50), 3) if latencies else None,
+        p99_seconds=round(percentile(latencies, 99), 3) if latencies else None,
+        peak_rss_mib=result['peak_rss_mib'],
+        requests_per_file=round(requests / files, 2) if files else None,
+        failed=result['failed'],
+    )
+    return row
+
+
+def sweep_downloads(zoom, args):
+    for files, size_mib, jobs in itertools.product(args.files, args.sizes, args.jobs):
+        size = int(size_mib * MiB)
+        zoom.set_files({f"recording_{i}.mp4": size for i in range(1, files + 1)})
+        zoom.take_requests()
+        result = run_scenario({'suite': 'download', 'links': zoom.links(), 'jobs': jobs,
+                               'segments': args.segments, 'retry_delay': args.retry_delay}, args.verbose)
+        yield summarize('download', {'files': files, 'size_mib': size_mib, 'jobs': jobs},
+                        result, zoom.take_requests(), files, files * size)
+
+
+def sweep_uploads(drive, args):
+    for files, size_mib in itertools.product(args.files, args.sizes):
+        size = int(size_mib * MiB)
+        with tempfile.TemporaryDirectory(prefix='zoom-bench-upload-') as folder:
+            for i in range(1, files + 1):
+                write_synthetic_file(os.path.join(folder, f"recording_{i}.mp4"), size, seed=i)
+            for jobs in args.jobs:
+                drive.take_requests()
+                result = run_scenario({'suite': 'upload', 'folder': folder, 'drive_url': drive.base_url,
+                                       'drive_folder': f"bench-{files}x{size_mib}-j{jobs}",
+                                       'jobs': jobs, 'chunk_size': args.chunk_size,
+                                       'retry_delay': args.retry_delay}, args.verbose)
+                yield summarize('upload', {'files': files, 'size_mib': size_mib, 'jobs': jobs},
+                                result, drive.take_requests(), files, files * size)
+
+
+def sweep_discovery(zoom, args):
+    for files, discovery in itertools.product(args.files, args.discovery):
+        zoom.set_files({f"recording_{i}.mp4": MiB for i in range(1, files + 1)})
+        zoom.take_requests()
+        result = run_scenario({'suite': 'discovery', 'url': zoom.share_url, 'files': files,
+                               'discovery': discovery, 'pages': args.pages}, args.verbose)
+        # Per page rather than per file: discovery costs one page load however many files it finds
+        yield summarize('discovery', {'files': files, 'discovery': discovery},
+                        result, zoom.take_requests(), args.pages, 0)
+        if 'skipped' in result:
+            # No browser to run the rest with either
+            return
+
+
+COLUMNS = [
+    ('suite', 'suite'), ('files', 'files'), ('size_mib', 'MiB'), ('jobs', 'jobs'),
+    ('discovery', 'discovery'), ('mib_per_sec', 'MiB/s'), ('p50_seconds', 'p50 s'),
+    ('p99_seconds', 'p99 s'), ('peak_rss_mib', 'RSS MiB'), ('requests_per_file', 'req/file'),
+    ('failed', 'failed'),
+]
+
+
+def print_row(row):
+    if 'skipped' in row:
+        print(f"⚠️  Skipped {row['suite']}: {row['skipped']}")
+        return
+    cells = []
+    for key, _ in COLUMNS:
+        value = row.get(key)
+        cells.append('-' if value is None else str(value))
+    print('  '.join(cell.rjust(9) for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark downloads, link discovery and Drive uploads against local Zoom and Drive stand-ins',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s
+  %(prog)s --suites download upload --files 1 8 --sizes 16 256 --jobs 1 4 8
+  %(prog)s --suites download --latency 50 --fault-rate 0.05
+  %(prog)s --suites discovery --discovery network dom --pages 10
+  %(prog)s --output results.json
+        """
+    )
+    parser.add_argument('--suites', nargs='+', choices=list(SCENARIOS), default=['download', 'upload', 'discovery'],
+                       help='What to benchmark (default: all)')
+    parser.add_argument('--files', nargs='+', type=int, default=[1, 4],
+                       help='File counts to sweep (default: 1 4)')
+    parser.add_argument('--sizes', nargs='+', type=float, default=[16, 64],
+                       help='File sizes in MiB to sweep (default: 16 64)')
+    parser.add_argument('--jobs', nargs='+', type=int, default=[1, 4],
+                       help='Parallel file transfers to sweep (default: 1 4)')
+    parser.add_argument('--segments', type=int, default=4,
+                       help='Range segments per download (default: 4)')
+    parser.add_argument('--chunk-size', type=int, metavar='MIB',
+                       help='Resumable upload chunk size in MiB (default: the uploader\'s)')
+    parser.add_argument('--discovery', nargs='+', choices=['auto', 'network', 'dom', 'selectors'],
+                       default=['network', 'dom', 'selectors'],
+                       help='Link discovery methods to sweep (default: network dom selectors)')
+    parser.add_argument('--pages', type=int, default=5,
+                       help='Share page loads per discovery benchmark (default: 5)')
+    parser.add_argument('--latency', type=float, default=0,
+                       help='Milliseconds the stand-ins wait before every reply (default: 0)')
+    parser.add_argument('--fault-rate', type=float, default=0,
+                       help='Share of file transfers the stand-ins fail with a 503 or dropped connection '
+                            '(default: 0)')
+    parser.add_argument('--retry-delay', type=float, default=0.1,
+                       help='Backoff in seconds for the first retry (default: 0.1)')
+    parser.add_argument('--output', '-o', metavar='FILE',
+                       help='Also write the results as JSON')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='Show the output of the benchmarked code')
+    parser.add_argument('--scenario', help=argparse.SUPPRESS)
+    parser.add_argument('--result-file', help=argparse.SUPPRESS)
+    
+    args = parser.parse_args()
+    
+    if args.scenario:
+        spec = json.loads(args.scenario)
+        result = SCENARIOS[spec['suite']](spec)
+        result['peak_rss_mib'] = peak_rss_mib()
+        with open(args.result_file, 'w') as f:
+            json.dump(result, f)
+        return
+    
+    if args.chunk_size is not None:
+        args.chunk_size *= MiB
+    
+    zoom = FakeZoomServer(latency=args.latency / 1000, fault_rate=args.fault_rate).start()
+    drive = FakeDriveServer(latency=args.latency / 1000, fault_rate=args.fault_rate).start()
+    sweeps = {
+        'download': lambda: sweep_downloads(zoom, args),
+        'upload': lambda: sweep_uploads(drive, args),
+        'discovery': lambda: sweep_discovery(zoom, args),
+    }
+    
+    print(f"🏁 Zoom stand-in at {zoom.base_url}, Drive stand-in at {drive.base_url}")
+    print('  '.join(title.rjust(9) for _, title in COLUMNS))
+    results = []
+    try:
+        for suite in args.suites:
+            for row in sweeps[suite]():
+                print_row(row)
+                results.append(row)
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted")
+    except subprocess.CalledProcessError as e:
+        print(f"\n❌ Benchmark run failed (exit code {e.returncode}); rerun with --verbose to see why")
+        sys.exit(1)
+    finally:
+        zoom.stop()
+        drive.stop()
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
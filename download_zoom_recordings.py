@@ -7,14 +7,20 @@ Downloads all files from a Zoom recording URL with password support.
 import os
 import sys
 import re
+import json
 import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, quote, quote_plus
 import time
 
 try:
     from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
     from tqdm import tqdm
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.exceptions import HTTPError as Urllib3Error
 except ImportError as e:
     print(f"Error: Missing required dependency - {e}")
     print("\nPlease install dependencies:")
@@ -22,6 +28,15 @@ except ImportError as e:
     print("  playwright install chromium")
     sys.exit(1)
 
+from transfer_control import (
+    RetryPolicy, RetryCounter, ConcurrencyGate, TransferLimiter, TransferInterrupted, UNLIMITED,
+)
+from transfer_integrity import TransferDigest, ChecksumManifest, check
+from transfer_metrics import NO_METRICS, add_metrics_arguments, metrics_from_args
+
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+
 
 def sanitize_filename(filename):
     """Remove invalid characters from filename/folder name."""
@@ -36,28 +51,164 @@ def sanitize_filename(filename):
     return sanitized if sanitized else "zoom_recording"
 
 
+class PageTimeouts:
+    """
+    Time budgets for the browser steps of a scrape, in seconds.
+    
+    None of them is waited out on a page that behaves: every step moves on
+    as soon as what it waits for shows up, so the budgets only bound how
+    long a page that never gets there can hold a scrape up.
+    """
+    
+    def __init__(self, navigation=30.0, ready=15.0, auth=15.0):
+        """
+        Args:
+            navigation: Loading the recording page until its DOM is ready
+            ready: The password prompt or the recording's files showing up
+            auth: The response to the password submit and the recording
+                (or an error) showing up after it
+        """
+        self.navigation = navigation
+        self.ready = ready
+        self.auth = auth
+
+
+DEFAULT_TIMEOUTS = PageTimeouts()
+
+
+def add_timeout_arguments(parser):
+    """Add the --page-timeout, --ready-timeout and --auth-timeout options to an ArgumentParser."""
+    parser.add_argument('--page-timeout', type=float, default=DEFAULT_TIMEOUTS.navigation, metavar='SECONDS',
+                       help=f'Longest wait for a recording page to load '
+                            f'(default: {DEFAULT_TIMEOUTS.navigation:g})')
+    parser.add_argument('--ready-timeout', type=float, default=DEFAULT_TIMEOUTS.ready, metavar='SECONDS',
+                       help=f'Longest wait for the password prompt or the recording\'s files to show up '
+                            f'(default: {DEFAULT_TIMEOUTS.ready:g})')
+    parser.add_argument('--auth-timeout', type=float, default=DEFAULT_TIMEOUTS.auth, metavar='SECONDS',
+                       help=f'Longest wait for the recording to show up after submitting its password '
+                            f'(default: {DEFAULT_TIMEOUTS.auth:g})')
+
+
+def timeouts_from_args(args):
+    """PageTimeouts for the options added by add_timeout_arguments()."""
+    return PageTimeouts(navigation=args.page_timeout, ready=args.ready_timeout, auth=args.auth_timeout)
+
+
+# RecordingResponseCollector sets this attribute on the page's root element
+# once an API response has listed the recording's files, so a wait for
+# elements can race the API responses in the same locator
+FILES_LISTED_ATTRIBUTE = 'data-recording-files-listed'
+
+PASSWORD_SELECTORS = [
+    'input[type="password"]',
+    'input#password',
+    'input[name="password"]',
+    '.password-input'
+]
+
+SUBMIT_SELECTORS = [
+    'button[type="submit"]',
+    'button:has-text("Submit")',
+    'button:has-text("Continue")',
+    'input[type="submit"]',
+    '.submit-btn'
+]
+
+ERROR_SELECTORS = [
+    '.error-message',
+    '[class*="error"]',
+    '[class*="invalid"]',
+    ':text-is("Incorrect password")',
+    ':text-is("Invalid password")'
+]
+
+# In order of preference; the first visible one with some text wins
+TITLE_SELECTORS = [
+    'h1.meeting-topic',
+    '.meeting-topic',
+    'h1',
+    '.topic',
+    '[class*="topic"]',
+    '[class*="title"]'
+]
+
+TITLE_SCRIPT = """
+(selectors) => {
+    for (const selector of selectors) {
+        for (const el of document.querySelectorAll(selector)) {
+            const visible = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+            const text = visible ? (el.innerText || '').trim() : '';
+            if (text.length > 3) return text;
+        }
+    }
+    return null;
+}
+"""
+
+
+def _first_visible(page, selectors):
+    """One locator for the first visible element matching any of selectors."""
+    return page.locator(f"{', '.join(selectors)} >> visible=true").first
+
+
+def _wait_for_any(page, selectors, timeout, collector=None):
+    """
+    Wait for an element matching any of selectors to be visible, or for
+    the collector to have seen the recording's files.
+    
+    Everything is raced in a single locator, so the browser wakes the wait
+    as soon as one of the selectors matches or the collector marks the page,
+    and a page where most of them never match costs no more than one where
+    the first one does.
+    
+    Returns:
+        True if either happened within timeout seconds
+    """
+    if collector is not None and collector.has_links():
+        return True
+    if timeout <= 0:
+        return False
+    
+    ready = page.locator(f"{', '.join(selectors)} >> visible=true")
+    if collector is not None:
+        ready = ready.or_(page.locator(f":root[{FILES_LISTED_ATTRIBUTE}]"))
+    try:
+        ready.first.wait_for(state='attached', timeout=timeout * 1000)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def wait_for_recording(page, collector=None, timeout=DEFAULT_TIMEOUTS.ready):
+    """
+    Wait until the recording's files are on the page or in its API responses.
+    
+    Returns:
+        True if they showed up within timeout seconds
+    """
+    return _wait_for_any(page, RECORDING_SELECTORS, timeout, collector)
+
+
+def wait_for_page_ready(page, collector=None, timeout=DEFAULT_TIMEOUTS.ready):
+    """
+    Wait until a recording page asks for a password or shows the recording.
+    
+    Returns:
+        'password', 'recording', or None if neither showed up within
+        timeout seconds
+    """
+    if not _wait_for_any(page, PASSWORD_SELECTORS + RECORDING_SELECTORS, timeout, collector):
+        return None
+    return 'password' if _first_visible(page, PASSWORD_SELECTORS).is_visible() else 'recording'
+
+
 def get_meeting_title(page):
     """Extract meeting title from the Zoom recording page."""
     try:
-        # Try different selectors for meeting title
-        selectors = [
-            'h1.meeting-topic',
-            '.meeting-topic',
-            'h1',
-            '.topic',
-            '[class*="topic"]',
-            '[class*="title"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                element = page.locator(selector).first
-                if element.is_visible(timeout=2000):
-                    title = element.inner_text().strip()
-                    if title and len(title) > 3:
-                        return title
-            except:
-                continue
+        # One round trip for every selector instead of probing them in turn
+        title = page.evaluate(TITLE_SCRIPT, TITLE_SELECTORS)
+        if title:
+            return title
         
         # Fallback: use page title
         title = page.title()
@@ -70,99 +221,91 @@ def get_meeting_title(page):
         return "zoom_recording"
 
 
-def check_and_handle_password(page):
-    """Check if password is required and handle authentication."""
+def _is_password_response(page, password):
+    """
+    Predicate for the response to submitting password: a navigation of the
+    page itself, or a POST that carries the password.
+    """
+    encoded = {password, quote(password), quote_plus(password), json.dumps(password)[1:-1]}
+    
+    def predicate(response):
+        request = response.request
+        if request.is_navigation_request() and request.frame == page.main_frame:
+            return True
+        if request.method != 'POST':
+            return False
+        try:
+            body = request.post_data or ''
+        except Exception:
+            # Binary bodies can't be decoded and don't carry a typed password
+            return False
+        return any(text in body for text in encoded)
+    
+    return predicate
+
+
+def check_and_handle_password(page, password=None, prompt=True, collector=None, timeouts=None):
+    """Check if password is required and handle authentication.
+
+    ``password`` is used if given; otherwise the user is asked for it,
+    unless ``prompt`` is False. ``collector`` lets an already loaded
+    recording be recognized by its API responses, and ``timeouts`` are
+    the PageTimeouts to wait within.
+    """
+    timeouts = timeouts or DEFAULT_TIMEOUTS
     try:
-        # Wait a bit for page to load
-        page.wait_for_load_state('networkidle', timeout=10000)
-        
-        # Check for password input field
-        password_selectors = [
-            'input[type="password"]',
-            'input#password',
-            'input[name="password"]',
-            '.password-input'
-        ]
-        
-        password_input = None
-        for selector in password_selectors:
-            try:
-                element = page.locator(selector).first
-                if element.is_visible(timeout=2000):
-                    password_input = element
-                    break
-            except:
-                continue
+        # Returns as soon as the password prompt or the recording shows up
+        state = wait_for_page_ready(page, collector, timeouts.ready)
+        if state != 'password':
+            # No password required; a page that never got ready is reported
+            # by find_download_links()
+            return True
         
-        if password_input:
-            print("\n🔒 Password required for this recording.")
-            password = input("Please enter the password: ").strip()
-            
-            if not password:
-                print("Error: Password cannot be empty.")
+        password_input = _first_visible(page, PASSWORD_SELECTORS)
+        print("\n🔒 Password required for this recording.")
+        if password is None:
+            if not prompt:
+                print("Error: No password was supplied for this recording.")
                 return False
-            
-            # Fill password
-            password_input.fill(password)
-            
-            # Find and click submit button
-            submit_selectors = [
-                'button[type="submit"]',
-                'button:has-text("Submit")',
-                'button:has-text("Continue")',
-                'input[type="submit"]',
-                '.submit-btn'
-            ]
-            
-            for selector in submit_selectors:
-                try:
-                    button = page.locator(selector).first
-                    if button.is_visible(timeout=2000):
-                        button.click()
-                        break
-                except:
-                    continue
-            
-            # Wait for page to load after authentication
-            print("Authenticating...")
-            time.sleep(2)  # Give it a moment to process
-            page.wait_for_load_state('networkidle', timeout=15000)
-            
-            # Check if still on password page (wrong password)
-            # Look for error messages or if password field is still prominently displayed
-            try:
-                # Check for error message
-                error_selectors = [
-                    '.error-message',
-                    '[class*="error"]',
-                    '[class*="invalid"]',
-                    'text="Incorrect password"',
-                    'text="Invalid password"'
-                ]
-                for selector in error_selectors:
-                    try:
-                        error = page.locator(selector).first
-                        if error.is_visible(timeout=1000):
-                            print("Error: Incorrect password.")
-                            return False
-                    except:
-                        continue
-                
-                # If password field is still there and form didn't submit, likely wrong password
-                password_field = page.locator('input[type="password"]').first
-                if password_field.is_visible(timeout=2000):
-                    # Check if it's empty (form was submitted and reloaded with error)
-                    value = password_field.input_value()
-                    if not value:  # Field was cleared, means error
-                        print("Error: Incorrect password or authentication failed.")
-                        return False
-            except:
-                pass  # Password field not visible anymore, good!
-            
-            print("✓ Authentication successful!")
-            return True
+            password = input("Please enter the password: ").strip()
+        
+        if not password:
+            print("Error: Password cannot be empty.")
+            return False
+        
+        # Fill password
+        password_input.fill(password)
+        
+        print("Authenticating...")
+        deadline = time.monotonic() + timeouts.auth
+        submit = _first_visible(page, SUBMIT_SELECTORS)
+        try:
+            # Wait for the request the submit itself causes, not the network to go quiet
+            with page.expect_response(_is_password_response(page, password),
+                                      timeout=timeouts.auth * 1000):
+                if submit.count():
+                    submit.click()
+                else:
+                    password_input.press('Enter')
+        except PlaywrightTimeoutError:
+            print("Warning: No response to the password yet")
+        
+        # Then for the recording or an error message, whichever comes first
+        _wait_for_any(page, ERROR_SELECTORS + RECORDING_SELECTORS,
+                      max(0, deadline - time.monotonic()), collector)
+        
+        if _first_visible(page, ERROR_SELECTORS).is_visible():
+            print("Error: Incorrect password.")
+            return False
         
-        # No password required
+        # If password field is still there and was cleared, the form was
+        # submitted and reloaded with an error
+        password_field = _first_visible(page, PASSWORD_SELECTORS)
+        if password_field.is_visible() and not password_field.input_value():
+            print("Error: Incorrect password or authentication failed.")
+            return False
+        
+        print("✓ Authentication successful!")
         return True
         
     except PlaywrightTimeoutError:
@@ -173,14 +316,238 @@ def check_and_handle_password(page):
         return True  # Continue anyway
 
 
-def find_download_links(page):
-    """Find all download links on the page."""
+# File extensions of the parts that make up a Zoom recording
+RECORDING_EXTENSIONS = ('.mp4', '.m4a', '.vtt', '.txt')
+
+# JSON keys that carry a file's display name or kind in Zoom's play/share API responses
+NAME_KEYS = ('fileName', 'file_name', 'name')
+TYPE_KEYS = ('fileType', 'file_type', 'recordingType', 'recording_type', 'type')
+TITLE_KEYS = ('topic', 'meetingTopic', 'meeting_topic')
+
+# Selectors the page-side extraction evaluates in one go; Playwright's
+# button:has-text("Download") is matched by text in the script instead
+DOM_LINK_SELECTORS = [
+    'a[download]',
+    'a[href*="download"]',
+    '.download-btn',
+    '[class*="download"]',
+    'a[href$=".mp4"]',
+    'a[href$=".m4a"]',
+    'a[href$=".vtt"]',
+    'a[href$=".txt"]'
+]
+
+# Any of these being visible means the recording's files are on the page
+RECORDING_SELECTORS = DOM_LINK_SELECTORS + ['button:has-text("Download")']
+
+DOM_EXTRACT_SCRIPT = """
+(selectors) => {
+    const elements = new Set();
+    for (const selector of selectors) {
+        document.querySelectorAll(selector).forEach(el => elements.add(el));
+    }
+    document.querySelectorAll('button').forEach(el => {
+        if (el.innerText && el.innerText.includes('Download')) elements.add(el);
+    });
+    const results = [];
+    for (const el of elements) {
+        const visible = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+        const href = el.getAttribute('href');
+        if (!visible || !href) continue;
+        results.push({
+            href: href,
+            download: el.getAttribute('download'),
+            text: (el.innerText || '').trim()
+        });
+    }
+    return results;
+}
+"""
+
+
+class RecordingResponseCollector:
+    """
+    Keeps the JSON responses a Zoom recording page fetches for itself.
+    
+    Attach it before ``page.goto()``; the recording's file list and topic
+    can then be read from those responses instead of probing the DOM.
+    """
+    
+    def __init__(self, page):
+        self.responses = []
+        self._decoded = []
+        self._read = 0
+        self._page = page
+        self._listed = False
+        page.on("response", self._on_response)
+    
+    def _on_response(self, response):
+        # Only JSON API responses are kept; each body is decoded once
+        try:
+            if response.request.resource_type not in ('xhr', 'fetch'):
+                return
+            if 'json' not in response.headers.get('content-type', ''):
+                return
+        except Exception:
+            return
+        self.responses.append(response)
+        if not self._listed and self.has_links():
+            self._listed = True
+            self._mark_listed()
+    
+    def _mark_listed(self):
+        """Set FILES_LISTED_ATTRIBUTE so a pending _wait_for_any() returns."""
+        try:
+            self._page.evaluate("(name) => document.documentElement.setAttribute(name, '')",
+                                FILES_LISTED_ATTRIBUTE)
+        except Exception:
+            pass  # Navigated away; has_links() still knows
+    
+    def _bodies(self):
+        """Decode responses not read yet; each body is fetched from the browser once."""
+        while self._read < len(self.responses):
+            response = self.responses[self._read]
+            self._read += 1
+            try:
+                self._decoded.append((response.url, response.json()))
+            except Exception:
+                continue
+        return self._decoded
+    
+    def has_links(self):
+        """Whether the responses so far list any of the recording's files."""
+        return bool(self.parse()[0])
+    
+    def parse(self):
+        """
+        Read the collected responses.
+        
+        Returns:
+            (links, title) - links in find_download_links() format, title
+            may be None
+        """
+        links = []
+        title = None
+        seen_urls = set()
+        
+        for response_url, data in self._bodies():
+            for entry in _walk_json(data):
+                if title is None:
+                    for key in TITLE_KEYS:
+                        value = entry.get(key)
+                        if isinstance(value, str) and len(value.strip()) > 3:
+                            title = value.strip()
+                            break
+                
+                for key, value in entry.items():
+                    if not _looks_like_file_url(key, value):
+                        continue
+                    absolute_url = urljoin(response_url, value)
+                    if absolute_url in seen_urls:
+                        continue
+                    seen_urls.add(absolute_url)
+                    
+                    filename = next((entry[k] for k in NAME_KEYS if isinstance(entry.get(k), str)), None)
+                    if not filename or not os.path.splitext(filename)[1]:
+                        filename = os.path.basename(urlparse(absolute_url).path)
+                    file_type = next((entry[k] for k in TYPE_KEYS if isinstance(entry.get(k), str)), None)
+                    
+                    links.append({
+                        'url': absolute_url,
+                        'filename': filename,
+                        'type': file_type if file_type else filename
+                    })
+        
+        return links, title
+
+
+def _walk_json(data):
+    """Yield every dict nested anywhere inside a decoded JSON document."""
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            yield item
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def _looks_like_file_url(key, value):
+    """Whether a JSON key/value pair points at a downloadable recording file."""
+    if not isinstance(value, str) or not value.startswith(('http://', 'https://', '/')):
+        return False
+    if 'download' in key.lower():
+        return True
+    return urlparse(value).path.lower().endswith(RECORDING_EXTENSIONS)
+
+
+def _find_links_in_dom(page):
+    """Collect visible download links with a single page.evaluate() round trip."""
     download_links = []
+    seen_urls = set()
     
-    try:
-        # Wait for content to load
-        page.wait_for_load_state('networkidle', timeout=10000)
+    for item in page.evaluate(DOM_EXTRACT_SCRIPT, DOM_LINK_SELECTORS):
+        href = item['href']
+        if href in seen_urls:
+            continue
+        seen_urls.add(href)
+        
+        absolute_url = urljoin(page.url, href)
+        filename = item['download'] or os.path.basename(urlparse(absolute_url).path)
+        download_links.append({
+            'url': absolute_url,
+            'filename': filename,
+            'type': item['text'] if item['text'] else filename
+        })
+    
+    return download_links
+
+
+def find_download_links(page, collector=None, discovery='auto', timeouts=None):
+    """
+    Find all download links on the page.
+    
+    Args:
+        page: Recording page
+        collector: RecordingResponseCollector attached before navigation
+        discovery: 'network' reads the page's own JSON responses, 'dom'
+            extracts links in one page.evaluate() call, 'selectors' probes
+            each selector element by element; 'auto' tries them in that
+            order and stops at the first that finds anything
+        timeouts: PageTimeouts; links are looked for as soon as the
+            recording shows up, or once its ready budget has run out
+    """
+    # Returns straight away when the password check already saw the recording
+    wait_for_recording(page, collector, (timeouts or DEFAULT_TIMEOUTS).ready)
+    
+    methods = ['network', 'dom', 'selectors'] if discovery == 'auto' else [discovery]
+    
+    for method in methods:
+        try:
+            if method == 'network':
+                if collector is None:
+                    continue
+                download_links, _ = collector.parse()
+            elif method == 'dom':
+                download_links = _find_links_in_dom(page)
+            else:
+                download_links = _find_links_with_selectors(page)
+        except Exception as e:
+            print(f"Warning: {method} link discovery failed: {e}")
+            continue
         
+        if download_links:
+            return download_links
+    
+    return []
+
+
+def _find_links_with_selectors(page):
+    """Find download links by probing each selector's elements one by one."""
+    download_links = []
+    
+    try:
         # Common selectors for Zoom download buttons/links
         download_selectors = [
             'a[download]',
@@ -236,34 +603,1401 @@ def find_download_links(page):
         return []
 
 
-def download_file(url, filepath, description="Downloading"):
-    """Download a file with progress bar."""
-    import requests
+class CombinedProgress:
+    """Single tqdm bar shared by several concurrent downloads."""
+
+    def __init__(self, description="Downloading"):
+        self._lock = threading.Lock()
+        self._pbar = tqdm(total=0, unit='B', unit_scale=True, desc=description)
+
+    def add_total(self, size):
+        """Grow the bar's total once a download learns its content length."""
+        with self._lock:
+            self._pbar.total += size
+            self._pbar.refresh()
+
+    def update(self, size):
+        with self._lock:
+            self._pbar.update(size)
+
+    def write(self, message):
+        """Print a line without corrupting the progress bar."""
+        with self._lock:
+            self._pbar.write(message)
+
+    def close(self):
+        self._pbar.close()
+
+
+def create_download_session(cookies=None, referer=None, pool_size=10, adapter=None):
+    """
+    Build one pooled HTTP session to reuse for every download in a run.
     
+    Args:
+        cookies: Cookies from the Playwright context (``context.cookies()``),
+            so downloads carry the same authentication as the browser
+        referer: Page URL to send as Referer
+        pool_size: Connections kept open per host; should cover the number
+            of parallel downloads and segments
+        adapter: Existing HTTPAdapter to share its connection pool between
+            sessions (pool_size is ignored then)
+    """
+    session = requests.Session()
+    if adapter is None:
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
+    session.headers['User-Agent'] = USER_AGENT
+    if referer:
+        session.headers['Referer'] = referer
+    
+    for cookie in cookies or []:
+        session.cookies.set(
+            cookie['name'], cookie['value'],
+            domain=cookie.get('domain', ''), path=cookie.get('path', '/'),
+            secure=cookie.get('secure', False)
+        )
+    
+    return session
+
+
+# Files smaller than two segments are not worth splitting into ranges
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+
+# Resume state is flushed to the sidecar at most this often (seconds)
+STATE_SAVE_INTERVAL = 1.0
+
+# Response bodies are read into one reusable buffer of this size
+READ_BUFFER_SIZE = 1024 * 1024
+
+# Progress bars are updated at most this often (seconds)
+PROGRESS_INTERVAL = 0.2
+
+
+def copy_body(response, write, buffer, limit=None, progress=None):
+    """
+    Stream a response body through a preallocated buffer.
+    
+    Reads straight from the raw connection with readinto() and hands
+    ``write`` memoryview slices of ``buffer``, so a multi-GB file costs one
+    Python iteration per buffer-full instead of one per 8 KB chunk, and no
+    new bytes objects. ``write`` must be done with each view before it
+    returns. Progress is reported in batches at most every
+    PROGRESS_INTERVAL seconds.
+    
+    Args:
+        response: requests response opened with stream=True
+        write: Called with each block of data as a memoryview
+        buffer: Reusable bytearray to read into
+        limit: Stop after this many bytes
+        progress: Object with update(num_bytes), e.g. a CombinedProgress
+    
+    Returns:
+        Number of bytes copied
+    """
+    # Undo any Content-Encoding the same way iter_content() would
+    response.raw.decode_content = True
+    view = memoryview(buffer)
+    copied = 0
+    pending = 0
+    last_report = time.monotonic()
+    try:
+        while limit is None or copied < limit:
+            size = len(view) if limit is None else min(len(view), limit - copied)
+            try:
+                count = response.raw.readinto(view[:size])
+            except Urllib3Error as e:
+                raise TransferInterrupted(f"Connection broken: {e}") from e
+            if not count:
+                break
+            write(view[:count])
+            copied += count
+            pending += count
+            if progress is not None and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                progress.update(pending)
+                pending = 0
+                last_report = time.monotonic()
+    finally:
+        if progress is not None and pending:
+            progress.update(pending)
+    return copied
+
+
+def download_info(headers=None):
+    """
+    A file's size, Range support and validators from the headers of a
+    response to it; without headers, the info of a file nothing is known of.
+    
+    Returns:
+        Dictionary with size (0 when unknown), accepts_ranges, etag and
+        last_modified
+    """
+    if headers is None:
+        return {'size': 0, 'accepts_ranges': False, 'etag': None, 'last_modified': None}
+    return {
+        'size': int(headers.get('content-length', 0)),
+        'accepts_ranges': headers.get('accept-ranges', '').lower() == 'bytes',
+        'etag': headers.get('etag'),
+        'last_modified': headers.get('last-modified'),
+    }
+
+
+def probe_download(url, session=None):
+    """
+    Ask the server for a file's size, Range support and validators without
+    fetching the body.
+    
+    Returns:
+        download_info() of the file
+    """
+    http = session if session is not None else requests
     try:
-        response = requests.get(url, stream=True, timeout=30)
+        response = http.head(url, allow_redirects=True, timeout=30)
         response.raise_for_status()
+    except Exception:
+        return download_info()
+    return download_info(response.headers)
+
+
+def split_ranges(total_size, segments):
+    """Split [0, total_size) into inclusive (start, end) byte ranges."""
+    segments = max(1, min(segments, total_size // MIN_SEGMENT_SIZE))
+    step = -(-total_size // segments)
+    return [(start, min(start + step, total_size) - 1) for start in range(0, total_size, step)]
+
+
+def split_missing(missing, segments):
+    """
+    Cut the missing (start, end) ranges into pieces so that up to
+    ``segments`` of them can be fetched in parallel.
+    """
+    remaining = sum(end - start + 1 for start, end in missing)
+    if segments <= 1 or remaining < 2 * MIN_SEGMENT_SIZE:
+        return missing
+    
+    step = max(MIN_SEGMENT_SIZE, -(-remaining // segments))
+    pieces = []
+    for start, end in missing:
+        while start <= end:
+            piece_end = min(start + step - 1, end)
+            # Don't leave a sliver smaller than a segment at the end of a range
+            if end - piece_end < MIN_SEGMENT_SIZE:
+                piece_end = end
+            pieces.append((start, piece_end))
+            start = piece_end + 1
+    return pieces
+
+
+class DownloadState:
+    """
+    Resume state for a partially downloaded file.
+    
+    Stored next to the ``.part`` file as ``<name>.part.json`` with the URL,
+    the server's ETag/Last-Modified, the expected size and the byte ranges
+    that have already been written.
+    """
+    
+    def __init__(self, state_path, url, info):
+        self.state_path = state_path
+        self.url = url
+        self.etag = info['etag']
+        self.last_modified = info['last_modified']
+        self.size = info['size']
+        self.completed = []  # sorted, non-overlapping [start, end) pairs
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+    
+    @classmethod
+    def load(cls, state_path, url, info):
+        """
+        Load saved state if it still describes the same remote file.
         
-        total_size = int(response.headers.get('content-length', 0))
+        Signed Zoom URLs change between runs, so the file is matched on its
+        size and validators rather than on the URL.
+        """
+        state = cls(state_path, url, info)
+        try:
+            with open(state_path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return state
         
-        with open(filepath, 'wb') as f:
-            if total_size == 0:
-                f.write(response.content)
-                return True
-            
-            with tqdm(total=total_size, unit='B', unit_scale=True, desc=description) as pbar:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        pbar.update(len(chunk))
+        if saved.get('size') != info['size']:
+            return state
+        if info['etag'] or saved.get('etag'):
+            if saved.get('etag') != info['etag']:
+                return state
+        elif saved.get('last_modified') != info['last_modified']:
+            return state
         
+        state.completed = [tuple(r) for r in saved.get('completed', [])]
+        return state
+    
+    def completed_bytes(self):
+        with self._lock:
+            return sum(end - start for start, end in self.completed)
+    
+    def missing(self):
+        """Inclusive (start, end) ranges that still have to be downloaded."""
+        with self._lock:
+            gaps = []
+            position = 0
+            for start, end in self.completed:
+                if start > position:
+                    gaps.append((position, start - 1))
+                position = max(position, end)
+            if position < self.size:
+                gaps.append((position, self.size - 1))
+            return gaps
+    
+    def mark(self, start, end):
+        """Record bytes [start, end) as written and periodically persist."""
+        with self._lock:
+            merged = []
+            for r_start, r_end in sorted(self.completed + [(start, end)]):
+                if merged and r_start <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], r_end))
+                else:
+                    merged.append((r_start, r_end))
+            self.completed = merged
+            
+            now = time.monotonic()
+            if now - self._last_save >= STATE_SAVE_INTERVAL:
+                self._save_locked()
+                self._last_save = now
+    
+    def save(self):
+        with self._lock:
+            self._save_locked()
+    
+    def _save_locked(self):
+        data = {
+            'url': self.url,
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'size': self.size,
+            'completed': [list(r) for r in self.completed],
+        }
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_path)
+    
+    def remove(self):
+        try:
+            os.remove(self.state_path)
+        except FileNotFoundError:
+            pass
+
+
+def download_mode(filepath, part_path, info):
+    """
+    How to fetch a file described by download_info().
+    
+    Returns:
+        'done' if filepath is already complete, 'ranges' for a file worth
+        resuming and splitting into byte ranges, else 'stream'
+    """
+    if info['size'] and filepath.exists() and filepath.stat().st_size == info['size']:
+        return 'done'
+    if info['accepts_ranges'] and (info['size'] >= MIN_SEGMENT_SIZE or os.path.exists(f"{part_path}.json")):
+        return 'ranges'
+    return 'stream'
+
+
+def prepare_ranges(url, part_path, info, segments, digest):
+    """
+    Load the resume state of part_path and work out which byte ranges are
+    still to fetch, preallocating the file if it's a fresh start.
+    
+    ``digest`` can only follow a file fetched as one range from the first
+    byte; it is marked incomplete for split or resumed downloads.
+    
+    Returns:
+        (state, ranges): the DownloadState and up to ``segments``
+        inclusive (start, end) ranges
+    """
+    state = DownloadState.load(f"{part_path}.json", url, info)
+    
+    if not state.completed or not os.path.exists(part_path):
+        # Fresh start: preallocate so every range can write at its own offset
+        state.completed = []
+        with open(part_path, 'wb') as f:
+            f.truncate(info['size'])
+    
+    ranges = split_missing(state.missing(), segments)
+    if ranges != [(0, info['size'] - 1)]:
+        digest.complete = False  # The bytes don't arrive in order
+    return state, ranges
+
+
+class RangeIgnored(IOError):
+    """The server answered a Range request with the whole file; retrying won't help."""
+
+
+def check_range_response(status_code):
+    """Raise RangeIgnored if a response to a Range request isn't the partial content asked for."""
+    if status_code != 206:
+        raise RangeIgnored(f"Server ignored Range request (HTTP {status_code})")
+
+
+class RangeWriter:
+    """
+    Writes the blocks of one byte range at their own offset in a ``.part``
+    file, recording them in the DownloadState and feeding ``digest``, if
+    given, as they go.
+    
+    write() and close() may be called from different threads.
+    """
+    
+    def __init__(self, part_path, position, state, digest=None):
+        # Unbuffered, so bytes recorded in the resume state have reached the OS
+        self._file = open(part_path, 'r+b', buffering=0)
+        self._file.seek(position)
+        self._lock = threading.Lock()
+        self.position = position
+        self.state = state
+        self.digest = digest
+    
+    def write(self, block):
+        """Write block at the current position; returns the position after it."""
+        with self._lock:
+            self._file.write(block)
+            if self.digest is not None:
+                self.digest.update_at(self.position, block)
+            self.state.mark(self.position, self.position + len(block))
+            self.position += len(block)
+            return self.position
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class StreamWriter:
+    """
+    Writes a download fetched as a single stream to its ``.part`` file,
+    feeding every byte to ``digest`` in order.
+    
+    Between requests, start() takes each response's status and headers:
+    a server that resends the whole body instead of continuing where the
+    last response dropped makes the file start over.
+    """
+    
+    def __init__(self, part_path, digest):
+        self._file = open(part_path, 'wb')
+        self._lock = threading.Lock()
+        self.digest = digest
+        self.written = 0
+        self.total_size = 0
+    
+    def resume_headers(self, accepts_ranges):
+        """Headers for the next request, continuing after the last byte written if possible."""
+        return {'Range': f'bytes={self.written}-'} if self.written and accepts_ranges else {}
+    
+    def start(self, status_code, headers, progress):
+        """Account for a new response before its body is written."""
+        with self._lock:
+            if self.written and status_code != 206:
+                # The whole body is coming again
+                progress.update(-self.written)
+                self._file.seek(0)
+                self._file.truncate()
+                self.digest.reset()
+                self.written = 0
+            if not self.total_size:
+                self.total_size = self.written + int(headers.get('content-length', 0))
+                progress.add_total(self.total_size)
+    
+    def write(self, block):
+        """Append block; returns the number of bytes written so far."""
+        with self._lock:
+            self._file.write(block)
+            self.digest.update(block)
+            self.written += len(block)
+            return self.written
+    
+    def check_complete(self):
+        if self.written < self.total_size:
+            raise TransferInterrupted(f"Download ended early ({self.written}/{self.total_size} bytes)")
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def finish_download(filepath, part_path, size, expected_size, state=None):
+    """
+    Check a finished ``.part`` file against the size the server announced
+    and move it into place, dropping its resume state.
+    """
+    check(filepath.name, size, expected_size)
+    os.replace(part_path, filepath)
+    if state is not None:
+        state.remove()
+
+
+def record_download(checksums, filepath, info, digest):
+    """Record a downloaded file's size and checksums in a ChecksumManifest (if any)."""
+    if checksums is not None:
+        checksums.record(ChecksumManifest.key(filepath), replace=True, name=filepath.name,
+                         size=filepath.stat().st_size, md5=digest.md5, sha256=digest.sha256,
+                         verified='size' if info['size'] else None)
+
+
+def _download_range(http, url, part_path, start, end, progress, state, abort, retry, limiter, timer,
+                    digest=None):
+    """Fetch bytes start..end (inclusive) and write them at the same offset in part_path.
+
+    Transient failures are retried under ``retry``, continuing from the
+    first byte that hasn't been written yet. ``limiter`` paces the bytes
+    and caps open requests per host. ``timer`` (a TransferTimer) counts
+    the bytes, requests and retries. ``digest``, if given, is fed the bytes
+    in order as they are written.
+    """
+    position = start
+    retries = RetryCounter(retry, timer)
+    buffer = bytearray(READ_BUFFER_SIZE)
+    while True:
+        resumed_at = position
+        try:
+            with limiter.connection(url):
+                timer.request()
+                response = http.get(url, headers={'Range': f'bytes={position}-{end}'}, stream=True, timeout=30)
+                with response:
+                    response.raise_for_status()
+                    check_range_response(response.status_code)
+                    
+                    with RangeWriter(part_path, position, state, digest) as part:
+                        
+                        def write(block):
+                            nonlocal position
+                            if abort.is_set():
+                                raise IOError("Cancelled")
+                            position = part.write(block)
+                            timer.add(len(block))
+                            limiter.consume(len(block))
+                        
+                        copy_body(response, write, buffer, limit=end + 1 - position, progress=progress)
+            
+            if position <= end:
+                raise TransferInterrupted(f"Range {start}-{end} ended early at byte {position}")
+            return
+        except Exception as e:
+            if position > resumed_at:
+                retries.reset()  # Still making progress
+            if abort.is_set():
+                raise
+            time.sleep(retries.delay(e))
+
+
+def _download_ranges(http, url, filepath, part_path, info, description, progress, segments, retry, limiter,
+                     timer, digest):
+    """
+    Download the bytes of url that aren't in part_path yet, as parallel
+    byte ranges written at their own offsets, then move it into place.
+    """
+    state, ranges = prepare_ranges(url, part_path, info, segments, digest)
+    done = state.completed_bytes()
+    
+    own_progress = progress is None
+    if own_progress:
+        progress = CombinedProgress(description=description)
+    progress.add_total(info['size'])
+    if done:
+        progress.write(f"  ↻ Resuming {filepath.name} at {done / (1024 * 1024):.1f} MB")
+        progress.update(done)
+    
+    abort = threading.Event()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, len(ranges))) as executor:
+            futures = [
+                executor.submit(_download_range, http, url, part_path, start, end, progress, state, abort,
+                                retry, limiter, timer, digest if digest.complete else None)
+                for start, end in ranges
+            ]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+            except Exception:
+                abort.set()
+                raise
+    finally:
+        state.save()
+        if own_progress:
+            progress.close()
+    
+    finish_download(filepath, part_path, state.completed_bytes(), info['size'], state)
+    return True
+
+
+def _download_stream(http, url, filepath, part_path, info, description, progress, retry, limiter, timer,
+                     digest):
+    """
+    Download url into part_path as a single stream, then move it into place.
+
+    After a dropped connection or a transient error the request is retried
+    under ``retry``; servers that support ranges continue after the last
+    byte written, others start the file over. ``digest`` is fed every byte
+    in order.
+    """
+    own_progress = progress is None
+    if own_progress:
+        progress = CombinedProgress(description=description)
+    
+    retries = RetryCounter(retry, timer)
+    buffer = bytearray(READ_BUFFER_SIZE)
+    try:
+        with StreamWriter(part_path, digest) as part:
+            
+            def write(block):
+                part.write(block)
+                timer.add(len(block))
+                limiter.consume(len(block))
+            
+            while True:
+                resumed_at = part.written
+                try:
+                    with limiter.connection(url):
+                        timer.request()
+                        response = http.get(url, headers=part.resume_headers(info['accepts_ranges']),
+                                            stream=True, timeout=30)
+                        with response:
+                            response.raise_for_status()
+                            part.start(response.status_code, response.headers, progress)
+                            resumed_at = min(resumed_at, part.written)
+                            
+                            # Unknown lengths stream too; the body is never held in memory
+                            copy_body(response, write, buffer, progress=progress)
+                    
+                    part.check_complete()
+                    break
+                except Exception as e:
+                    if part.written > resumed_at:
+                        retries.reset()  # Still making progress
+                    time.sleep(retries.delay(e))
+    finally:
+        if own_progress:
+            progress.close()
+    
+    finish_download(filepath, part_path, part.written, part.total_size or None)
+    return True
+
+
+def download_file(url, filepath, description="Downloading", progress=None, segments=1, session=None,
+                  retry=None, limiter=None, checksums=None, metrics=None):
+    """Download a file with progress bar.
+
+    The file is written to ``<name>.part`` and moved into place when it is
+    complete. When the server supports Range requests, a sidecar
+    ``<name>.part.json`` records what has been written so a rerun only
+    fetches the missing bytes, and a file already on disk at the expected
+    size is skipped. With ``segments`` > 1, large files are fetched as that
+    many parallel byte ranges.
+
+    When ``progress`` (a CombinedProgress) is given, bytes are reported to
+    the shared bar instead of opening a per-file one. ``session`` is the
+    pooled session from create_download_session(); without it each request
+    opens its own connection.
+
+    ``retry`` is the RetryPolicy for dropped connections and 429/5xx
+    responses (five retries with backoff by default). Retries continue
+    from the last byte written, and the download holds one of the policy's
+    ConcurrencyGate slots, if it has one, while it runs. ``limiter`` is a
+    TransferLimiter for the download bandwidth and connections per host.
+
+    The finished file is checked against the size the server announced.
+    Its MD5 (and SHA-256, if enabled) is computed while the bytes arrive
+    whenever they arrive in order, and recorded with the size in the
+    ``checksums`` ChecksumManifest if one is given.
+
+    The download's time, time to first byte, bytes, requests and retries
+    are recorded in ``metrics``, a TransferMetrics.
+    """
+    http = session if session is not None else requests
+    filepath = Path(filepath)
+    part_path = filepath.with_name(filepath.name + '.part')
+    retry = retry if retry is not None else RetryPolicy()
+    limiter = limiter if limiter is not None else UNLIMITED
+    metrics = metrics if metrics is not None else NO_METRICS
+    
+    try:
+        with retry.slot(), metrics.transfer('download', filepath.name) as timer:
+            return _download_file(http, url, filepath, part_path, description, progress, segments,
+                                  session, retry, limiter, checksums, timer)
+    except Exception as e:
+        message = f"Error downloading file: {e}"
+        if progress is not None:
+            progress.write(message)
+        else:
+            print(message)
+        return False
+
+
+def _download_file(http, url, filepath, part_path, description, progress, segments, session, retry,
+                   limiter, checksums, timer):
+    """download_file() once it holds a transfer slot; raises on failure."""
+    timer.request()
+    info = probe_download(url, session)
+    
+    mode = download_mode(filepath, part_path, info)
+    if mode == 'done':
+        timer.skipped = True
+        message = f"  ✓ Already downloaded: {filepath.name}"
+        if progress is not None:
+            progress.write(message)
+        else:
+            print(message)
         return True
+    
+    digest = checksums.digest() if checksums is not None else TransferDigest()
+    if mode == 'ranges':
+        _download_ranges(http, url, filepath, part_path, info, description, progress,
+                         segments, retry, limiter, timer, digest)
+    else:
+        _download_stream(http, url, filepath, part_path, info, description, progress, retry, limiter,
+                         timer, digest)
+    
+    record_download(checksums, filepath, info, digest)
+    return True
+
+
+def plan_downloads(download_links, download_folder):
+    """Pair each discovered link with its label and local destination path."""
+    planned = []
+    for i, link in enumerate(download_links, 1):
+        filename = sanitize_filename(link['filename'])
+        if not filename:
+            filename = f"file_{i}"
         
+        filepath = download_folder / filename
+        file_type = link['type'][:50] if link['type'] else filename
+        planned.append((link, filename, filepath, file_type))
+    return planned
+
+
+def download_all(download_links, download_folder, jobs=1, segments=1, session=None, retry=None,
+                 limiter=None, checksums=None, metrics=None):
+    """
+    Download every link into download_folder.
+    
+    With jobs > 1 the files are fetched by a bounded thread pool and report
+    into one combined progress bar, so a large MP4 overlaps with the small
+    transcript/chat files instead of delaying them. ``segments`` is passed
+    through to download_file() for Range-split downloads of large files,
+    and ``session``, the ``retry`` policy, the ``limiter``, the
+    ``checksums`` manifest and the ``metrics`` are shared by all of them.
+    
+    Returns:
+        (successful, failed) counts
+    """
+    planned = plan_downloads(download_links, download_folder)
+    total = len(planned)
+    successful = 0
+    failed = 0
+    
+    if jobs <= 1 or total <= 1:
+        for i, (link, filename, filepath, file_type) in enumerate(planned, 1):
+            print(f"\n[{i}/{total}] {file_type}")
+            print(f"  → {filename}")
+            
+            if download_file(link['url'], filepath, description=f"  Downloading",
+                             segments=segments, session=session, retry=retry, limiter=limiter,
+                             checksums=checksums, metrics=metrics):
+                print(f"  ✓ Saved to {filepath}")
+                successful += 1
+            else:
+                print(f"  ✗ Failed to download")
+                failed += 1
+        return successful, failed
+    
+    for i, (link, filename, filepath, file_type) in enumerate(planned, 1):
+        print(f"[{i}/{total}] {file_type}")
+        print(f"  → {filename}")
+    print(f"\n⚡ Downloading {total} files with {min(jobs, total)} parallel jobs\n")
+    
+    progress = CombinedProgress(description="  Downloading")
+    try:
+        with ThreadPoolExecutor(max_workers=min(jobs, total)) as executor:
+            futures = {
+                executor.submit(download_file, link['url'], filepath, progress=progress, segments=segments,
+                                session=session, retry=retry, limiter=limiter,
+                                checksums=checksums, metrics=metrics): (filename, filepath)
+                for link, filename, filepath, file_type in planned
+            }
+            for future in as_completed(futures):
+                filename, filepath = futures[future]
+                if future.result():
+                    progress.write(f"  ✓ Saved to {filepath}")
+                    successful += 1
+                else:
+                    progress.write(f"  ✗ Failed to download {filename}")
+                    failed += 1
+    finally:
+        progress.close()
+    
+    return successful, failed
+
+
+def stream_to_drive(url, filename, uploader, parent_id, progress=None, session=None, chunk_size=None,
+                    retry=None, limiter=None, metrics=None):
+    """Pipe one download straight into a Drive resumable upload.
+
+    The response body goes through a bounded StreamBuffer from
+    upload_to_google_drive, so memory stays at a few upload chunks and
+    nothing is written to disk; the upload runs in its own thread and
+    overlaps the download completely. A dropped download is retried under
+    ``retry`` with a Range request for the rest of the body. ``limiter``
+    paces the download; its per-host cap is not applied here, since a
+    stalled upload would otherwise hold a Zoom connection open. The
+    download is recorded in ``metrics`` like download_file()'s; the upload
+    is recorded by the uploader's own metrics. Returns the Drive file ID,
+    or None.
+    """
+    from upload_to_google_drive import StreamAborted, StreamBuffer, STREAM_CHUNK_SIZE
+    
+    http = session if session is not None else requests
+    retry = retry if retry is not None else RetryPolicy()
+    limiter = limiter if limiter is not None else UNLIMITED
+    metrics = metrics if metrics is not None else NO_METRICS
+    buffer = StreamBuffer(chunk_size or uploader.chunk_size or STREAM_CHUNK_SIZE)
+    result = {}
+    uploader_thread = None
+    log = progress.write if progress is not None else print
+    size = None
+    written = 0
+    attempt = 0
+    read_buffer = bytearray(READ_BUFFER_SIZE)
+    
+    def upload():
+        result['id'] = uploader.upload_stream(buffer, filename, parent_id, size=size,
+                                              show_progress=progress is None, progress=progress)
+    
+    def write(block):
+        nonlocal written
+        # StreamBuffer copies the block, so the read buffer can be reused
+        buffer.write(block)
+        written += len(block)
+        timer.add(len(block))
+        limiter.consume(len(block))
+    
+    with metrics.transfer('download', filename) as timer:
+        try:
+            while True:
+                resumed_at = written
+                try:
+                    # The declared upload size is Content-Length, so the body
+                    # must arrive exactly as sent, not decompressed
+                    headers = {'Accept-Encoding': 'identity'}
+                    if written:
+                        headers['Range'] = f'bytes={written}-'
+                    timer.request()
+                    response = http.get(url, headers=headers, stream=True, timeout=30)
+                    with response:
+                        response.raise_for_status()
+                        if written and response.status_code != 206:
+                            raise RangeIgnored("Server can't resume the download (no Range support)")
+                        
+                        if uploader_thread is None:
+                            if 'content-length' in response.headers:
+                                size = int(response.headers['content-length'])
+                            if progress is not None and size:
+                                progress.add_total(size)
+                            uploader_thread = threading.Thread(target=upload, daemon=True)
+                            uploader_thread.start()
+                        
+                        copy_body(response, write, read_buffer)
+                    if size and written < size:
+                        raise TransferInterrupted(f"Download ended early ({written}/{size} bytes)")
+                    break
+                except StreamAborted:
+                    raise
+                except Exception as e:
+                    if written > resumed_at:
+                        attempt = 0  # Still making progress
+                    if not retry.should_retry(e, attempt):
+                        raise
+                    timer.retried()
+                    retry.wait(e, attempt)
+                    attempt += 1
+            buffer.close()
+        except StreamAborted:
+            timer.ok = False  # The upload failed and has already said why
+        except Exception as e:
+            timer.ok = False
+            buffer.abort(e)
+            log(f"Error streaming file: {e}")
+    
+    if uploader_thread is not None:
+        uploader_thread.join()
+    return result.get('id')
+
+
+def stream_all(download_links, uploader, parent_id, jobs=1, session=None, retry=None, limiter=None,
+               upload_jobs=None, metrics=None):
+    """
+    Stream every link into the Drive folder parent_id, jobs at a time.
+    
+    Every stream is an upload too, so no more than ``upload_jobs`` run at
+    once when given: a download waiting for an upload slot would only
+    fill its buffer and hold its Zoom connection open until it times out.
+    
+    Returns:
+        (successful, failed) counts
+    """
+    planned = plan_downloads(download_links, Path('.'))
+    total = len(planned)
+    successful = 0
+    failed = 0
+    if upload_jobs is not None:
+        jobs = min(jobs, upload_jobs)
+    
+    for i, (link, filename, filepath, file_type) in enumerate(planned, 1):
+        print(f"[{i}/{total}] {file_type}")
+        print(f"  → {filename}")
+    print(f"\n☁️  Streaming {total} file(s) to Google Drive with {min(jobs, total)} parallel jobs\n")
+    
+    progress = CombinedProgress(description="  Streaming")
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, total))) as executor:
+            futures = [
+                executor.submit(stream_to_drive, link['url'], filename, uploader, parent_id,
+                                progress=progress, session=session, retry=retry, limiter=limiter,
+                                metrics=metrics)
+                for link, filename, filepath, file_type in planned
+            ]
+            for future in as_completed(futures):
+                if future.result():
+                    successful += 1
+                else:
+                    failed += 1
+    finally:
+        progress.close()
+    
+    return successful, failed
+
+
+def connect_drive(args, folder_name, **options):
+    """Authenticate with Google Drive and find or create the upload folder.
+
+    ``args`` supplies auth, credentials and token; extra keyword options go
+    to GoogleDriveUploader. Returns (uploader, folder_id); exits when either
+    step fails.
+    """
+    from upload_to_google_drive import GoogleDriveUploader
+    
+    uploader = GoogleDriveUploader(auth_method=args.auth, credentials_file=args.credentials,
+                                   token_file=args.token, **options)
+    if not uploader.authenticate():
+        print("\n❌ Authentication failed. Cannot upload to Google Drive.")
+        sys.exit(1)
+    
+    folder_id = uploader.find_folder_by_name(folder_name) or uploader.create_folder(folder_name)
+    if not folder_id:
+        print(f"\n❌ Could not find or create Drive folder: {folder_name}")
+        sys.exit(1)
+    return uploader, folder_id
+
+
+# Scrape contexts never load these resource types; stylesheets still load
+# so that visibility checks see the real layout
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+
+# Analytics, tag manager and consent hosts a scrape doesn't need (subdomains included)
+TRACKER_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googleadservices.com',
+    'facebook.net',
+    'linkedin.com',
+    'hotjar.com',
+    'segment.io',
+    'segment.com',
+    'optimizely.com',
+    'nr-data.net',
+    'newrelic.com',
+    'sentry.io',
+    'cookielaw.org',
+    'onetrust.com',
+    'demdex.net',
+    'omtrdc.net',
+    'bing.com',
+)
+
+# Big enough for Zoom's desktop layout, small enough to keep every page's
+# surfaces small when several load at once
+SCRAPE_VIEWPORT = {'width': 1024, 'height': 768}
+FULL_VIEWPORT = {'width': 1920, 'height': 1080}
+
+
+def _is_tracker(url):
+    host = urlparse(url).hostname or ''
+    return any(host == domain or host.endswith('.' + domain) for domain in TRACKER_DOMAINS)
+
+
+def _block_heavy_resources(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_tracker(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def new_scrape_context(browser, lean=True, storage_state=None):
+    """
+    Create a browser context for scraping recording pages.
+    
+    Finding the download links needs none of the player's video, images,
+    fonts or analytics, so a lean context (the default) blocks them all
+    and uses a small viewport. Pages get ready sooner and each concurrent
+    page takes less memory.
+    
+    Args:
+        browser: Playwright browser
+        lean: Block heavy resources and use SCRAPE_VIEWPORT; False loads
+            everything in a 1920x1080 window, like a regular browser
+        storage_state: File saved by save_browser_state() with the
+            cookies and local storage to start from; ignored if it doesn't
+            exist yet
+    """
+    options = {'viewport': SCRAPE_VIEWPORT if lean else FULL_VIEWPORT, 'user_agent': USER_AGENT}
+    if storage_state and os.path.exists(storage_state):
+        options['storage_state'] = storage_state
+    context = browser.new_context(**options)
+    if lean:
+        context.route('**/*', _block_heavy_resources)
+    return context
+
+
+def save_browser_state(context, path):
+    """
+    Save the context's cookies and local storage for the next run's
+    new_scrape_context(). The file holds session cookies, so only the
+    user can read it.
+    """
+    try:
+        state = context.storage_state()
     except Exception as e:
-        print(f"Error downloading file: {e}")
+        print(f"Warning: Could not save the browser state: {e}")
+        return
+    
+    tmp_file = f"{path}.tmp"
+    with open(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_file, path)
+
+
+def add_browser_arguments(parser):
+    """Add the --full-browser and --browser-state options to an ArgumentParser."""
+    parser.add_argument('--full-browser', action='store_true',
+                       help='Load recording pages with their images, media, fonts and trackers in a 1920x1080 '
+                            'window, like a regular browser (useful with --visible)')
+    parser.add_argument('--browser-state', metavar='FILE',
+                       help='Start the browser with the cookies and local storage saved in this file, and save '
+                            'them back after a successful scrape, so later runs start warm')
+
+
+def open_recording_page(context, url, timeouts=None):
+    """
+    Start loading a recording page in context without waiting for it.
+    
+    Returns:
+        (page, collector) - the collector is attached before navigation so
+        it sees the page's API responses
+    """
+    page = context.new_page()
+    collector = RecordingResponseCollector(page)
+    page.goto(url, wait_until='commit', timeout=(timeouts or DEFAULT_TIMEOUTS).navigation * 1000)
+    return page, collector
+
+
+def scrape_recording(page, collector, password=None, prompt=True, discovery='auto', metrics=None,
+                     timeouts=None):
+    """
+    Authenticate on a recording page and collect what's needed to download it.
+    
+    Args:
+        page, collector: As returned by open_recording_page()
+        password: Recording password, if already known
+        prompt: Whether to ask for a password that wasn't supplied
+        discovery: Link discovery method for find_download_links()
+        metrics: TransferMetrics to time each step in
+        timeouts: PageTimeouts for the page load, the password check and
+            waiting for the recording
+        
+    Returns:
+        Dictionary with status ('ok', 'auth_failed' or 'no_links'), title,
+        folder_name, links, cookies and page_url
+    """
+    metrics = metrics if metrics is not None else NO_METRICS
+    timeouts = timeouts or DEFAULT_TIMEOUTS
+    result = {
+        'status': 'auth_failed',
+        'title': None,
+        'folder_name': None,
+        'links': [],
+        'cookies': [],
+        'page_url': page.url,
+    }
+    
+    with metrics.phase('page_load'):
+        page.wait_for_load_state('domcontentloaded', timeout=timeouts.navigation * 1000)
+    
+    # Handle password if needed
+    with metrics.phase('password'):
+        authenticated = check_and_handle_password(page, password=password, prompt=prompt,
+                                                  collector=collector, timeouts=timeouts)
+    if not authenticated:
+        return result
+    
+    # Get meeting title
+    print("\n📝 Extracting meeting information...")
+    with metrics.phase('meeting_title'):
+        meeting_title = None
+        if discovery in ('auto', 'network'):
+            _, meeting_title = collector.parse()
+        if not meeting_title:
+            meeting_title = get_meeting_title(page)
+    result['title'] = meeting_title
+    result['folder_name'] = sanitize_filename(meeting_title)
+    print(f"Meeting: {meeting_title}")
+    
+    # Find all download links
+    print("\n🔍 Finding downloadable files...")
+    with metrics.phase('link_discovery', discovery=discovery):
+        result['links'] = find_download_links(page, collector, discovery=discovery, timeouts=timeouts)
+    result['status'] = 'ok' if result['links'] else 'no_links'
+    result['cookies'] = page.context.cookies()
+    result['page_url'] = page.url
+    return result
+
+
+# Scraped recordings are reused for this long (seconds); every cached link
+# is also checked against the server before the cache entry is used
+SCRAPE_CACHE_TTL = 30 * 60
+
+# Least recently used recordings beyond this many are dropped from the cache
+SCRAPE_CACHE_SIZE = 50
+
+
+class ScrapeCache:
+    """
+    On-disk cache of scrape_recording() results, keyed by share URL.
+    
+    Keeps the title, folder name, download links, cookies and page URL of
+    recently scraped recordings so that a retry or re-run can skip the
+    browser. Entries expire after ``ttl`` seconds and only the
+    ``max_entries`` most recently used are kept. The file holds session
+    cookies, so it is only readable by its owner.
+    """
+    
+    def __init__(self, cache_file, ttl=SCRAPE_CACHE_TTL, max_entries=SCRAPE_CACHE_SIZE):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        try:
+            with open(cache_file) as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read scrape cache {cache_file}: {e}")
+    
+    def lookup(self, url, session=None):
+        """
+        Cached result for url if it is fresh and its links still answer.
+        
+        Each link gets a HEAD request with the cached cookies; an expired
+        signature or session drops the entry and returns None, so the
+        caller scrapes the page again.
+        """
+        key = url.strip()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry['saved'] > self.ttl:
+            self.remove(url)
+            return None
+        
+        result = entry['result']
+        http = session if session is not None else create_download_session(
+            cookies=result['cookies'], referer=result['page_url'])
+        try:
+            valid = all(link_is_valid(http, link['url']) for link in result['links'])
+        finally:
+            if session is None:
+                http.close()
+        if not valid:
+            self.remove(url)
+            return None
+        
+        with self._lock:
+            entry['used'] = time.time()
+            self._save_locked()
+        return result
+    
+    def put(self, url, result):
+        """Remember a successful scrape of url."""
+        now = time.time()
+        with self._lock:
+            self._entries[url.strip()] = {'saved': now, 'used': now, 'result': result}
+            self._save_locked()
+    
+    def remove(self, url):
+        """Forget url, e.g. after its links stopped working."""
+        with self._lock:
+            if self._entries.pop(url.strip(), None) is not None:
+                self._save_locked()
+    
+    def _save_locked(self):
+        now = time.time()
+        self._entries = {key: entry for key, entry in self._entries.items() if now - entry['saved'] <= self.ttl}
+        if len(self._entries) > self.max_entries:
+            recent = sorted(self._entries, key=lambda key: self._entries[key]['used'])[-self.max_entries:]
+            self._entries = {key: self._entries[key] for key in recent}
+        
+        tmp_file = f"{self.cache_file}.tmp"
+        with open(os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_file, self.cache_file)
+
+
+def link_is_valid(http, url):
+    """Whether the server still serves url; used to check cached signed links."""
+    try:
+        response = http.head(url, allow_redirects=True, timeout=15)
+        if response.status_code in (405, 501):
+            # No HEAD support: ask for the first byte instead
+            response = http.get(url, headers={'Range': 'bytes=0-0'}, stream=True, timeout=15)
+            response.close()
+        return response.status_code < 400
+    except requests.RequestException:
         return False
 
 
+def fetch_recording(zoom_url, headless=True, discovery='auto', cache=None, password=None, prompt=True,
+                    metrics=None, timeouts=None, lean=True, storage_state=None):
+    """
+    Scrape a recording page, or reuse a cached scrape whose links still work.
+    
+    The browser is only started when the cache can't answer, and is closed
+    again before returning. Successful scrapes are added to ``cache``.
+    Each step is timed in ``metrics`` and bounded by ``timeouts``. ``lean``
+    and ``storage_state`` are passed to new_scrape_context(), and a
+    successful scrape saves its state back to ``storage_state``.
+    
+    Returns:
+        Same dictionary as scrape_recording()
+    """
+    metrics = metrics if metrics is not None else NO_METRICS
+    if cache is not None:
+        with metrics.phase('cache_lookup'):
+            result = cache.lookup(zoom_url)
+        if result is not None:
+            print("♻️  Using cached recording details, skipping the browser")
+            return result
+    
+    with sync_playwright() as p:
+        print("🚀 Starting browser...")
+        with metrics.phase('browser_start'):
+            browser = p.chromium.launch(headless=headless)
+        try:
+            context = new_scrape_context(browser, lean=lean, storage_state=storage_state)
+            print(f"📂 Loading recording page...")
+            with metrics.phase('navigation'):
+                page, collector = open_recording_page(context, zoom_url, timeouts)
+            result = scrape_recording(page, collector, password=password, prompt=prompt,
+                                      discovery=discovery, metrics=metrics, timeouts=timeouts)
+            if storage_state and result['status'] == 'ok':
+                save_browser_state(context, storage_state)
+        finally:
+            browser.close()
+    
+    if cache is not None and result['status'] == 'ok':
+        cache.put(zoom_url, result)
+    return result
+
+
+def read_url_file(path):
+    """
+    Read recording URLs for batch mode from a file, or stdin when path is '-'.
+    
+    Each line is a URL optionally followed by whitespace and the recording's
+    password. Blank lines and lines starting with '#' are ignored.
+    
+    Returns:
+        List of (url, password) tuples; password is None when not given
+    """
+    if path == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    
+    entries = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split(None, 1)
+        entries.append((parts[0], parts[1].strip() if len(parts) > 1 else None))
+    return entries
+
+
+def run_batch(browser, entries, jobs=4, segments=4, scrape_jobs=3, discovery='auto', prompt=True,
+              retry=None, limiter=None, checksums=None, metrics=None, timeouts=None, lean=True,
+              storage_state=None):
+    """
+    Scrape many recordings with one browser and download all their files
+    through one shared queue.
+    
+    Recording pages are loaded in waves of ``scrape_jobs``, each in one of a
+    small pool of reused browser contexts, so their page loads overlap.
+    Playwright's sync API drives them from this thread one after another,
+    and every file found is queued on a single download pool straight away,
+    so downloads of earlier recordings run while later ones are scraped.
+    The contexts come from new_scrape_context() with ``lean`` and
+    ``storage_state``; each recording starts from the saved cookies.
+    
+    Returns:
+        List with one report dictionary per URL, in input order
+    """
+    reports = [{
+        'url': url,
+        'status': 'pending',
+        'title': None,
+        'folder': None,
+        'files': [],
+        'successful': 0,
+        'failed': 0,
+        'error': None,
+    } for url, _ in entries]
+    
+    downloads_base = Path("downloads")
+    downloads_base.mkdir(exist_ok=True)
+    used_folders = set()
+    
+    contexts = [
+        new_scrape_context(browser, lean=lean, storage_state=storage_state)
+        for _ in range(max(1, min(scrape_jobs, len(entries))))
+    ]
+    # Cookies from storage_state, put back whenever a context is reused
+    warm_cookies = contexts[0].cookies()
+    scraped_context = None
+    # One connection pool for every recording's session; cookies stay per recording
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=jobs * segments)
+    progress = None
+    pending = []
+    
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for wave_start in range(0, len(entries), len(contexts)):
+                wave = list(range(wave_start, min(wave_start + len(contexts), len(entries))))
+                
+                # Start every page in the wave loading before working on any of them
+                opened = []
+                for context, index in zip(contexts, wave):
+                    url, password = entries[index]
+                    context.clear_cookies()
+                    if warm_cookies:
+                        context.add_cookies(warm_cookies)
+                    try:
+                        page, collector = open_recording_page(context, url, timeouts)
+                        opened.append((context, index, password, page, collector))
+                    except Exception as e:
+                        reports[index]['status'] = 'error'
+                        reports[index]['error'] = str(e)
+                
+                for context, index, password, page, collector in opened:
+                    report = reports[index]
+                    print(f"\n📍 [{index + 1}/{len(entries)}] {report['url']}")
+                    try:
+                        result = scrape_recording(page, collector, password=password, prompt=prompt,
+                                                  discovery=discovery, metrics=metrics, timeouts=timeouts)
+                    except Exception as e:
+                        report['status'] = 'error'
+                        report['error'] = str(e)
+                        print(f"  ✗ {e}")
+                        continue
+                    finally:
+                        page.close()
+                    
+                    report['title'] = result['title']
+                    if result['status'] != 'ok':
+                        report['status'] = result['status']
+                        print(f"  ✗ {'Authentication failed' if result['status'] == 'auth_failed' else 'No download links found'}")
+                        continue
+                    scraped_context = context
+                    
+                    # Recordings with the same title get their own folders
+                    folder_name = result['folder_name']
+                    suffix = 2
+                    while folder_name in used_folders:
+                        folder_name = f"{result['folder_name']}_{suffix}"
+                        suffix += 1
+                    used_folders.add(folder_name)
+                    download_folder = downloads_base / folder_name
+                    download_folder.mkdir(exist_ok=True)
+                    report['folder'] = str(download_folder)
+                    report['status'] = 'downloading'
+                    print(f"✓ Found {len(result['links'])} file(s) → {download_folder}")
+                    
+                    session = create_download_session(
+                        cookies=result['cookies'],
+                        referer=result['page_url'],
+                        adapter=adapter
+                    )
+                    if progress is None:
+                        progress = CombinedProgress(description="  Downloading")
+                    for link, filename, filepath, file_type in plan_downloads(result['links'], download_folder):
+                        file_report = {'filename': filename, 'path': str(filepath), 'type': file_type, 'ok': None}
+                        report['files'].append(file_report)
+                        future = executor.submit(download_file, link['url'], filepath, progress=progress,
+                                                 segments=segments, session=session, retry=retry,
+                                                 limiter=limiter, checksums=checksums, metrics=metrics)
+                        pending.append((report, file_report, future))
+            
+            for report, file_report, future in pending:
+                file_report['ok'] = future.result()
+                if file_report['ok']:
+                    report['successful'] += 1
+                else:
+                    report['failed'] += 1
+    finally:
+        if progress is not None:
+            progress.close()
+        adapter.close()
+        if storage_state and scraped_context is not None:
+            save_browser_state(scraped_context, storage_state)
+        for context in contexts:
+            context.close()
+    
+    for report in reports:
+        if report['status'] == 'downloading':
+            report['status'] = 'ok' if report['failed'] == 0 else 'failed'
+    
+    return reports
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Download all files from a Zoom recording URL',
@@ -272,18 +2006,109 @@ def main():
 Examples:
   %(prog)s https://zoom.us/rec/share/xxxxx
   %(prog)s "https://zoom.us/rec/play/xxxxx"
+  %(prog)s https://zoom.us/rec/share/xxxxx --jobs 1
+  %(prog)s --url-file recordings.txt --report report.json
+  cat recordings.txt | %(prog)s --url-file -
+  %(prog)s https://zoom.us/rec/share/xxxxx --stream-to-drive "Zoom Recordings"
+  %(prog)s https://zoom.us/rec/share/xxxxx --engine async --jobs 8
+
+URL files contain one recording per line, optionally followed by its password:
+  https://zoom.us/rec/share/xxxxx
+  https://zoom.us/rec/share/yyyyy  s3cret
         """
     )
-    parser.add_argument('url', help='Zoom recording URL')
+    parser.add_argument('url', nargs='?', help='Zoom recording URL')
+    parser.add_argument('--url-file', '-f',
+                       help='Batch mode: read recording URLs from this file ("-" for stdin)')
     parser.add_argument('--headless', action='store_true', default=True,
                        help='Run browser in headless mode (default: True)')
     parser.add_argument('--visible', action='store_true',
                        help='Show browser window (opposite of headless)')
+    parser.add_argument('--jobs', '-j', type=int, default=4,
+                       help='Number of files to download in parallel (default: 4)')
+    parser.add_argument('--segments', '-s', type=int, default=4,
+                       help='Parallel byte ranges per large file when the server supports it (default: 4, 1 disables)')
+    parser.add_argument('--discovery', choices=['auto', 'network', 'dom', 'selectors'], default='auto',
+                       help='How to find download links: from the page\'s API responses, one DOM extraction, '
+                            'or per-selector probing (default: auto, tries them in that order)')
+    parser.add_argument('--scrape-jobs', type=int, default=3,
+                       help='Batch mode: recording pages loaded at the same time (default: 3)')
+    parser.add_argument('--report', default='downloads/batch_report.json',
+                       help='Batch mode: where to write the per-URL JSON report '
+                            '(default: downloads/batch_report.json)')
+    parser.add_argument('--retries', type=int, default=5,
+                       help='Times to retry a dropped connection or a 429/5xx response, with backoff, '
+                            'before a file fails (default: 5)')
+    parser.add_argument('--max-download-rate', type=float, metavar='MIB_PER_SEC',
+                       help='Cap the combined download speed of all files, in MiB/s')
+    parser.add_argument('--max-connections-per-host', type=int, metavar='N',
+                       help='Cap the number of open requests to each server (default: no cap)')
+    parser.add_argument('--cache-file', default='.zoom_scrape_cache.json',
+                       help='Where scraped recording details are cached so a re-run can skip the browser '
+                            'while the download links still work (default: .zoom_scrape_cache.json)')
+    parser.add_argument('--cache-ttl', type=float, default=SCRAPE_CACHE_TTL / 60, metavar='MINUTES',
+                       help='How long cached recording details are reused (default: 30)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always scrape the recording page')
+    parser.add_argument('--checksums', metavar='FILE',
+                       help='Record the size and MD5 of every file in this JSON file')
+    parser.add_argument('--sha256', action='store_true',
+                       help='Also compute SHA-256 checksums for --checksums')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads',
+                       help='Run the downloads on a thread pool or as asyncio tasks on one event loop '
+                            '(async needs httpx; default: threads)')
+    add_timeout_arguments(parser)
+    add_browser_arguments(parser)
+    add_metrics_arguments(parser)
+    parser.add_argument('--stream-to-drive', metavar='DRIVE_FOLDER',
+                       help='Upload straight into this Google Drive folder while downloading, '
+                            'without saving the files locally')
+    parser.add_argument('--auth', '-a', choices=['oauth', 'service_account'], default='oauth',
+                       help='With --stream-to-drive: Google authentication method (default: oauth)')
+    parser.add_argument('--credentials', '-c',
+                       help='With --stream-to-drive: Google credentials file '
+                            '(default: client_secrets.json or service_account.json)')
+    parser.add_argument('--token', '-t', default='token.json',
+                       help='With --stream-to-drive: OAuth token file (default: token.json)')
     
     args = parser.parse_args()
     
-    zoom_url = args.url.strip()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.segments < 1:
+        parser.error("--segments must be at least 1")
+    if args.scrape_jobs < 1:
+        parser.error("--scrape-jobs must be at least 1")
+    if args.retries < 0:
+        parser.error("--retries can't be negative")
+    if args.max_download_rate is not None and args.max_download_rate <= 0:
+        parser.error("--max-download-rate must be positive")
+    if args.max_connections_per_host is not None and args.max_connections_per_host < 1:
+        parser.error("--max-connections-per-host must be at least 1")
+    if bool(args.url) == bool(args.url_file):
+        parser.error("give either a recording URL or --url-file")
+    if args.stream_to_drive and args.url_file:
+        parser.error("--stream-to-drive works with a single recording URL")
+    if args.sha256 and not args.checksums:
+        parser.error("--sha256 needs --checksums")
+    if args.cache_ttl < 0:
+        parser.error("--cache-ttl can't be negative")
+    if args.engine == 'async' and (args.url_file or args.stream_to_drive):
+        parser.error("--engine async works with a single recording URL, without --stream-to-drive")
+    
     headless = not args.visible if args.visible else args.headless
+    limiter = TransferLimiter(
+        rate=args.max_download_rate * 1024 * 1024 if args.max_download_rate else None,
+        per_host=args.max_connections_per_host
+    )
+    checksums = ChecksumManifest(args.checksums, sha256=args.sha256) if args.checksums else None
+    metrics = metrics_from_args(args)
+    
+    if args.url_file:
+        run_batch_mode(args, headless, limiter, checksums, metrics)
+        return
+    
+    zoom_url = args.url.strip()
     
     # Validate URL
     if not zoom_url.startswith('http'):
@@ -296,97 +2121,117 @@ Examples:
     print(f"🎥 Zoom Recording Downloader")
     print(f"📍 URL: {zoom_url}\n")
     
+    uploader = drive_folder_id = None
+    if args.stream_to_drive:
+        # Authenticate before the browser starts so an OAuth prompt doesn't race the page
+        uploader, drive_folder_id = connect_drive(args, args.stream_to_drive,
+                                                  retry=RetryPolicy(attempts=args.retries),
+                                                  checksums=checksums, metrics=metrics)
+    
+    cache = None
+    if not args.no_cache:
+        cache = ScrapeCache(args.cache_file, ttl=args.cache_ttl * 60)
+    
     try:
-        with sync_playwright() as p:
-            # Launch browser
-            print("🚀 Starting browser...")
-            browser = p.chromium.launch(headless=headless)
-            context = browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        # Only starts the browser when the cache can't be used
+        result = fetch_recording(zoom_url, headless=headless, discovery=args.discovery, cache=cache,
+                                 metrics=metrics, timeouts=timeouts_from_args(args),
+                                 lean=not args.full_browser, storage_state=args.browser_state)
+        
+        if result['status'] == 'auth_failed':
+            print("\n❌ Failed to authenticate. Exiting.")
+            sys.exit(1)
+        
+        if result['status'] == 'no_links':
+            print("\n⚠️  No download links found on the page.")
+            print("\nPossible reasons:")
+            print("  • Download is disabled by the host/administrator")
+            print("  • Recording is view-only (streaming only)")
+            print("  • You may need to log in with your Zoom account (not just meeting password)")
+            print("  • The page structure is different than expected")
+            print("\n💡 Troubleshooting:")
+            print("  1. Open the URL in a regular browser")
+            print("  2. Check if you can see any 'Download' buttons")
+            print("  3. Try running with --visible to see what the script sees:")
+            print(f"     python download_zoom_recordings.py \"{zoom_url}\" --visible")
+            sys.exit(1)
+        
+        download_links = result['links']
+        print(f"✓ Found {len(download_links)} file(s) to download")
+        
+        if uploader is not None:
+            session = create_download_session(
+                cookies=result['cookies'],
+                referer=result['page_url'],
+                pool_size=args.jobs
             )
-            page = context.new_page()
-            
-            # Navigate to URL
-            print(f"📂 Loading recording page...")
-            page.goto(zoom_url, wait_until='domcontentloaded', timeout=30000)
-            
-            # Handle password if needed
-            if not check_and_handle_password(page):
-                print("\n❌ Failed to authenticate. Exiting.")
-                browser.close()
-                sys.exit(1)
-            
-            # Get meeting title
-            print("\n📝 Extracting meeting information...")
-            meeting_title = get_meeting_title(page)
-            folder_name = sanitize_filename(meeting_title)
-            print(f"Meeting: {meeting_title}")
-            
-            # Create downloads directory structure: downloads/meeting_name/
-            downloads_base = Path("downloads")
-            downloads_base.mkdir(exist_ok=True)
-            download_folder = downloads_base / folder_name
-            download_folder.mkdir(exist_ok=True)
-            print(f"📁 Download folder: {download_folder.absolute()}")
-            
-            # Find all download links
-            print("\n🔍 Finding downloadable files...")
-            download_links = find_download_links(page)
-            
-            if not download_links:
-                print("\n⚠️  No download links found on the page.")
-                print("\nPossible reasons:")
-                print("  • Download is disabled by the host/administrator")
-                print("  • Recording is view-only (streaming only)")
-                print("  • You may need to log in with your Zoom account (not just meeting password)")
-                print("  • The page structure is different than expected")
-                print("\n💡 Troubleshooting:")
-                print("  1. Open the URL in a regular browser")
-                print("  2. Check if you can see any 'Download' buttons")
-                print("  3. Try running with --visible to see what the script sees:")
-                print(f"     python download_zoom_recordings.py \"{zoom_url}\" --visible")
-                browser.close()
-                sys.exit(1)
-            
-            print(f"✓ Found {len(download_links)} file(s) to download\n")
-            
-            # Download each file
-            successful = 0
-            failed = 0
-            
-            for i, link in enumerate(download_links, 1):
-                filename = sanitize_filename(link['filename'])
-                if not filename:
-                    filename = f"file_{i}"
-                
-                filepath = download_folder / filename
-                file_type = link['type'][:50] if link['type'] else filename
-                
-                print(f"\n[{i}/{len(download_links)}] {file_type}")
-                print(f"  → {filename}")
-                
-                if download_file(link['url'], filepath, description=f"  Downloading"):
-                    print(f"  ✓ Saved to {filepath}")
-                    successful += 1
-                else:
-                    print(f"  ✗ Failed to download")
-                    failed += 1
-            
-            browser.close()
+            with metrics.phase('stream_to_drive'):
+                successful, failed = stream_all(download_links, uploader, drive_folder_id,
+                                                jobs=args.jobs, session=session,
+                                                retry=RetryPolicy(attempts=args.retries), limiter=limiter,
+                                                metrics=metrics)
+            session.close()
+            if failed > 0 and cache is not None:
+                cache.remove(zoom_url)  # The links may have expired; scrape again next time
             
-            # Summary
             print("\n" + "="*60)
-            print(f"📊 Download Summary:")
+            print(f"📊 Streaming Summary:")
             print(f"  ✓ Successful: {successful}")
             if failed > 0:
                 print(f"  ✗ Failed: {failed}")
-            print(f"  📁 Location: {download_folder.absolute()}")
+            print(f"  ☁️  Drive folder: {args.stream_to_drive}")
             print("="*60)
             
             if failed > 0:
                 sys.exit(1)
+            return
+        
+        # Create downloads directory structure: downloads/meeting_name/
+        downloads_base = Path("downloads")
+        downloads_base.mkdir(exist_ok=True)
+        download_folder = downloads_base / result['folder_name']
+        download_folder.mkdir(exist_ok=True)
+        print(f"📁 Download folder: {download_folder.absolute()}\n")
+        
+        # Quota errors shrink the number of files downloading at once
+        retry = RetryPolicy(attempts=args.retries, gate=ConcurrencyGate(args.jobs))
+        if args.engine == 'async':
+            import async_transfer
+            with metrics.phase('downloads', engine='async'):
+                successful, failed = async_transfer.download_all(
+                    download_links, download_folder, cookies=result['cookies'], referer=result['page_url'],
+                    jobs=args.jobs, segments=args.segments, retry=retry, limiter=limiter,
+                    checksums=checksums, metrics=metrics
+                )
+        else:
+            # Reuse the browser's authenticated cookies over one pooled session
+            session = create_download_session(
+                cookies=result['cookies'],
+                referer=result['page_url'],
+                pool_size=args.jobs * args.segments
+            )
             
+            # Download all files
+            with metrics.phase('downloads'):
+                successful, failed = download_all(download_links, download_folder, jobs=args.jobs,
+                                                  segments=args.segments, session=session, retry=retry,
+                                                  limiter=limiter, checksums=checksums, metrics=metrics)
+            session.close()
+        if failed > 0 and cache is not None:
+            cache.remove(zoom_url)  # The links may have expired; scrape again next time
+        
+        # Summary
+        print("\n" + "="*60)
+        print(f"📊 Download Summary:")
+        print(f"  ✓ Successful: {successful}")
+        if failed > 0:
+            print(f"  ✗ Failed: {failed}")
+        print(f"  📁 Location: {download_folder.absolute()}")
+        print("="*60)
+        
+        if failed > 0:
+            sys.exit(1)
+        
     except KeyboardInterrupt:
         print("\n\n⚠️  Download cancelled by user.")
         sys.exit(130)
@@ -400,6 +2245,70 @@ Examples:
         sys.exit(1)
 
 
+def run_batch_mode(args, headless, limiter=None, checksums=None, metrics=None):
+    """Batch mode entry point: process every URL from --url-file with one browser."""
+    metrics = metrics if metrics is not None else NO_METRICS
+    try:
+        entries = read_url_file(args.url_file)
+    except OSError as e:
+        print(f"Error: Could not read URL file: {e}")
+        sys.exit(1)
+    
+    if not entries:
+        print("Error: No recording URLs found in the URL file.")
+        sys.exit(1)
+    
+    print(f"🎥 Zoom Recording Downloader (batch)")
+    print(f"📋 {len(entries)} recording(s) to process\n")
+    
+    try:
+        with sync_playwright() as p:
+            print("🚀 Starting browser...")
+            with metrics.phase('browser_start'):
+                browser = p.chromium.launch(headless=headless)
+            reports = run_batch(
+                browser, entries,
+                jobs=args.jobs,
+                segments=args.segments,
+                scrape_jobs=args.scrape_jobs,
+                discovery=args.discovery,
+                # stdin carries the URL list, so there's nobody to ask for passwords
+                prompt=args.url_file != '-',
+                retry=RetryPolicy(attempts=args.retries, gate=ConcurrencyGate(args.jobs)),
+                limiter=limiter,
+                checksums=checksums,
+                metrics=metrics,
+                timeouts=timeouts_from_args(args),
+                lean=not args.full_browser,
+                storage_state=args.browser_state
+            )
+            browser.close()
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Download cancelled by user.")
+        sys.exit(130)
+    
+    report_path = Path(args.report)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w') as f:
+        json.dump({'recordings': reports}, f, indent=2)
+    
+    ok = sum(1 for r in reports if r['status'] == 'ok')
+    
+    # Summary
+    print("\n" + "="*60)
+    print(f"📊 Batch Summary:")
+    print(f"  ✓ Recordings downloaded: {ok}")
+    if ok < len(reports):
+        print(f"  ✗ Recordings with problems: {len(reports) - ok}")
+        for r in reports:
+            if r['status'] != 'ok':
+                print(f"     • {r['url']} ({r['status']})")
+    print(f"  📄 Report: {report_path.absolute()}")
+    print("="*60)
+    
+    if ok < len(reports):
+        sys.exit(1)
+
+
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Transfer Control
+Retry, concurrency and bandwidth policy shared by download_zoom_recordings.py
+and upload_to_google_drive.py, so transient HTTP and quota errors and rate
+limits are handled the same way on both sides of a Zoom to Drive transfer.
+"""
+
+import time
+import random
+import socket
+import threading
+import http.client
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+# Each side only needs its own HTTP library installed
+try:
+    import requests
+except ImportError:
+    requests = None
+try:
+    import httplib2
+except ImportError:
+    httplib2 = None
+
+
+# Statuses worth trying again: timeouts, throttling and server-side failures
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Drive reports some quota errors as 403 with one of these reasons
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+
+class TransferInterrupted(IOError):
+    """A connection dropped or a body ended before all of its bytes arrived."""
+
+
+def _network_errors():
+    """Exception types raised for dropped connections and timeouts."""
+    # httplib2 lets socket errors through as they are
+    errors = [TransferInterrupted, ConnectionError, socket.timeout, http.client.IncompleteRead]
+    if requests is not None:
+        errors += [requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError]
+    if httplib2 is not None:
+        errors.append(httplib2.ServerNotFoundError)
+    return tuple(errors)
+
+
+# Failures without an HTTP status that are worth trying again; anything
+# else, like a full disk or a server that ignores Range, fails at once
+NETWORK_ERRORS = _network_errors()
+
+
+def parse_retry_after(value):
+    """
+    Seconds to wait from a Retry-After header, given either as a number of
+    seconds or as an HTTP date. Returns None if missing or unparseable.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def describe_error(error):
+    """
+    Work out (status, headers, body) from a requests or googleapiclient
+    error; status is None for connection-level failures.
+    """
+    response = getattr(error, 'response', None)
+    if response is not None and hasattr(response, 'status_code'):
+        # requests.HTTPError
+        return response.status_code, response.headers, response.content or b''
+    resp = getattr(error, 'resp', None)
+    if resp is not None and hasattr(resp, 'status'):
+        # googleapiclient HttpError; httplib2 lowercases header names
+        return resp.status, resp, getattr(error, 'content', b'') or b''
+    return None, {}, b''
+
+
+class ConcurrencyGate:
+    """
+    Limits how many transfers run at once.
+    
+    Starts at ``limit`` and halves whenever a transfer is throttled, then
+    grows back by one slot after every ``limit`` transfers that finish
+    cleanly, so a run that hits a quota slows down instead of failing.
+    """
+    
+    def __init__(self, limit):
+        self.max_limit = max(1, limit)
+        self.limit = self.max_limit
+        self._active = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+    
+    def __enter__(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        with self._cond:
+            self._active -= 1
+            if exc_type is None and self.limit < self.max_limit:
+                self._successes += 1
+                if self._successes >= self.limit:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+        return False
+    
+    def throttle(self):
+        """Halve the limit after a quota or rate-limit response."""
+        with self._cond:
+            self.limit = max(1, self.limit // 2)
+            self._successes = 0
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient transfer errors.
+    
+    Retries NETWORK_ERRORS and the statuses in RETRYABLE_STATUSES (plus
+    Drive's 403 rate-limit errors), waiting a random time up to
+    base_delay * 2**attempt, capped at max_delay, and never less than what
+    the server asked for in Retry-After. Throttling responses also lower
+    ``gate``, if one is attached, for every transfer sharing it.
+    """
+    
+    def __init__(self, attempts=5, base_delay=1.0, max_delay=60.0, gate=None):
+        """
+        Args:
+            attempts: Retries allowed per transfer step after the first try
+                (0 disables retrying)
+            base_delay: Backoff ceiling in seconds for the first retry
+            max_delay: Longest backoff in seconds
+            gate: ConcurrencyGate to throttle on quota errors
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.gate = gate
+    
+    def slot(self):
+        """Context manager holding one of the gate's slots for a transfer."""
+        return self.gate if self.gate is not None else nullcontext()
+    
+    def classify(self, error):
+        """
+        Returns:
+            (retryable, throttled, retry_after) for error
+        """
+        status, headers, body = describe_error(error)
+        if status is None:
+            return isinstance(error, NETWORK_ERRORS), False, None
+        
+        if isinstance(body, str):
+            body = body.encode()
+        throttled = status == 429 or (
+            status == 403 and any(reason.encode() in body for reason in RATE_LIMIT_REASONS))
+        retryable = throttled or status in RETRYABLE_STATUSES
+        return retryable, throttled, parse_retry_after(headers.get('retry-after'))
+    
+    def should_retry(self, error, attempt):
+        """Whether to try again after error on the given (0-based) retry number."""
+        return attempt < self.attempts and self.classify(error)[0]
+    
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+    
+    def delay(self, error, attempt):
+        """Seconds to wait before retrying after error, throttling the gate if needed."""
+        _, throttled, retry_after = self.classify(error)
+        if throttled and self.gate is not None:
+            self.gate.throttle()
+        return self.backoff(attempt, retry_after)
+    
+    def wait(self, error, attempt):
+        """Sleep before retrying after error, throttling the gate if needed."""
+        delay = self.delay(error, attempt)
+        time.sleep(delay)
+        return delay
+
+
+class RetryCounter:
+    """
+    Counts the retries of one transfer step under a RetryPolicy.
+    
+    The step calls reset() whenever it makes progress, so a long transfer
+    on a flaky connection isn't cut off by failures spread over hours, and
+    delay() after every failure. Both engines use it, so the sleep is left
+    to the caller: time.sleep() for threads, asyncio.sleep() for tasks.
+    """
+    
+    def __init__(self, retry, timer=None):
+        """
+        Args:
+            retry: RetryPolicy deciding what to retry and how long to wait
+            timer: TransferTimer to count the retries in
+        """
+        self.retry = retry
+        self.timer = timer
+        self.attempt = 0
+    
+    def reset(self):
+        self.attempt = 0
+    
+    def delay(self, error):
+        """
+        Seconds to wait before trying again after error.
+        
+        Raises:
+            error, if the policy won't retry it (any more)
+        """
+        if not self.retry.should_retry(error, self.attempt):
+            raise error
+        if self.timer is not None:
+            self.timer.retried()
+        delay = self.retry.delay(error, self.attempt)
+        self.attempt += 1
+        return delay
+
+
+class TokenBucket:
+    """
+    Byte-rate limit shared by every transfer in one direction.
+    
+    Tokens refill at ``rate`` bytes per second up to one second's worth.
+    consume() takes what a transfer just moved and sleeps off any deficit,
+    so several threads together stay at the rate instead of bursting.
+    """
+    
+    def __init__(self, rate):
+        self.rate = float(rate)
+        self.capacity = max(self.rate, 64 * 1024)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self, amount):
+        """Take amount tokens; returns how many seconds the caller should wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= amount
+            return -self._tokens / self.rate if self._tokens < 0 else 0
+    
+    def consume(self, amount):
+        wait = self.reserve(amount)
+        if wait:
+            time.sleep(wait)
+
+
+class HostLimiter:
+    """Caps the number of open requests to each host."""
+    
+    def __init__(self, per_host):
+        self.per_host = per_host
+        self._slots = {}
+        self._lock = threading.Lock()
+    
+    def connection(self, url):
+        """Semaphore to hold while a request to url's host is open."""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+
+class TransferLimiter:
+    """
+    Bandwidth and per-host connection limits for one transfer direction.
+    
+    Either limit may be left out. Downloads and uploads in one process
+    should get separate limiters sharing one HostLimiter.
+    """
+    
+    def __init__(self, rate=None, per_host=None, hosts=None):
+        """
+        Args:
+            rate: Bytes per second across all transfers (None for no limit)
+            per_host: Open requests allowed per host (None for no limit)
+            hosts: Existing HostLimiter to share instead of per_host
+        """
+        self.rate = rate
+        self.bucket = TokenBucket(rate) if rate else None
+        if hosts is None and per_host:
+            hosts = HostLimiter(per_host)
+        self.hosts = hosts
+    
+    def consume(self, amount):
+        """Account for amount bytes moved, sleeping if over the rate."""
+        if self.bucket is not None and amount > 0:
+            self.bucket.consume(amount)
+    
+    def connection(self, url):
+        """Context manager to hold while a request to url is open."""
+        return self.hosts.connection(url) if self.hosts is not None else nullcontext()
+
+
+UNLIMITED = TransferLimiter()
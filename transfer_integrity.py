@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Transfer Integrity
+Checksums computed on the bytes as they stream through a download or an
+upload, and the manifest they are recorded in, so a corrupt transfer is
+caught without reading a multi-GB file back from disk.
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+
+class IntegrityError(IOError):
+    """A transferred file doesn't match its expected size or checksum."""
+
+
+class TransferDigest:
+    """
+    MD5 (and optionally SHA-256) of a file, fed in order while it transfers.
+    
+    update_at() takes each block together with its offset in the file.
+    Bytes sent again after a retry are only hashed once. A block that
+    starts past the bytes seen so far leaves a gap, after which the digest
+    is incomplete and md5/sha256 are None.
+    """
+    
+    def __init__(self, sha256=False):
+        self._md5 = hashlib.md5()
+        self._sha256 = hashlib.sha256() if sha256 else None
+        self.position = 0
+        self.complete = True
+    
+    def update_at(self, offset, data):
+        """Hash the part of data (found at offset) that hasn't been seen yet."""
+        if not self.complete:
+            return
+        if offset > self.position:
+            self.complete = False
+            return
+        skip = self.position - offset
+        if skip >= len(data):
+            return
+        block = memoryview(data)[skip:] if skip else data
+        self._md5.update(block)
+        if self._sha256 is not None:
+            self._sha256.update(block)
+        self.position += len(data) - skip
+    
+    def update(self, data):
+        """Hash the next block of the file."""
+        self.update_at(self.position, data)
+    
+    def reset(self):
+        """Start over, e.g. when a download restarts from the first byte."""
+        self.__init__(sha256=self._sha256 is not None)
+    
+    @property
+    def md5(self):
+        return self._md5.hexdigest() if self.complete else None
+    
+    @property
+    def sha256(self):
+        return self._sha256.hexdigest() if self.complete and self._sha256 is not None else None
+
+
+def check(name, size, expected_size=None, md5=None, expected_md5=None):
+    """
+    Compare a transfer against what the other side reported.
+    
+    Either expectation may be None when it isn't known (e.g. no
+    Content-Length, or Drive gives no md5Checksum for Google Docs).
+    
+    Returns:
+        'md5' or 'size', the strongest check that was made, or None
+    
+    Raises:
+        IntegrityError: on a size or checksum mismatch
+    """
+    if expected_size is not None and size != expected_size:
+        raise IntegrityError(f"{name}: size mismatch ({size} bytes, expected {expected_size})")
+    if md5 and expected_md5:
+        if md5 != expected_md5:
+            raise IntegrityError(f"{name}: MD5 mismatch ({md5}, expected {expected_md5})")
+        return 'md5'
+    return 'size' if expected_size is not None else None
+
+
+class ChecksumManifest:
+    """
+    JSON record of the checksums of every transferred file.
+    
+    Entries are keyed by absolute local path (streamed uploads, which have
+    none, by file name) and hold the size, MD5, SHA-256 if enabled, the
+    Drive file ID and md5Checksum once uploaded, and which check passed.
+    A download and the later upload of the same file update one entry.
+    The file is rewritten after every change, so it survives a crash.
+    """
+    
+    def __init__(self, manifest_file, sha256=False):
+        """
+        Args:
+            manifest_file: Path of the JSON manifest
+            sha256: Also compute SHA-256 for every transfer
+        """
+        self.manifest_file = manifest_file
+        self.sha256 = sha256
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(manifest_file):
+            try:
+                with open(manifest_file) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Warning: Could not read checksum manifest {manifest_file}: {e}")
+    
+    def digest(self):
+        """New TransferDigest with the manifest's algorithms."""
+        return TransferDigest(sha256=self.sha256)
+    
+    @staticmethod
+    def key(file_path):
+        return os.path.abspath(file_path)
+    
+    def record(self, key, replace=False, **fields):
+        """Merge fields into the entry for key (or replace it) and save."""
+        with self._lock:
+            if replace:
+                self._entries[key] = fields
+            else:
+                self._entries.setdefault(key, {}).update(fields)
+            tmp_file = f"{self.manifest_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_file, self.manifest_file)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Transfer Metrics
+Timings, byte counts, retries and API call counts for a Zoom to Drive run,
+written as a JSON-lines event log, a JSON summary report and optionally a
+Prometheus textfile, so it's clear where the time of a run went.
+"""
+
+import os
+import json
+import atexit
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+
+class TransferTimer:
+    """
+    Measures one file transfer; returned by TransferMetrics.transfer().
+    
+    The transfer code calls add() for every block it moves and retried()
+    before every retry. A transfer that fails without raising sets ok to
+    False; one that had nothing to do sets skipped.
+    """
+    
+    def __init__(self, direction, name):
+        self.direction = direction
+        self.name = name
+        self.bytes = 0
+        self.retries = 0
+        self.requests = 0
+        self.ok = True
+        self.skipped = False
+        self.started = time.monotonic()
+        self.first_byte = None
+    
+    def add(self, num_bytes):
+        if self.first_byte is None:
+            self.first_byte = time.monotonic() - self.started
+        self.bytes += num_bytes
+    
+    def retried(self):
+        self.retries += 1
+    
+    def request(self):
+        self.requests += 1
+
+
+class TransferMetrics:
+    """
+    Collects the metrics of one run.
+    
+    phase() times a step such as the browser start or the password flow,
+    transfer() one file's download or upload, and count() anything else
+    worth counting, e.g. Drive API calls. Every finished phase and
+    transfer is appended to ``log_file`` as one JSON line straight away,
+    and only totals are kept in memory, so long runs stay small. Safe to
+    use from several threads.
+    """
+    
+    def __init__(self, log_file=None, report_file=None, prometheus_file=None):
+        """
+        Args:
+            log_file: JSON-lines event log to append to (None for no log)
+            report_file: Where finish() writes the JSON summary
+            prometheus_file: Where finish() writes a Prometheus textfile,
+                e.g. for node_exporter's textfile collector
+        """
+        self.report_file = report_file
+        self.prometheus_file = prometheus_file
+        self.started = time.time()
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._phases = {}
+        self._transfers = {}
+        self._counters = {}
+        self._log = open(log_file, 'a', buffering=1) if log_file else None
+        self._finished = False
+        self.event('run_start')
+    
+    def event(self, kind, **fields):
+        """Append one event to the log."""
+        if self._log is None:
+            return
+        line = json.dumps(dict(ts=round(time.time(), 3), event=kind, **fields))
+        with self._lock:
+            # finish() may have closed the log since the check above
+            if self._log is not None:
+                self._log.write(line + '\n')
+    
+    def count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+    
+    @contextmanager
+    def phase(self, name, **fields):
+        """Time the enclosed block as one occurrence of phase name."""
+        started = time.monotonic()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            seconds = time.monotonic() - started
+            with self._lock:
+                total = self._phases.setdefault(name, {'count': 0, 'seconds': 0.0, 'failed': 0})
+                total['count'] += 1
+                total['seconds'] += seconds
+                total['failed'] += not ok
+            self.event('phase', phase=name, seconds=round(seconds, 3), ok=ok, **fields)
+    
+    @contextmanager
+    def transfer(self, direction, name):
+        """
+        Time the enclosed transfer of one file.
+        
+        Yields:
+            TransferTimer to report bytes, retries and requests to
+        """
+        timer = TransferTimer(direction, name)
+        try:
+            yield timer
+        except BaseException:
+            timer.ok = False
+            raise
+        finally:
+            self._record(timer, time.monotonic() - timer.started)
+    
+    def _record(self, timer, seconds):
+        with self._lock:
+            total = self._transfers.setdefault(timer.direction, {
+                'files': 0, 'failed': 0, 'skipped': 0, 'bytes': 0, 'seconds': 0.0,
+                'retries': 0, 'requests': 0, 'first_byte_seconds': 0.0,
+                'first': timer.started, 'last': timer.started,
+            })
+            total['files'] += 1
+            total['failed'] += not timer.ok
+            total['skipped'] += timer.skipped
+            total['bytes'] += timer.bytes
+            total['seconds'] += seconds
+            total['retries'] += timer.retries
+            total['requests'] += timer.requests
+            total['first_byte_seconds'] += timer.first_byte or 0.0
+            total['first'] = min(total['first'], timer.started)
+            total['last'] = max(total['last'], timer.started + seconds)
+        self.event('transfer', direction=timer.direction, name=timer.name, ok=timer.ok,
+                   skipped=timer.skipped, bytes=timer.bytes, seconds=round(seconds, 3),
+                   first_byte_seconds=round(timer.first_byte, 3) if timer.first_byte is not None else None,
+                   mib_per_sec=round(timer.bytes / seconds / (1024 * 1024), 3) if seconds else None,
+                   retries=timer.retries, requests=timer.requests)
+    
+    def summary(self):
+        """
+        Totals so far.
+        
+        Returns:
+            Dictionary with the run's start and duration, each phase's count
+            and time, per-direction transfer totals and the counters.
+            ``mib_per_sec`` is the bytes of a direction over the wall-clock
+            time its transfers were running, so it counts parallel
+            transfers together.
+        """
+        with self._lock:
+            transfers = {}
+            for direction, total in self._transfers.items():
+                span = total['last'] - total['first']
+                transferred = total['files'] - total['skipped']
+                transfers[direction] = {
+                    'files': total['files'],
+                    'failed': total['failed'],
+                    'skipped': total['skipped'],
+                    'bytes': total['bytes'],
+                    'seconds': round(total['seconds'], 3),
+                    'mib_per_sec': round(total['bytes'] / span / (1024 * 1024), 3) if span else None,
+                    'avg_first_byte_seconds':
+                        round(total['first_byte_seconds'] / transferred, 3) if transferred else None,
+                    'retries': total['retries'],
+                    'requests': total['requests'],
+                }
+            return {
+                'started': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+                'duration_seconds': round(time.monotonic() - self._start, 3),
+                'phases': {name: dict(total, seconds=round(total['seconds'], 3))
+                           for name, total in self._phases.items()},
+                'transfers': transfers,
+                'counters': dict(self._counters),
+            }
+    
+    def prometheus(self, summary=None):
+        """The summary in the Prometheus text exposition format."""
+        summary = summary or self.summary()
+        lines = []
+        
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP zoom_transfer_{name} {help_text}")
+            lines.append(f"# TYPE zoom_transfer_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{label}="{text}"' for label, text in labels.items())
+                lines.append(f"zoom_transfer_{name}{{{label_text}}} {value}" if label_text
+                             else f"zoom_transfer_{name} {value}")
+        
+        metric('run_start_timestamp_seconds', 'gauge', 'When the run started.',
+               [({}, round(self.started, 3))])
+        metric('run_duration_seconds', 'gauge', 'How long the run took.',
+               [({}, summary['duration_seconds'])])
+        phases = summary['phases'].items()
+        metric('phase_seconds', 'gauge', 'Time spent in each phase.',
+               [({'phase': name}, total['seconds']) for name, total in phases])
+        metric('phase_count', 'gauge', 'Times each phase ran.',
+               [({'phase': name}, total['count']) for name, total in phases])
+        metric('phase_failures', 'gauge', 'Times each phase failed.',
+               [({'phase': name}, total['failed']) for name, total in phases])
+        transfers = summary['transfers'].items()
+        for key, help_text in (('files', 'Files transferred.'), ('failed', 'Files that failed.'),
+                               ('bytes', 'Bytes transferred.'), ('retries', 'Retried requests.'),
+                               ('requests', 'HTTP requests made for transfers.')):
+            metric(key, 'gauge', help_text,
+                   [({'direction': direction}, total[key]) for direction, total in transfers])
+        metric('throughput_mib_per_second', 'gauge', 'Combined throughput of all transfers.',
+               [({'direction': direction}, total['mib_per_sec'])
+                for direction, total in transfers if total['mib_per_sec'] is not None])
+        metric('count', 'gauge', 'Other counted events, such as API calls.',
+               [({'name': name}, value) for name, value in summary['counters'].items()])
+        return '\n'.join(lines) + '\n'
+    
+    def write_reports(self, summary=None):
+        """
+        Write the report and Prometheus files with the totals so far.
+        
+        Worker threads call this after every job, so the writes take turns,
+        each with the latest totals. A file that can't be written is only
+        warned about: the metrics must never decide how a transfer ends.
+        """
+        with self._write_lock:
+            summary = summary or self.summary()
+            if self.report_file:
+                _write_atomic(self.report_file, json.dumps(summary, indent=2))
+            if self.prometheus_file:
+                # Written atomically so a collector never reads half a file
+                _write_atomic(self.prometheus_file, self.prometheus(summary))
+    
+    def finish(self):
+        """Log the end of the run and write the report and Prometheus files, once."""
+        if self._finished:
+            return
+        self._finished = True
+        summary = self.summary()
+        self.event('run_end', **summary)
+        self.write_reports(summary)
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+def _write_atomic(path, text):
+    """Replace path with text in one step, warning instead of raising if that fails."""
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(os.path.abspath(path)),
+                                         prefix=f".{os.path.basename(path)}.", suffix='.tmp',
+                                         delete=False) as f:
+            tmp_path = f.name
+            f.write(text)
+        # Temporary files are private; collectors run as other users
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not write metrics file {path}: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def add_metrics_arguments(parser):
+    """Add the --metrics-log, --metrics-report and --prometheus options to an ArgumentParser."""
+    parser.add_argument('--metrics-log', metavar='FILE',
+                       help='Append a JSON line per phase and per file transfer with its timing, bytes, '
+                            'retries and requests')
+    parser.add_argument('--metrics-report', metavar='FILE',
+                       help='Write a JSON summary of phase times, throughput, retries and API calls '
+                            'at the end of the run')
+    parser.add_argument('--prometheus', metavar='FILE',
+                       help='Write the summary as a Prometheus textfile (e.g. for node_exporter)')
+
+
+def metrics_from_args(args):
+    """
+    TransferMetrics for the options added by add_metrics_arguments(), or
+    NO_METRICS if none were given. The report files are written at exit.
+    """
+    if not (args.metrics_log or args.metrics_report or args.prometheus):
+        return NO_METRICS
+    metrics = TransferMetrics(args.metrics_log, args.metrics_report, args.prometheus)
+    atexit.register(metrics.finish)
+    return metrics
+
+
+# Keeps totals in memory only; used when no metrics output was asked for
+NO_METRICS = TransferMetrics()
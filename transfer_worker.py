@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Zoom to Google Drive Transfer Worker
+Long-running worker that takes Zoom recording links from a durable SQLite
+job queue and transfers each one to Google Drive, keeping one browser and
+one authenticated Drive connection warm across jobs.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+
+from transfer_control import RetryPolicy, ConcurrencyGate, TransferLimiter, HostLimiter
+from transfer_integrity import ChecksumManifest
+from transfer_metrics import NO_METRICS, add_metrics_arguments, metrics_from_args
+from download_zoom_recordings import (
+    SCRAPE_CACHE_TTL, sync_playwright, create_download_session, connect_drive, open_recording_page,
+    scrape_recording, read_url_file, ScrapeCache, add_timeout_arguments, timeouts_from_args,
+    new_scrape_context, save_browser_state, add_browser_arguments
+)
+from zoom_to_drive import transfer
+
+
+# Job states, in the order a job moves through them
+QUEUED = 'queued'
+SCRAPING = 'scraping'
+DOWNLOADING = 'downloading'
+UPLOADING = 'uploading'
+DONE = 'done'
+FAILED = 'failed'
+
+# States a job is only in while a worker is running it
+ACTIVE_STATES = (SCRAPING, DOWNLOADING, UPLOADING)
+
+
+class JobQueue:
+    """
+    Recording transfer jobs stored in a SQLite database.
+    
+    Jobs survive restarts: anything a stopped or crashed worker left in an
+    active state is put back in the queue by recover(), and the .part files
+    and upload journal let it continue where it was. The database is in WAL
+    mode, so jobs can be added from another process while a worker runs.
+    Run one worker per database.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            password TEXT,
+            drive_folder TEXT,
+            state TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            title TEXT,
+            folder TEXT,
+            result TEXT,
+            error TEXT,
+            created REAL NOT NULL,
+            updated REAL NOT NULL
+        )
+    """
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        # Autocommit; claim() opens its own transaction
+        self._db = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(self.SCHEMA)
+    
+    def add(self, url, password=None, drive_folder=None):
+        """Queue a recording; returns the job ID."""
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                'INSERT INTO jobs (url, password, drive_folder, created, updated) VALUES (?, ?, ?, ?, ?)',
+                (url, password, drive_folder, now, now))
+            return cursor.lastrowid
+    
+    def claim(self):
+        """
+        Take the oldest queued job and mark it as scraping.
+        
+        Returns:
+            The job as a dictionary, or None if nothing is queued
+        """
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._db.execute(
+                    'SELECT * FROM jobs WHERE state = ? ORDER BY id LIMIT 1', (QUEUED,)).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        'UPDATE jobs SET state = ?, attempts = attempts + 1, error = NULL, updated = ? '
+                        'WHERE id = ?', (SCRAPING, time.time(), row['id']))
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        if row is None:
+            return None
+        return dict(row, state=SCRAPING, attempts=row['attempts'] + 1)
+    
+    def update(self, job_id, state=None, **fields):
+        """Set a job's state and any of title, folder, result and error."""
+        if state is not None:
+            fields['state'] = state
+        if fields.get('result') is not None:
+            fields['result'] = json.dumps(fields['result'])
+        fields['updated'] = time.time()
+        columns = ', '.join(f'{name} = ?' for name in fields)
+        with self._lock:
+            self._db.execute(f'UPDATE jobs SET {columns} WHERE id = ?', (*fields.values(), job_id))
+    
+    def recover(self):
+        """Requeue jobs a stopped worker left active; returns how many."""
+        placeholders = ', '.join('?' * len(ACTIVE_STATES))
+        with self._lock:
+            cursor = self._db.execute(
+                f'UPDATE jobs SET state = ?, updated = ? WHERE state IN ({placeholders})',
+                (QUEUED, time.time(), *ACTIVE_STATES))
+            return cursor.rowcount
+    
+    def requeue_failed(self, job_ids=None):
+        """Put failed jobs (all of them, or just job_ids) back in the queue; returns how many."""
+        query = 'UPDATE jobs SET state = ?, updated = ? WHERE state = ?'
+        params = [QUEUED, time.time(), FAILED]
+        if job_ids:
+            query += f" AND id IN ({', '.join('?' * len(job_ids))})"
+            params.extend(job_ids)
+        with self._lock:
+            return self._db.execute(query, params).rowcount
+    
+    def jobs(self, state=None):
+        """All jobs, or those in one state, oldest first."""
+        query = 'SELECT * FROM jobs'
+        params = ()
+        if state:
+            query += ' WHERE state = ?'
+            params = (state,)
+        with self._lock:
+            rows = self._db.execute(query + ' ORDER BY id', params).fetchall()
+        return [dict(row) for row in rows]
+    
+    def folder_taken(self, folder, job_id):
+        """Whether another job already downloads into folder."""
+        with self._lock:
+            return self._db.execute(
+                'SELECT 1 FROM jobs WHERE folder = ? AND id != ?', (folder, job_id)).fetchone() is not None
+    
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class TransferWorker:
+    """
+    Runs queued jobs until stopped, up to ``jobs`` recordings at a time.
+    
+    Playwright's sync API only works from the thread that started it, so
+    pages are scraped one after another on the calling thread, in a fresh
+    context of a browser that stays open between jobs. Each recording's
+    downloads and uploads then run on a thread pool with zoom_to_drive's
+    transfer() while the next job is scraped.
+    """
+    
+    def __init__(self, queue, uploader, default_folder, jobs=2, file_jobs=4, upload_jobs=2, segments=4,
+                 discovery='auto', headless=True, retry=None, limiter=None, checksums=None, cache=None,
+                 metrics=None, timeouts=None, lean=True, storage_state=None):
+        """
+        Args:
+            queue: JobQueue to take jobs from
+            uploader: Authenticated GoogleDriveUploader shared by every job
+            default_folder: Drive folder for jobs added without one
+            jobs: Recordings transferred at the same time
+            file_jobs: Files downloaded in parallel per recording
+            upload_jobs: Files uploaded in parallel per recording
+            segments: Parallel byte ranges per large file
+            discovery: Link discovery method for find_download_links()
+            headless: Run the browser without a window
+            retry: RetryPolicy for the downloads of every job
+            limiter: TransferLimiter for the downloads of every job
+            checksums: ChecksumManifest for the downloads; pass the
+                uploader's to get one entry per file
+            cache: ScrapeCache that lets a retried job skip the browser
+            metrics: TransferMetrics for scrapes and downloads; its report
+                files are rewritten after every job
+            timeouts: PageTimeouts for every scrape
+            lean: Scrape in lean browser contexts (see new_scrape_context())
+            storage_state: Browser state file every scrape starts from and
+                successful ones save back to
+        """
+        self.queue = queue
+        self.uploader = uploader
+        self.default_folder = default_folder
+        self.jobs = jobs
+        self.file_jobs = file_jobs
+        self.upload_jobs = upload_jobs
+        self.segments = segments
+        self.discovery = discovery
+        self.headless = headless
+        self.retry = retry
+        self.limiter = limiter
+        self.checksums = checksums
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else NO_METRICS
+        self.timeouts = timeouts
+        self.lean = lean
+        self.storage_state = storage_state
+        self.stopping = False
+        self._folder_ids = {}
+    
+    def run(self, poll_interval=5.0, exit_when_idle=False):
+        """
+        Work through the queue, checking for new jobs every poll_interval
+        seconds while idle.
+        
+        The first Ctrl-C stops taking new jobs and lets the running ones
+        finish; a second one is passed on to the caller.
+        
+        Args:
+            poll_interval: Seconds between checks of an empty queue
+            exit_when_idle: Return once the queue is empty and nothing runs
+        """
+        recovered = self.queue.recover()
+        if recovered:
+            print(f"↻ Requeued {recovered} interrupted job(s)")
+        
+        executor = ThreadPoolExecutor(max_workers=self.jobs)
+        running = {}  # future -> job
+        with sync_playwright() as p:
+            browser = None
+            
+            def get_browser():
+                nonlocal browser
+                if browser is None or not browser.is_connected():
+                    print("🚀 Starting browser...")
+                    browser = p.chromium.launch(headless=self.headless)
+                return browser
+            
+            while True:
+                try:
+                    for future in [future for future in running if future.done()]:
+                        self._check(running.pop(future), future)
+                    job = None
+                    if not self.stopping and len(running) < self.jobs:
+                        job = self.queue.claim()
+                    
+                    if job is not None:
+                        prepared = self._prepare(get_browser, job)
+                        if prepared is not None:
+                            running[executor.submit(self._transfer, job, *prepared)] = job
+                        continue
+                    
+                    if not running and (exit_when_idle or self.stopping):
+                        break
+                    if running:
+                        wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                    else:
+                        time.sleep(poll_interval)
+                except KeyboardInterrupt:
+                    if self.stopping:
+                        raise
+                    self.stopping = True
+                    print(f"\n⚠️  Finishing {len(running)} running job(s); press Ctrl-C again to stop now.")
+            
+            if browser is not None:
+                browser.close()
+        executor.shutdown()
+    
+    def _prepare(self, get_browser, job):
+        """
+        Scrape a job's recording page, unless the cache still has working
+        links for it, and set up its download.
+        
+        Returns:
+            (links, download_folder, session, folder_id), or None if the
+            job has failed
+        """
+        print(f"\n📍 Job {job['id']}: {job['url']}")
+        result = self.cache.lookup(job['url']) if self.cache is not None else None
+        if result is not None:
+            print("♻️  Using cached recording details, skipping the browser")
+        else:
+            try:
+                result = self._scrape(get_browser(), job)
+            except KeyboardInterrupt:
+                self.queue.update(job['id'], QUEUED)
+                raise
+            except Exception as e:
+                self._fail(job, str(e))
+                return None
+        
+        if result['status'] != 'ok':
+            self._fail(job, 'Authentication failed' if result['status'] == 'auth_failed'
+                       else 'No download links found', title=result['title'])
+            return None
+        
+        try:
+            return self._setup(job, result)
+        except Exception as e:
+            # Drive lookups, the download folder or the session; the worker keeps going
+            self._fail(job, str(e))
+            return None
+    
+    def _setup(self, job, result):
+        """
+        Find the job's Drive folder and create its download folder and session.
+        
+        Returns:
+            Same as _prepare()
+        """
+        folder_id = self._folder_id(job['drive_folder'] or self.default_folder)
+        if not folder_id:
+            self._fail(job, f"Could not create Drive folder {job['drive_folder'] or self.default_folder}")
+            return None
+        
+        # A requeued job goes back to the folder holding its partial files
+        if job['folder']:
+            download_folder = Path(job['folder'])
+        else:
+            download_folder = Path("downloads") / result['folder_name']
+            if self.queue.folder_taken(str(download_folder), job['id']):
+                download_folder = Path("downloads") / f"{result['folder_name']}_{job['id']}"
+        download_folder.mkdir(parents=True, exist_ok=True)
+        
+        session = create_download_session(
+            cookies=result['cookies'],
+            referer=result['page_url'],
+            pool_size=self.file_jobs * self.segments
+        )
+        self.queue.update(job['id'], DOWNLOADING, title=result['title'], folder=str(download_folder))
+        print(f"✓ Found {len(result['links'])} file(s) → {download_folder}")
+        return result['links'], download_folder, session, folder_id
+    
+    def _scrape(self, browser, job):
+        """scrape_recording() for a job in a fresh browser context."""
+        context = new_scrape_context(browser, lean=self.lean, storage_state=self.storage_state)
+        try:
+            page, collector = open_recording_page(context, job['url'], self.timeouts)
+            result = scrape_recording(page, collector, password=job['password'], prompt=False,
+                                      discovery=self.discovery, metrics=self.metrics, timeouts=self.timeouts)
+            if self.storage_state and result['status'] == 'ok':
+                save_browser_state(context, self.storage_state)
+        finally:
+            context.close()
+        if self.cache is not None and result['status'] == 'ok':
+            self.cache.put(job['url'], result)
+        return result
+    
+    def _folder_id(self, name):
+        """Drive folder ID for name, found or created once per worker."""
+        if name not in self._folder_ids:
+            folder_id = self.uploader.find_folder_by_name(name) or self.uploader.create_folder(name)
+            if not folder_id:
+                return None
+            self._folder_ids[name] = folder_id
+        return self._folder_ids[name]
+    
+    def _transfer(self, job, links, download_folder, session, folder_id):
+        """Download and upload one job's files and record the outcome."""
+        try:
+            stats = transfer(links, download_folder, self.uploader, folder_id,
+                             jobs=self.file_jobs, upload_jobs=self.upload_jobs, segments=self.segments,
+                             session=session, retry=self.retry, limiter=self.limiter,
+                             checksums=self.checksums,
+                             on_downloads_done=lambda: self.queue.update(job['id'], UPLOADING),
+                             metrics=self.metrics)
+        except Exception as e:
+            self._fail(job, str(e))
+            return
+        finally:
+            session.close()
+            self.metrics.write_reports()
+        
+        if stats['failed']:
+            if self.cache is not None:
+                self.cache.remove(job['url'])  # The links may have expired; scrape again on retry
+            self.queue.update(job['id'], FAILED, result=stats, error=f"{stats['failed']} file(s) failed")
+            print(f"❌ Job {job['id']}: {stats['failed']} file(s) failed")
+        else:
+            self.queue.update(job['id'], DONE, result=stats)
+            print(f"✅ Job {job['id']}: {stats['uploaded']} file(s) uploaded")
+    
+    def _check(self, job, future):
+        """Fail the job of a finished _transfer() future that raised."""
+        try:
+            future.result()
+        except Exception as e:
+            self._fail(job, f"Transfer crashed: {e}")
+    
+    def _fail(self, job, error, **fields):
+        self.queue.update(job['id'], FAILED, error=error, **fields)
+        print(f"❌ Job {job['id']}: {error}")
+
+
+def add_jobs(queue, args):
+    """The add command: queue one URL or every URL in a URL file."""
+    if bool(args.url) == bool(args.url_file):
+        print("Error: give either a recording URL or --url-file")
+        sys.exit(1)
+    
+    if args.url_file:
+        try:
+            entries = read_url_file(args.url_file)
+        except OSError as e:
+            print(f"Error: Could not read URL file: {e}")
+            sys.exit(1)
+    else:
+        entries = [(args.url, args.password)]
+    
+    for url, password in entries:
+        if not url.startswith('http'):
+            print(f"⚠️  Skipping invalid URL: {url}")
+            continue
+        job_id = queue.add(url.strip(), password, args.drive_folder)
+        print(f"➕ Job {job_id}: {url}")
+
+
+def list_jobs(queue, args):
+    """The list command: print the jobs in the queue."""
+    jobs = queue.jobs(args.state)
+    if not jobs:
+        print("No jobs.")
+        return
+    for job in jobs:
+        line = f"{job['id']:>5}  {job['state']:<11} {job['title'] or job['url']}"
+        if job['result']:
+            result = json.loads(job['result'])
+            line += f"  ({result['uploaded']} uploaded, {result['failed']} failed)"
+        if job['error'] and job['state'] == FAILED:
+            line += f"  - {job['error']}"
+        print(line)
+
+
+def run_worker(queue, args):
+    """The run command: start the worker with warm browser and Drive connections."""
+    # Each direction has its own bandwidth; the per-host caps are shared
+    hosts = HostLimiter(args.max_connections_per_host) if args.max_connections_per_host else None
+    download_limiter = TransferLimiter(
+        rate=args.max_download_rate * 1024 * 1024 if args.max_download_rate else None, hosts=hosts)
+    upload_limiter = TransferLimiter(
+        rate=args.max_upload_rate * 1024 * 1024 if args.max_upload_rate else None, hosts=hosts)
+    checksums = ChecksumManifest(args.checksums, sha256=args.sha256) if args.checksums else None
+    metrics = metrics_from_args(args)
+    
+    print(f"=== Zoom to Google Drive Worker ===\n")
+    print(f"🗄️  Queue: {os.path.abspath(queue.db_path)}")
+    print(f"☁️  Default Drive folder: {args.drive_folder}\n")
+    
+    # Authenticate once for every job
+    uploader, _ = connect_drive(
+        args, args.drive_folder, journal_file=args.journal,
+        retry=RetryPolicy(attempts=args.retries, gate=ConcurrencyGate(args.jobs * args.upload_jobs)),
+        limiter=upload_limiter,
+        checksums=checksums,
+        metrics=metrics
+    )
+    
+    worker = TransferWorker(
+        queue, uploader, args.drive_folder,
+        jobs=args.jobs,
+        file_jobs=args.file_jobs,
+        upload_jobs=args.upload_jobs,
+        segments=args.segments,
+        discovery=args.discovery,
+        headless=not args.visible,
+        # Quota errors shrink the number of files downloading at once, across all jobs
+        retry=RetryPolicy(attempts=args.retries, gate=ConcurrencyGate(args.jobs * args.file_jobs)),
+        limiter=download_limiter,
+        checksums=checksums,
+        cache=None if args.no_cache else ScrapeCache(args.cache_file, ttl=args.cache_ttl * 60),
+        metrics=metrics,
+        timeouts=timeouts_from_args(args),
+        lean=not args.full_browser,
+        storage_state=args.browser_state
+    )
+    try:
+        worker.run(poll_interval=args.poll_interval, exit_when_idle=args.exit_when_idle)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Stopped. Unfinished jobs resume when the worker starts again.")
+        # Don't wait for the transfer threads; their jobs are requeued on the next start
+        metrics.finish()
+        os._exit(130)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Queue Zoom recordings and transfer them to Google Drive with a long-running worker',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s add https://zoom.us/rec/share/xxxxx
+  %(prog)s add https://zoom.us/rec/share/xxxxx s3cret --drive-folder "Team Meetings"
+  %(prog)s add --url-file urls.txt
+  %(prog)s run --jobs 2
+  %(prog)s list --state failed
+  %(prog)s retry 12 15
+        """
+    )
+    parser.add_argument('--db', default='transfer_queue.db',
+                       help='SQLite job queue (default: transfer_queue.db)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    add = commands.add_parser('add', help='Queue recordings')
+    add.add_argument('url', nargs='?', help='Zoom recording URL')
+    add.add_argument('password', nargs='?', help='Recording password')
+    add.add_argument('--url-file', '-f',
+                    help='Read recording URLs (each optionally followed by its password) from this file '
+                         '("-" for stdin)')
+    add.add_argument('--drive-folder', '-d',
+                    help='Google Drive folder for these recordings (default: the worker\'s)')
+    
+    lister = commands.add_parser('list', help='Show queued, running and finished jobs')
+    lister.add_argument('--state', choices=[QUEUED, *ACTIVE_STATES, DONE, FAILED],
+                       help='Only show jobs in this state')
+    
+    retry = commands.add_parser('retry', help='Queue failed jobs again')
+    retry.add_argument('ids', nargs='*', type=int, help='Job IDs (default: every failed job)')
+    
+    run = commands.add_parser('run', help='Start the worker')
+    run.add_argument('--drive-folder', '-d', default='Zoom Recordings',
+                    help='Google Drive folder for jobs added without one (default: "Zoom Recordings")')
+    run.add_argument('--jobs', '-j', type=int, default=2,
+                    help='Number of recordings to transfer at the same time (default: 2)')
+    run.add_argument('--file-jobs', type=int, default=4,
+                    help='Number of files per recording to download in parallel (default: 4)')
+    run.add_argument('--upload-jobs', type=int, default=2,
+                    help='Number of files per recording to upload in parallel (default: 2)')
+    run.add_argument('--segments', '-s', type=int, default=4,
+                    help='Parallel byte ranges per large file when the server supports it (default: 4)')
+    run.add_argument('--discovery', choices=['auto', 'network', 'dom', 'selectors'], default='auto',
+                    help='How to find download links (default: auto)')
+    run.add_argument('--visible', action='store_true', help='Show browser window')
+    run.add_argument('--poll-interval', type=float, default=5.0,
+                    help='Seconds between checks for new jobs while idle (default: 5)')
+    run.add_argument('--exit-when-idle', action='store_true',
+                    help='Stop once the queue is empty instead of waiting for new jobs')
+    run.add_argument('--auth', '-a', choices=['oauth', 'service_account'], default='oauth',
+                    help='Google authentication method (default: oauth)')
+    run.add_argument('--credentials', '-c',
+                    help='Google credentials file (default: client_secrets.json or service_account.json)')
+    run.add_argument('--token', '-t', default='token.json',
+                    help='OAuth token file (default: token.json)')
+    run.add_argument('--retries', type=int, default=5,
+                    help='Times to retry a dropped connection or a 429/5xx response, with backoff, '
+                         'before a file fails (default: 5)')
+    run.add_argument('--max-download-rate', type=float, metavar='MIB_PER_SEC',
+                    help='Cap the combined download speed of all jobs, in MiB/s')
+    run.add_argument('--max-upload-rate', type=float, metavar='MIB_PER_SEC',
+                    help='Cap the combined upload speed of all jobs, in MiB/s')
+    run.add_argument('--max-connections-per-host', type=int, metavar='N',
+                    help='Cap the number of open requests to each server (default: no cap)')
+    run.add_argument('--journal', default='.upload_journal.json',
+                    help='File that records in-flight upload sessions so interrupted uploads resume '
+                         '(default: .upload_journal.json)')
+    run.add_argument('--cache-file', default='.zoom_scrape_cache.json',
+                    help='Where scraped recording details are cached so a retried job can skip the browser '
+                         'while the download links still work (default: .zoom_scrape_cache.json)')
+    run.add_argument('--cache-ttl', type=float, default=SCRAPE_CACHE_TTL / 60, metavar='MINUTES',
+                    help='How long cached recording details are reused (default: 30)')
+    run.add_argument('--no-cache', action='store_true',
+                    help='Always scrape the recording page')
+    run.add_argument('--checksums', metavar='FILE',
+                    help='Record the size, MD5 and Drive file ID of every file in this JSON file')
+    run.add_argument('--sha256', action='store_true',
+                    help='Also compute SHA-256 checksums for --checksums')
+    add_timeout_arguments(run)
+    add_browser_arguments(run)
+    add_metrics_arguments(run)
+    
+    args = parser.parse_args()
+    
+    if args.command == 'run':
+        if args.jobs < 1 or args.file_jobs < 1 or args.upload_jobs < 1 or args.segments < 1:
+            parser.error("--jobs, --file-jobs, --upload-jobs and --segments must be at least 1")
+        if args.poll_interval <= 0:
+            parser.error("--poll-interval must be positive")
+        if args.retries < 0:
+            parser.error("--retries can't be negative")
+        for rate in (args.max_download_rate, args.max_upload_rate):
+            if rate is not None and rate <= 0:
+                parser.error("--max-download-rate and --max-upload-rate must be positive")
+        if args.max_connections_per_host is not None and args.max_connections_per_host < 1:
+            parser.error("--max-connections-per-host must be at least 1")
+        if args.sha256 and not args.checksums:
+            parser.error("--sha256 needs --checksums")
+        if args.cache_ttl < 0:
+            parser.error("--cache-ttl can't be negative")
+    
+    queue = JobQueue(args.db)
+    try:
+        if args.command == 'add':
+            add_jobs(queue, args)
+        elif args.command == 'list':
+            list_jobs(queue, args)
+        elif args.command == 'retry':
+            print(f"↻ Requeued {queue.requeue_failed(args.ids)} job(s)")
+        else:
+            run_worker(queue, args)
+    finally:
+        queue.close()
+
+
+if __name__ == '__main__':
+    main()
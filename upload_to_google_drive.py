@@ -15,6 +15,10 @@ import os
 import sys
 import argparse
 import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Optional, List, Dict
 import mimetypes
@@ -25,14 +29,21 @@ try:
     from google_auth_oauthlib.flow import InstalledAppFlow
     from google.auth.transport.requests import Request
     from googleapiclient.discovery import build
-    from googleapiclient.http import MediaFileUpload
+    from googleapiclient.http import MediaFileUpload, MediaUpload, build_http
     from googleapiclient.errors import HttpError
+    from googleapiclient.http import DEFAULT_CHUNK_SIZE
+    from google_auth_httplib2 import AuthorizedHttp
+    import httplib2
 except ImportError:
     print("❌ Error: Required Google API packages not installed.")
     print("\nPlease install dependencies:")
     print("  pip install google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client")
     sys.exit(1)
 
+from transfer_control import RetryPolicy, ConcurrencyGate, TransferLimiter, UNLIMITED
+from transfer_integrity import TransferDigest, ChecksumManifest, IntegrityError, check
+from transfer_metrics import NO_METRICS, TransferMetrics, add_metrics_arguments, metrics_from_args
+
 try:
     from tqdm import tqdm
 except ImportError:
@@ -43,11 +54,428 @@ except ImportError:
 # If modifying these scopes, delete the token.json file.
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
+# In-progress downloads (and their resume state) left by download_zoom_recordings.py
+PARTIAL_DOWNLOAD_SUFFIXES = ('.part', '.part.json')
+
+# Drive requires resumable upload chunks to be multiples of 256 KiB
+CHUNK_GRANULARITY = 256 * 1024
+MiB = 1024 * 1024
+
+
+def round_chunk_size(num_bytes: float) -> int:
+    """Round a chunk size to the nearest allowed multiple of 256 KiB."""
+    return max(1, int(round(num_bytes / CHUNK_GRANULARITY))) * CHUNK_GRANULARITY
+
+
+class AdaptiveChunkSizer:
+    """
+    Picks the size of each resumable upload chunk from measured throughput.
+    
+    Starts large; after every chunk the size moves towards what the link can
+    send in ``target_seconds`` (at most doubling per step), and it is halved
+    after an error so less data has to be re-sent on a flaky connection.
+    """
+    
+    def __init__(self, initial: int = 32 * MiB, minimum: int = CHUNK_GRANULARITY,
+                 maximum: int = 256 * MiB, target_seconds: float = 8.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.chunksize = min(max(round_chunk_size(initial), minimum), maximum)
+    
+    def record_success(self, num_bytes: int, elapsed: float):
+        """Adjust after num_bytes were acknowledged in elapsed seconds."""
+        if num_bytes <= 0 or elapsed <= 0:
+            return
+        ideal = num_bytes / elapsed * self.target_seconds
+        ideal = min(ideal, self.chunksize * 2)
+        self.chunksize = min(max(round_chunk_size(ideal), self.minimum), self.maximum)
+    
+    def record_error(self):
+        self.chunksize = max(round_chunk_size(self.chunksize / 2), self.minimum)
+
+
+class _DigestingFile:
+    """
+    Read-only view of an open file that feeds a TransferDigest with every
+    block read from it, first hashing any bytes it skipped over (such as
+    the part a resumed session had already sent in an earlier run).
+    """
+    
+    def __init__(self, fd, digest: TransferDigest):
+        self._fd = fd
+        self._digest = digest
+    
+    def seek(self, offset, whence=0):
+        return self._fd.seek(offset, whence)
+    
+    def tell(self):
+        return self._fd.tell()
+    
+    def read(self, n=-1):
+        offset = self._fd.tell()
+        if self._digest.complete and offset > self._digest.position:
+            self._fd.seek(self._digest.position)
+            while self._digest.position < offset:
+                block = self._fd.read(min(MiB, offset - self._digest.position))
+                if not block:
+                    break
+                self._digest.update(block)
+            self._fd.seek(offset)
+        data = self._fd.read(n)
+        self._digest.update_at(offset, data)
+        return data
+
+
+class HashingMediaFileUpload(MediaFileUpload):
+    """MediaFileUpload that computes the file's checksums from the bytes it sends."""
+    
+    def __init__(self, filename, digest: TransferDigest, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.digest = digest
+        self._reader = _DigestingFile(self._fd, digest)
+    
+    def stream(self):
+        return self._reader
+    
+    def getbytes(self, begin, length):
+        self._reader.seek(begin)
+        return self._reader.read(length)
+
+
+class AdaptiveMediaFileUpload(HashingMediaFileUpload):
+    """HashingMediaFileUpload whose chunk size is read from an AdaptiveChunkSizer on every chunk."""
+    
+    def __init__(self, filename, digest: TransferDigest, sizer: AdaptiveChunkSizer, **kwargs):
+        super().__init__(filename, digest, chunksize=sizer.chunksize, **kwargs)
+        self.sizer = sizer
+    
+    def chunksize(self):
+        return self.sizer.chunksize
+
+
+# With --max-upload-rate, chunks are kept to about this many seconds of sending
+# so the limiter can pace them evenly
+RATE_LIMITED_CHUNK_SECONDS = 2
+
+# Default chunk size for streamed uploads; the buffer holds about two of them
+STREAM_CHUNK_SIZE = 16 * MiB
+
+
+class StreamAborted(IOError):
+    """The other side of a StreamBuffer failed, so the transfer can't continue."""
+
+
+class StreamBuffer:
+    """
+    Bounded in-memory window over a byte stream that is uploaded while it
+    is still being produced.
+    
+    A producer thread write()s data as it arrives and close()s the buffer
+    at the end; the upload reads chunks through read_at(). Bytes before the
+    chunk being sent have been acknowledged by Drive and are dropped, while
+    the current chunk is kept so it can be sent again after an error.
+    Writers block once ``capacity`` bytes are buffered, so memory stays at a
+    couple of chunks however large the file is.
+    """
+    
+    def __init__(self, chunk_size: int = STREAM_CHUNK_SIZE, chunks: int = 2):
+        self.chunk_size = round_chunk_size(chunk_size)
+        self.capacity = self.chunk_size * max(chunks, 2)
+        self._cond = threading.Condition()
+        self._data = bytearray()
+        self._base = 0  # Stream offset of self._data[0]
+        self._closed = False
+        self._error = None
+    
+    def write(self, data: bytes):
+        """Append data, waiting for room; raises if the upload was aborted."""
+        view = memoryview(data)
+        with self._cond:
+            while view:
+                while len(self._data) >= self.capacity and self._error is None:
+                    self._cond.wait()
+                if self._error is not None:
+                    raise StreamAborted(f"Upload aborted: {self._error}")
+                room = self.capacity - len(self._data)
+                self._data += view[:room]
+                view = view[room:]
+                self._cond.notify_all()
+    
+    def close(self):
+        """Mark the end of the stream."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+    
+    def abort(self, error):
+        """Fail both sides: blocked writes and reads raise from now on."""
+        with self._cond:
+            if self._error is None:
+                self._error = error
+            self._cond.notify_all()
+    
+    def read_at(self, begin: int, length: int) -> bytes:
+        """
+        Return length bytes starting at stream offset begin, waiting until
+        they have been written. Fewer bytes means the stream ended.
+        """
+        with self._cond:
+            if begin < self._base:
+                raise IOError(f"Stream offset {begin} was already discarded")
+            # Everything before begin is on Drive's side now
+            del self._data[:begin - self._base]
+            self._base = begin
+            self._cond.notify_all()
+            while len(self._data) < length and not self._closed and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise StreamAborted(f"Download aborted: {self._error}")
+            return bytes(self._data[:length])
+
+
+class StreamingMediaUpload(MediaUpload):
+    """Resumable media whose bytes come from a StreamBuffer instead of a file."""
+    
+    def __init__(self, buffer: StreamBuffer, mimetype: str, chunksize: int, size: Optional[int] = None,
+                 digest: Optional[TransferDigest] = None):
+        self._buffer = buffer
+        self.digest = digest if digest is not None else TransferDigest()
+        self._mimetype = mimetype
+        self._chunksize = chunksize
+        self._size = size
+    
+    def chunksize(self):
+        return self._chunksize
+    
+    def mimetype(self):
+        return self._mimetype
+    
+    def size(self):
+        # None sends "*" as the total until the last, short chunk
+        return self._size
+    
+    def resumable(self):
+        return True
+    
+    def has_stream(self):
+        return False
+    
+    def getbytes(self, begin, length):
+        data = self._buffer.read_at(begin, length)
+        self.digest.update_at(begin, data)
+        return data
+
+
+# Files below this size go up in one multipart request instead of a resumable session
+MULTIPART_THRESHOLD = 5 * MiB
+
+# Drive accepts at most 100 calls per batch request
+BATCH_LIMIT = 100
+
+
+def file_md5(file_path: str, block_size: int = MiB) -> str:
+    """MD5 hex digest of a local file, as reported by Drive's md5Checksum."""
+    digest = hashlib.md5()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SyncManifest:
+    """
+    Local cache of what was last uploaded for each file in sync mode.
+    
+    Entries record the file's size, mtime and MD5 together with the Drive
+    file it was uploaded to, so an unchanged file can be matched against
+    Drive's md5Checksum without hashing it again.
+    """
+    
+    def __init__(self, manifest_file: str):
+        self.manifest_file = manifest_file
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(manifest_file):
+            try:
+                with open(manifest_file) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Warning: Could not read sync manifest {manifest_file}: {e}")
+    
+    def local_md5(self, file_path: str) -> str:
+        """
+        MD5 of a local file, reused from the manifest while its size and
+        mtime are unchanged and only computed otherwise.
+        """
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime:
+            return entry['md5']
+        
+        md5 = file_md5(file_path)
+        with self._lock:
+            self._entries[key] = {'size': stat.st_size, 'mtime': stat.st_mtime, 'md5': md5,
+                                  'file_id': entry.get('file_id') if entry else None}
+        return md5
+    
+    def record(self, file_path: str, file_id: str, md5: str):
+        """Remember that file_path was uploaded to file_id with the given MD5."""
+        stat = os.stat(file_path)
+        with self._lock:
+            self._entries[os.path.abspath(file_path)] = {
+                'size': stat.st_size, 'mtime': stat.st_mtime, 'md5': md5, 'file_id': file_id}
+    
+    def save(self):
+        with self._lock:
+            tmp_file = f"{self.manifest_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_file, self.manifest_file)
+
+
+class FolderCache:
+    """
+    Drive folder IDs by parent folder ID and child name.
+    
+    Together the entries form the remote path -> folder ID tree, so a folder
+    is only looked up once. Parents whose subfolders were listed in full are
+    remembered for the current run, and the map itself can optionally be
+    kept on disk between runs (delete the file if folders were removed in
+    Drive).
+    """
+    
+    def __init__(self, cache_file: Optional[str] = None):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._ids = {}
+        self.listed = set()
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file) as f:
+                    self._ids = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Warning: Could not read folder cache {cache_file}: {e}")
+    
+    @staticmethod
+    def _key(parent_id: Optional[str], name: str) -> str:
+        return f"{parent_id or 'root'}/{name}"
+    
+    def get(self, parent_id: Optional[str], name: str) -> Optional[str]:
+        with self._lock:
+            return self._ids.get(self._key(parent_id, name))
+    
+    def set(self, parent_id: Optional[str], name: str, folder_id: str):
+        with self._lock:
+            self._ids[self._key(parent_id, name)] = folder_id
+    
+    def save(self):
+        if not self.cache_file:
+            return
+        with self._lock:
+            tmp_file = f"{self.cache_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(self._ids, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
+
+
+class UploadJournal:
+    """
+    On-disk record of in-flight resumable upload sessions.
+    
+    Each entry maps a local file and target folder to the Drive session URI
+    and the last byte offset Drive acknowledged, so an interrupted upload can
+    continue in a later run instead of starting over as a new Drive file.
+    """
+    
+    def __init__(self, journal_file: str):
+        self.journal_file = journal_file
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(journal_file):
+            try:
+                with open(journal_file) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Warning: Could not read upload journal {journal_file}: {e}")
+    
+    @staticmethod
+    def key(file_path: str, parent_id: Optional[str]) -> str:
+        return f"{os.path.abspath(file_path)}|{parent_id or 'root'}"
+    
+    def lookup(self, key: str, size: int, mtime: float) -> Optional[dict]:
+        """Return the saved session for key if the local file hasn't changed since."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry.get('size') == size and entry.get('mtime') == mtime:
+            return entry
+        return None
+    
+    def record(self, key: str, session_uri: str, offset: int, size: int, mtime: float):
+        with self._lock:
+            self._entries[key] = {
+                'session_uri': session_uri,
+                'offset': offset,
+                'size': size,
+                'mtime': mtime,
+                'updated': time.time(),
+            }
+            self._save_locked()
+    
+    def remove(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save_locked()
+    
+    def _save_locked(self):
+        tmp_file = f"{self.journal_file}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(self._entries, f, indent=2)
+        os.replace(tmp_file, self.journal_file)
+
+
+class UploadProgress:
+    """Aggregated progress for several files uploading at the same time."""
+    
+    def __init__(self, total_bytes: int, show_progress: bool = True):
+        self._lock = threading.Lock()
+        self._total = total_bytes
+        self._done = 0
+        self._pbar = None
+        if show_progress and tqdm:
+            self._pbar = tqdm(total=total_bytes, unit='B', unit_scale=True, desc='Uploading')
+    
+    def update(self, num_bytes: int):
+        """Record num_bytes more uploaded (negative after a chunk is re-sent)."""
+        with self._lock:
+            self._done += num_bytes
+            if self._pbar is not None:
+                self._pbar.update(num_bytes)
+    
+    def write(self, message: str):
+        """Print a message without breaking the progress bar."""
+        with self._lock:
+            if self._pbar is not None:
+                self._pbar.write(message)
+            else:
+                print(message)
+    
+    def close(self):
+        if self._pbar is not None:
+            self._pbar.close()
+
 
 class GoogleDriveUploader:
     """Handles uploading files to Google Drive with different authentication methods."""
     
-    def __init__(self, auth_method: str = 'oauth', credentials_file: str = None, token_file: str = 'token.json'):
+    def __init__(self, auth_method: str = 'oauth', credentials_file: str = None, token_file: str = 'token.json',
+                 chunk_size: Optional[int] = None, adaptive_chunks: bool = False,
+                 journal_file: Optional[str] = None, manifest_file: str = '.drive_manifest.json',
+                 folder_cache_file: Optional[str] = None, multipart_threshold: int = MULTIPART_THRESHOLD,
+                 retry: Optional[RetryPolicy] = None, limiter: Optional[TransferLimiter] = None,
+                 checksums: Optional[ChecksumManifest] = None, metrics: Optional[TransferMetrics] = None):
         """
         Initialize the uploader.
         
@@ -57,11 +485,45 @@ class GoogleDriveUploader:
                 - For OAuth: path to client_secrets.json (download from Google Cloud Console)
                 - For Service Account: path to service account JSON key
             token_file: Path to store OAuth token (only used for OAuth method)
+            chunk_size: Resumable upload chunk size in bytes, a multiple of
+                256 KiB (None for the client library default)
+            adaptive_chunks: Size each chunk from measured throughput instead,
+                starting at chunk_size if given
+            journal_file: Path of the UploadJournal used to resume interrupted
+                uploads across runs (None disables it)
+            manifest_file: Path of the SyncManifest used by sync uploads
+            folder_cache_file: Path to keep the FolderCache on disk between
+                runs (None keeps it in memory only)
+            multipart_threshold: Files smaller than this many bytes are sent
+                in a single multipart request
+            retry: RetryPolicy for 429/5xx responses and dropped connections
+                (five retries with backoff by default); uploads hold a slot
+                of its ConcurrencyGate, if any, while they run
+            limiter: TransferLimiter for the upload bandwidth and open
+                requests per host (None for no limits)
+            checksums: ChecksumManifest to record every upload's checksums
+                and Drive file ID in (None to only verify them)
+            metrics: TransferMetrics to record upload timings, retries and
+                the time of every Drive API call in
         """
         self.auth_method = auth_method
         self.credentials_file = credentials_file or self._get_default_credentials_file(auth_method)
         self.token_file = token_file
         self.service = None
+        self.credentials = None
+        self.chunk_size = chunk_size
+        self.adaptive_chunks = adaptive_chunks
+        self.journal = UploadJournal(journal_file) if journal_file else None
+        self.manifest_file = manifest_file
+        self._manifest = None
+        self.folder_cache = FolderCache(folder_cache_file)
+        self.multipart_threshold = multipart_threshold
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.limiter = limiter if limiter is not None else UNLIMITED
+        self.checksums = checksums
+        self.metrics = metrics if metrics is not None else NO_METRICS
+        self._local = threading.local()
+        self._build_http = build_http
         
     def _get_default_credentials_file(self, auth_method: str) -> str:
         """Get default credentials file name based on auth method."""
@@ -78,13 +540,14 @@ class GoogleDriveUploader:
             True if authentication successful, False otherwise
         """
         try:
-            if self.auth_method == 'oauth':
-                return self._authenticate_oauth()
-            elif self.auth_method == 'service_account':
-                return self._authenticate_service_account()
-            else:
-                print(f"❌ Error: Unknown authentication method '{self.auth_method}'")
-                return False
+            with self.metrics.phase('drive_auth'):
+                if self.auth_method == 'oauth':
+                    return self._authenticate_oauth()
+                elif self.auth_method == 'service_account':
+                    return self._authenticate_service_account()
+                else:
+                    print(f"❌ Error: Unknown authentication method '{self.auth_method}'")
+                    return False
         except Exception as e:
             print(f"❌ Authentication error: {e}")
             return False
@@ -132,7 +595,7 @@ class GoogleDriveUploader:
                 token.write(creds.to_json())
             print(f"✅ Credentials saved to {self.token_file}")
         
-        self.service = build('drive', 'v3', credentials=creds)
+        self.use_credentials(creds)
         print("✅ OAuth authentication successful")
         return True
     
@@ -154,13 +617,47 @@ class GoogleDriveUploader:
         try:
             creds = service_account.Credentials.from_service_account_file(
                 self.credentials_file, scopes=SCOPES)
-            self.service = build('drive', 'v3', credentials=creds)
+            self.use_credentials(creds)
             print("✅ Service Account authentication successful")
             return True
         except Exception as e:
             print(f"❌ Error loading service account credentials: {e}")
             return False
     
+    def use_credentials(self, credentials, http_factory=None):
+        """
+        Use already obtained credentials instead of authenticate().
+        
+        Args:
+            credentials: google.auth credentials to authorize requests with
+            http_factory: Called without arguments for every HTTP transport
+                a Drive service is built over, including the per-thread
+                ones; googleapiclient's build_http by default. The
+                benchmarks pass one that talks to a local stand-in for Drive.
+        """
+        self.credentials = credentials
+        self._build_http = http_factory or build_http
+        self.service = build('drive', 'v3', http=AuthorizedHttp(credentials, http=self._build_http()),
+                             cache_discovery=False)
+    
+    def _get_service(self):
+        """
+        Drive service for the calling thread.
+        
+        httplib2 connections are not thread-safe, so worker threads each get
+        their own service over their own AuthorizedHttp transport; the main
+        thread keeps using self.service.
+        """
+        if threading.current_thread() is threading.main_thread() or self.credentials is None:
+            return self.service
+        
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            http = AuthorizedHttp(self.credentials, http=self._build_http())
+            service = build('drive', 'v3', http=http, cache_discovery=False)
+            self._local.service = service
+        return service
+    
     def create_folder(self, folder_name: str, parent_id: Optional[str] = None) -> Optional[str]:
         """
         Create a folder in Google Drive.
@@ -181,10 +678,14 @@ class GoogleDriveUploader:
             if parent_id:
                 file_metadata['parents'] = [parent_id]
             
-            folder = self.service.files().create(
+            folder = self._execute(self._get_service().files().create(
                 body=file_metadata,
                 fields='id, name, webViewLink'
-            ).execute()
+            ))
+            
+            self.folder_cache.set(parent_id, folder_name, folder.get('id'))
+            # A new folder has no subfolders to look up
+            self.folder_cache.listed.add(folder.get('id'))
             
             print(f"📁 Created folder: {folder_name}")
             print(f"   ID: {folder.get('id')}")
@@ -206,85 +707,605 @@ class GoogleDriveUploader:
         Returns:
             Folder ID if found, None otherwise
         """
+        cached = self.folder_cache.get(parent_id, folder_name)
+        if cached:
+            return cached
+        
         try:
             query = f"name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
             
             if parent_id:
                 query += f" and '{parent_id}' in parents"
             
-            results = self.service.files().list(
+            results = self._execute(self._get_service().files().list(
                 q=query,
                 spaces='drive',
                 fields='files(id, name)',
                 pageSize=1
-            ).execute()
+            ))
             
             files = results.get('files', [])
             if files:
+                self.folder_cache.set(parent_id, folder_name, files[0]['id'])
                 return files[0]['id']
             return None
         except HttpError as error:
             print(f"❌ Error searching for folder: {error}")
             return None
     
-    def upload_file(self, file_path: str, parent_id: Optional[str] = None, show_progress: bool = True) -> Optional[str]:
+    def list_subfolders(self, parent_id: str) -> bool:
+        """
+        List every subfolder of parent_id with one paginated query and add
+        them to the folder cache.
+        
+        Returns:
+            True if the listing succeeded
+        """
+        page_token = None
+        try:
+            while True:
+                results = self._execute(self._get_service().files().list(
+                    q=f"'{parent_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false",
+                    spaces='drive',
+                    fields='nextPageToken, files(id, name)',
+                    pageSize=1000,
+                    pageToken=page_token
+                ))
+                for folder in results.get('files', []):
+                    if not self.folder_cache.get(parent_id, folder['name']):
+                        self.folder_cache.set(parent_id, folder['name'], folder['id'])
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    break
+        except HttpError as error:
+            print(f"❌ Error listing subfolders: {error}")
+            return False
+        
+        self.folder_cache.listed.add(parent_id)
+        return True
+    
+    def ensure_folder_tree(self, root_id: str, relative_dirs: List[tuple]) -> Dict[tuple, str]:
+        """
+        Find or create nested folders below root_id.
+        
+        Works one depth level at a time: the parents at that level that
+        aren't cached yet are listed once, then the missing siblings are
+        created, each group in a single batch request. The cost is one call
+        per new folder plus one per unlisted parent, independent of the
+        number of files, and about one round trip per level.
+        
+        Args:
+            root_id: Drive folder the tree hangs from
+            relative_dirs: Local directories as tuples of path parts
+            
+        Returns:
+            Mapping of path-part tuples to folder IDs; folders that couldn't
+            be created are missing
+        """
+        wanted = set()
+        for parts in relative_dirs:
+            for depth in range(1, len(parts) + 1):
+                wanted.add(tuple(parts[:depth]))
+        
+        folder_ids = {(): root_id}
+        for depth in range(1, max((len(p) for p in wanted), default=0) + 1):
+            level = sorted(p for p in wanted if len(p) == depth and p[:-1] in folder_ids)
+            
+            unlisted = {folder_ids[p[:-1]] for p in level
+                        if not self.folder_cache.get(folder_ids[p[:-1]], p[-1])} - self.folder_cache.listed
+            if unlisted:
+                self._list_subfolders_batch(sorted(unlisted))
+            
+            missing = [p for p in level if not self.folder_cache.get(folder_ids[p[:-1]], p[-1])]
+            if missing:
+                self._create_folders_batch([(p[-1], folder_ids[p[:-1]]) for p in missing])
+            
+            for parts in level:
+                folder_id = self.folder_cache.get(folder_ids[parts[:-1]], parts[-1])
+                if folder_id:
+                    folder_ids[parts] = folder_id
+        
+        return folder_ids
+    
+    def _execute_batch(self, calls: List) -> List:
+        """
+        Run independent metadata calls through Drive's batch endpoint.
+        
+        Calls are sent BATCH_LIMIT at a time. Calls that fail inside a batch
+        are retried one by one, with backoff for rate limit and server
+        errors.
+        
+        Args:
+            calls: Unexecuted HttpRequest objects
+            
+        Returns:
+            Response for each call in order, or the error it finally failed
+            with
+        """
+        results = [None] * len(calls)
+        failed = []
+        
+        for start in range(0, len(calls), BATCH_LIMIT):
+            indexes = range(start, min(start + BATCH_LIMIT, len(calls)))
+            
+            def callback(request_id, response, exception):
+                if exception is None:
+                    results[int(request_id)] = response
+                else:
+                    failed.append(int(request_id))
+            
+            batch = self._get_service().new_batch_http_request(callback=callback)
+            for index in indexes:
+                batch.add(calls[index], request_id=str(index))
+            self.metrics.count('drive_api_calls', len(indexes))
+            try:
+                with self.metrics.phase('api:batch', calls=len(indexes)):
+                    batch.execute()
+            except (HttpError, httplib2.HttpLib2Error, OSError):
+                failed.extend(i for i in indexes if results[i] is None and i not in failed)
+        
+        for index in sorted(failed):
+            try:
+                results[index] = self._execute(calls[index])
+            except (HttpError, httplib2.HttpLib2Error, OSError) as error:
+                results[index] = error
+        
+        return results
+    
+    def _list_children_batch(self, parent_ids: List[str], folders: bool) -> Dict[str, Optional[List[Dict]]]:
+        """
+        List the subfolders (folders=True) or files of several parents with
+        batch requests.
+        
+        Returns:
+            Children of each parent ID, or None for a parent that couldn't
+            be listed
+        """
+        service = self._get_service()
+        if folders:
+            mime_filter = "mimeType='application/vnd.google-apps.folder'"
+            fields = 'nextPageToken, files(id, name)'
+        else:
+            mime_filter = "mimeType!='application/vnd.google-apps.folder'"
+            fields = 'nextPageToken, files(id, name, size, md5Checksum)'
+        
+        calls = [
+            service.files().list(
+                q=f"'{parent_id}' in parents and {mime_filter} and trashed=false",
+                spaces='drive',
+                fields=fields,
+                pageSize=1000
+            )
+            for parent_id in parent_ids
+        ]
+        
+        children = {}
+        for parent_id, result in zip(parent_ids, self._execute_batch(calls)):
+            if isinstance(result, Exception) or result is None:
+                print(f"❌ Error listing folder: {result}")
+                children[parent_id] = None
+            elif result.get('nextPageToken'):
+                # More than one page; page through it the usual way
+                if folders:
+                    children[parent_id] = None if not self.list_subfolders(parent_id) else []
+                else:
+                    children[parent_id] = self.list_folder_files(parent_id)
+            else:
+                children[parent_id] = result.get('files', [])
+        return children
+    
+    def _list_subfolders_batch(self, parent_ids: List[str]):
+        """List the subfolders of several parents into the folder cache."""
+        for parent_id, subfolders in self._list_children_batch(parent_ids, folders=True).items():
+            if subfolders is None:
+                continue
+            for folder in subfolders:
+                if not self.folder_cache.get(parent_id, folder['name']):
+                    self.folder_cache.set(parent_id, folder['name'], folder['id'])
+            self.folder_cache.listed.add(parent_id)
+    
+    def _create_folders_batch(self, folders: List[tuple]):
+        """Create (name, parent_id) folders with batch requests, recording them in the folder cache."""
+        service = self._get_service()
+        calls = [
+            service.files().create(
+                body={'name': name, 'mimeType': 'application/vnd.google-apps.folder', 'parents': [parent_id]},
+                fields='id, name'
+            )
+            for name, parent_id in folders
+        ]
+        for (name, parent_id), result in zip(folders, self._execute_batch(calls)):
+            if isinstance(result, Exception) or result is None:
+                print(f"❌ Error creating folder {name}: {result}")
+                continue
+            self.folder_cache.set(parent_id, name, result['id'])
+            self.folder_cache.listed.add(result['id'])
+            print(f"📁 Created folder: {name}")
+    
+    def list_folder_files(self, folder_id: str) -> Optional[List[Dict]]:
+        """
+        List the files (not subfolders) directly inside a Drive folder.
+        
+        Args:
+            folder_id: ID of the folder to list
+            
+        Returns:
+            List of dicts with id, name, size and md5Checksum, or None on error
+        """
+        files = []
+        page_token = None
+        try:
+            while True:
+                results = self._execute(self._get_service().files().list(
+                    q=f"'{folder_id}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false",
+                    spaces='drive',
+                    fields='nextPageToken, files(id, name, size, md5Checksum)',
+                    pageSize=1000,
+                    pageToken=page_token
+                ))
+                files.extend(results.get('files', []))
+                page_token = results.get('nextPageToken')
+                if not page_token:
+                    return files
+        except HttpError as error:
+            print(f"❌ Error listing folder: {error}")
+            return None
+    
+    def upload_file(self, file_path: str, parent_id: Optional[str] = None, show_progress: bool = True,
+                    progress: Optional[UploadProgress] = None, file_id: Optional[str] = None) -> Optional[str]:
         """
         Upload a file to Google Drive.
         
+        Safe to call from several threads at once; each thread uses its own
+        HTTP transport.
+        
         Args:
             file_path: Path to the local file
             parent_id: ID of the parent folder (None for root)
             show_progress: Whether to show progress bar
+            progress: Shared UploadProgress to report to instead of a
+                per-file progress bar
+            file_id: Existing Drive file to replace the content of in place
+                (files().update) instead of creating a new file
+            
+        Transient errors are retried under self.retry, and the upload holds
+        one of its ConcurrencyGate slots while it runs.
             
         Returns:
             File ID if successful, None otherwise
         """
+        with self.retry.slot(), self.metrics.transfer('upload', os.path.basename(file_path)) as timer:
+            uploaded_id = self._upload_file(file_path, parent_id, show_progress, progress, file_id, timer)
+            timer.ok = uploaded_id is not None
+            return uploaded_id
+    
+    def _upload_file(self, file_path: str, parent_id: Optional[str], show_progress: bool,
+                     progress: Optional[UploadProgress], file_id: Optional[str], timer) -> Optional[str]:
+        """upload_file() once it holds a transfer slot."""
+        log = progress.write if progress is not None else print
         try:
-            file_name = os.path.basename(file_path)
-            mime_type, _ = mimetypes.guess_type(file_path)
-            if mime_type is None:
-                mime_type = 'application/octet-stream'
+            file_name, mime_type, file_metadata = self.upload_metadata(file_path, parent_id)
+            file_size = os.path.getsize(file_path)
+            # Small files (transcripts, chat logs) take one request instead of two
+            resumable = file_size >= self.multipart_threshold
             
-            file_metadata = {'name': file_name}
-            if parent_id:
-                file_metadata['parents'] = [parent_id]
+            # Checksums are taken from the bytes as they are sent
+            digest = self.checksums.digest() if self.checksums is not None else TransferDigest()
+            sizer, chunk_size = self.chunk_settings()
+            if not resumable:
+                sizer = None
+                media = HashingMediaFileUpload(file_path, digest, mimetype=mime_type, resumable=False)
+            elif sizer is not None:
+                media = AdaptiveMediaFileUpload(file_path, digest, sizer, mimetype=mime_type, resumable=True)
+            else:
+                media = HashingMediaFileUpload(file_path, digest, mimetype=mime_type, resumable=True,
+                                               chunksize=chunk_size)
             
-            media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
+            request = self._media_request(file_metadata, media, file_id)
             
-            request = self.service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id, name, webViewLink'
-            )
-            
-            file_size = os.path.getsize(file_path)
+            # Continue a session left behind by an interrupted run
+            journal_key = mtime = None
+            resumed = False
+            if resumable:
+                journal_key, mtime, entry = self.journaled_session(file_path, parent_id, file_size)
+                if entry:
+                    request.resumable_uri = entry['session_uri']
+                    request.resumable_progress = entry['offset']
+                    # Makes the next chunk start by asking Drive how much it has
+                    request._in_error_state = True
+                    resumed = True
+                    log(f"↻ Resuming {file_name} from {entry['offset'] / MiB:.1f} MiB")
             
             # Upload with progress
-            response = None
-            if show_progress and tqdm:
-                with tqdm(total=file_size, unit='B', unit_scale=True, desc=file_name) as pbar:
-                    while response is None:
-                        status, response = request.next_chunk()
-                        if status:
-                            pbar.update(status.resumable_progress - pbar.n)
-            else:
-                while response is None:
-                    status, response = request.next_chunk()
-                    if status:
-                        progress = int(status.progress() * 100)
-                        print(f"   Uploading {file_name}: {progress}%", end='\r')
-                print()  # New line after upload
+            report, close_report = self._reporter(file_name, file_size, show_progress, progress)
+            
+            def checkpoint(uploaded):
+                timer.add(uploaded - timer.bytes)
+                report(uploaded)
+                if journal_key and uploaded < file_size:
+                    self.journal.record(journal_key, request.resumable_uri, uploaded, file_size, mtime)
             
-            print(f"✅ Uploaded: {file_name}")
+            try:
+                try:
+                    if resumable:
+                        response = self._upload_chunks(request, checkpoint, sizer, timer)
+                    else:
+                        response = self._execute(request, timer)
+                        self.limiter.consume(file_size)
+                except HttpError as error:
+                    if not resumed or error.resp.status not in (404, 410):
+                        raise
+                    # The saved session expired; start a fresh upload
+                    log(f"↻ Upload session for {file_name} expired, starting over")
+                    self.journal.remove(journal_key)
+                    request = self._media_request(file_metadata, media, file_id)
+                    response = self._upload_chunks(request, checkpoint, sizer, timer)
+                timer.add(file_size - timer.bytes)
+                report(file_size)
+                if journal_key:
+                    self.journal.remove(journal_key)
+            except BaseException:
+                if progress is not None:
+                    # Take this file's partial bytes back out of the total
+                    report(0)
+                raise
+            finally:
+                close_report()
+            
+            self.verify_upload(ChecksumManifest.key(file_path), file_name, file_size, digest, response)
+            log(f"✅ {'Updated' if file_id else 'Uploaded'}: {file_name}")
+            if self._manifest is not None and response.get('md5Checksum'):
+                self._manifest.record(file_path, response['id'], response['md5Checksum'])
             return response.get('id')
             
         except HttpError as error:
-            print(f"❌ Error uploading {file_path}: {error}")
+            log(f"❌ Error uploading {file_path}: {error}")
+            return None
+        except IntegrityError as error:
+            log(f"❌ Upload of {file_path} is corrupt: {error}")
+            return None
+    
+    def upload_stream(self, buffer: 'StreamBuffer', file_name: str, parent_id: Optional[str] = None,
+                      mime_type: Optional[str] = None, size: Optional[int] = None,
+                      show_progress: bool = True, progress=None) -> Optional[str]:
+        """
+        Upload a file whose bytes are still being produced, e.g. a download
+        in flight, without it ever touching the local disk.
+        
+        Another thread writes the content into buffer (and closes it at the
+        end) while this call sends it to Drive in resumable chunks. Nothing
+        is journaled, since the bytes can't be read again after a restart.
+        
+        Args:
+            buffer: StreamBuffer the producer writes into
+            file_name: Name of the file in Drive
+            parent_id: ID of the parent folder (None for root)
+            mime_type: MIME type (guessed from file_name if not given)
+            size: Total size if known up front, e.g. from Content-Length
+            show_progress: Whether to show a progress bar
+            progress: Shared progress object (update/write) to report to
+                instead of a per-file progress bar
+            
+        Returns:
+            File ID if successful, None otherwise; the buffer is aborted on
+            failure so the producer stops too
+        """
+        log = progress.write if progress is not None else print
+        mime_type = mime_type or mimetypes.guess_type(file_name)[0] or 'application/octet-stream'
+        
+        file_metadata = {'name': file_name}
+        if parent_id:
+            file_metadata['parents'] = [parent_id]
+        
+        digest = self.checksums.digest() if self.checksums is not None else TransferDigest()
+        media = StreamingMediaUpload(buffer, mime_type, buffer.chunk_size, size, digest)
+        report, close_report = self._reporter(file_name, size, show_progress, progress)
+        try:
+            with self.retry.slot(), self.metrics.transfer('upload', file_name) as timer:
+                request = self._media_request(file_metadata, media)
+                response = self._upload_chunks(request, report, timer=timer)
+                timer.add(int(response.get('size', request.resumable_progress)))
+            report(int(response.get('size', request.resumable_progress)))
+            self.verify_upload(file_name, file_name, digest.position, digest, response)
+        except Exception as error:
+            buffer.abort(error)
+            if progress is not None:
+                report(0)
+            log(f"❌ Error uploading {file_name}: {error}")
             return None
+        finally:
+            close_report()
+        
+        log(f"✅ Uploaded: {file_name}")
+        return response.get('id')
+    
+    @staticmethod
+    def upload_metadata(file_path: str, parent_id: Optional[str] = None) -> tuple:
+        """
+        Returns:
+            (file_name, mime_type, file_metadata) for uploading file_path
+            into parent_id
+        """
+        file_name = os.path.basename(file_path)
+        mime_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        file_metadata = {'name': file_name}
+        if parent_id:
+            file_metadata['parents'] = [parent_id]
+        return file_name, mime_type, file_metadata
+    
+    def chunk_settings(self) -> tuple:
+        """
+        Chunking of a resumable upload under this uploader's settings.
+        
+        Returns:
+            (sizer, chunk_size): a fresh AdaptiveChunkSizer with adaptive
+            chunks (else None), and the fixed chunk size to use otherwise
+        """
+        # A rate limit is only smooth if a single chunk doesn't take ages
+        max_chunk = AdaptiveChunkSizer().maximum
+        if self.limiter.rate:
+            max_chunk = round_chunk_size(self.limiter.rate * RATE_LIMITED_CHUNK_SECONDS)
+        
+        sizer = None
+        if self.adaptive_chunks:
+            sizer = AdaptiveChunkSizer(initial=self.chunk_size or 32 * MiB, maximum=max_chunk)
+        return sizer, min(self.chunk_size or DEFAULT_CHUNK_SIZE, max_chunk)
+    
+    def journaled_session(self, file_path: str, parent_id: Optional[str], file_size: int) -> tuple:
+        """
+        Look up the upload session an interrupted run left behind for a file.
+        
+        Returns:
+            (journal_key, mtime, entry): the key and modification time to
+            journal the upload under, and the saved entry with session_uri
+            and offset if there is one; all None without a journal
+        """
+        if self.journal is None:
+            return None, None, None
+        mtime = os.path.getmtime(file_path)
+        journal_key = UploadJournal.key(file_path, parent_id)
+        return journal_key, mtime, self.journal.lookup(journal_key, file_size, mtime)
+    
+    @staticmethod
+    def _reporter(file_name: str, file_size: Optional[int], show_progress: bool, progress=None):
+        """
+        Build the progress callbacks for one upload.
+        
+        Returns:
+            (report, close): report(uploaded) takes the number of bytes
+            acknowledged so far, close() ends the per-file bar or line
+        """
+        if progress is not None:
+            reported = 0
+            
+            def report(uploaded):
+                nonlocal reported
+                progress.update(uploaded - reported)
+                reported = uploaded
+            
+            return report, lambda: None
+        
+        if show_progress and tqdm:
+            pbar = tqdm(total=file_size, unit='B', unit_scale=True, desc=file_name)
+            
+            def report(uploaded):
+                pbar.update(uploaded - pbar.n)
+            
+            return report, pbar.close
+        
+        def report(uploaded):
+            if file_size:
+                print(f"   Uploading {file_name}: {int(uploaded * 100 / file_size)}%", end='\r')
+        
+        return report, print  # New line after upload
+    
+    def verify_upload(self, key: str, file_name: str, size: int, digest: TransferDigest, response: Dict):
+        """
+        Check an upload against the size and md5Checksum Drive reports for
+        it and record the result in self.checksums.
+        
+        Raises:
+            IntegrityError: if Drive stored something other than what was sent
+        """
+        drive_size = int(response['size']) if response.get('size') else None
+        verified = check(file_name, size, drive_size, digest.md5, response.get('md5Checksum'))
+        if self.checksums is not None:
+            self.checksums.record(key, name=file_name, size=size, md5=digest.md5, sha256=digest.sha256,
+                                  drive_id=response.get('id'), drive_md5=response.get('md5Checksum'),
+                                  verified=verified)
+    
+    def _execute(self, request, timer=None):
+        """
+        Run request.execute() under the retry policy, timing each attempt
+        in self.metrics as phase api:<method>, e.g. api:drive.files.list.
+        ``timer`` is the TransferTimer of the upload the request belongs to.
+        """
+        attempt = 0
+        while True:
+            try:
+                with self.limiter.connection(request.uri), self.metrics.phase(f"api:{request.methodId}"):
+                    self.metrics.count('drive_api_calls')
+                    if timer is not None:
+                        timer.request()
+                    return request.execute()
+            except (HttpError, httplib2.HttpLib2Error, OSError) as error:
+                if not self.retry.should_retry(error, attempt):
+                    raise
+                self.metrics.count('drive_retries')
+                if timer is not None:
+                    timer.retried()
+                self.retry.wait(error, attempt)
+                attempt += 1
+    
+    def _media_request(self, file_metadata: Dict, media, file_id: Optional[str] = None):
+        """Build a files().create request, or files().update when file_id is given."""
+        fields = 'id, name, webViewLink, size, md5Checksum'
+        if file_id:
+            # Parents can't be set through the update body
+            metadata = {k: v for k, v in file_metadata.items() if k != 'parents'}
+            return self._get_service().files().update(
+                fileId=file_id, body=metadata, media_body=media, fields=fields)
+        return self._get_service().files().create(
+            body=file_metadata, media_body=media, fields=fields)
+    
+    def _upload_chunks(self, request, report, sizer: Optional[AdaptiveChunkSizer] = None, timer=None):
+        """
+        Drive a resumable upload request to completion.
+        
+        Args:
+            request: Resumable HttpRequest from files().create/update
+            report: Called with the number of bytes acknowledged so far
+            sizer: AdaptiveChunkSizer to feed with chunk timings; failed
+                chunks are then retried with a smaller size
+            timer: TransferTimer to count chunk requests and retries in
+            
+        Transient errors are retried under self.retry from the last byte
+        Drive acknowledged, and each chunk is paced by self.limiter.
+            
+        Returns:
+            The API response body of the finished upload
+        """
+        response = None
+        errors = 0
+        while response is None:
+            before = request.resumable_progress
+            started = time.monotonic()
+            try:
+                with self.limiter.connection(request.uri):
+                    self.metrics.count('drive_api_calls')
+                    if timer is not None:
+                        timer.request()
+                    status, response = request.next_chunk()
+            except (HttpError, httplib2.HttpLib2Error, OSError) as error:
+                if not self.retry.should_retry(error, errors):
+                    raise
+                self.metrics.count('drive_retries')
+                if timer is not None:
+                    timer.retried()
+                if sizer is not None:
+                    sizer.record_error()
+                # The request is now in its error state, so the next call
+                # asks Drive how much it kept and resends from there
+                self.retry.wait(error, errors)
+                errors += 1
+                continue
+            
+            errors = 0
+            if status:
+                sent = status.resumable_progress - before
+                if sizer is not None:
+                    sizer.record_success(sent, time.monotonic() - started)
+                report(status.resumable_progress)
+            else:
+                # The last chunk; the finished file reports its size
+                sent = int(response.get('size') or before) - before
+            self.limiter.consume(sent)
+        return response
     
     def upload_folder(self, local_folder: str, drive_folder_name: Optional[str] = None,
                      parent_id: Optional[str] = None, create_if_not_exists: bool = True,
-                     show_progress: bool = True) -> Dict[str, int]:
+                     show_progress: bool = True, jobs: int = 1, sync: bool = False,
+                     recursive: bool = False) -> Dict[str, int]:
         """
         Upload a local folder and all its contents to Google Drive.
         
@@ -294,6 +1315,12 @@ class GoogleDriveUploader:
             parent_id: ID of the parent folder in Drive (None for root)
             create_if_not_exists: Whether to create the folder if it doesn't exist
             show_progress: Whether to show progress bars during upload
+            jobs: Number of files to upload at the same time
+            sync: Only upload what changed: files already in the Drive folder
+                with the same size and MD5 are skipped, changed ones are
+                updated in place and only new ones are created
+            recursive: Also upload subdirectories, recreating them as Drive
+                folders
             
         Returns:
             Dictionary with upload statistics
@@ -321,23 +1348,134 @@ class GoogleDriveUploader:
         if not folder_id:
             return {'success': 0, 'failed': 0}
         
-        # Get all files in the folder (non-recursive for now)
-        files_to_upload = [f for f in local_path.iterdir() if f.is_file()]
+        # Get all files in the folder (and its subfolders when recursive)
+        candidates = sorted(local_path.rglob('*')) if recursive else local_path.iterdir()
+        files_to_upload = [f for f in candidates
+                           if f.is_file() and not f.name.endswith(PARTIAL_DOWNLOAD_SUFFIXES)]
         
         print(f"\n📊 Found {len(files_to_upload)} file(s) to upload")
         
-        stats = {'success': 0, 'failed': 0}
+        placed = [(file_path, folder_id) for file_path in files_to_upload]
+        unplaced = 0
+        if recursive:
+            relative_dirs = {f.parent.relative_to(local_path).parts for f in files_to_upload}
+            folder_ids = self.ensure_folder_tree(folder_id, list(relative_dirs))
+            placed = [(f, folder_ids.get(f.parent.relative_to(local_path).parts)) for f in files_to_upload]
+            unplaced = sum(1 for _, parent in placed if parent is None)
+            placed = [(f, parent) for f, parent in placed if parent is not None]
         
-        for file_path in files_to_upload:
-            file_id = self.upload_file(str(file_path), folder_id, show_progress)
-            if file_id:
-                stats['success'] += 1
-            else:
-                stats['failed'] += 1
+        uploads = [(file_path, parent, None) for file_path, parent in placed]
+        skipped = 0
+        if sync:
+            uploads = self._plan_sync(placed)
+            if uploads is None:
+                return {'success': 0, 'failed': len(files_to_upload)}
+            skipped = len(placed) - len(uploads)
+            print(f"🔄 Sync: {skipped} unchanged, "
+                  f"{sum(1 for u in uploads if u[2])} changed, "
+                  f"{sum(1 for u in uploads if not u[2])} new")
+        
+        try:
+            stats = self._upload_files(uploads, show_progress, jobs)
+        finally:
+            if self._manifest is not None:
+                self._manifest.save()
+            self.folder_cache.save()
+        stats['failed'] += unplaced
+        stats['skipped'] = skipped
         
         print(f"\n📈 Upload complete:")
         print(f"   ✅ Success: {stats['success']}")
         print(f"   ❌ Failed: {stats['failed']}")
+        if sync:
+            print(f"   ⏭️  Unchanged: {stats['skipped']}")
+        
+        return stats
+    
+    def _plan_sync(self, placed: List[tuple]) -> Optional[List[tuple]]:
+        """
+        Compare local files with the current contents of their Drive folders.
+        
+        Each folder is listed once, in batch requests when there are several.
+        A file is hashed only when a same-named,
+        same-sized Drive file exists and the manifest has no MD5 for its
+        current size and mtime.
+        
+        Args:
+            placed: (file_path, folder_id) pairs
+            
+        Returns:
+            (file_path, folder_id, existing_file_id) for each file that needs
+            uploading, or None if a folder couldn't be listed
+        """
+        folder_ids = sorted({folder_id for _, folder_id in placed})
+        if len(folder_ids) == 1:
+            listings = {folder_ids[0]: self.list_folder_files(folder_ids[0])}
+        else:
+            listings = self._list_children_batch(folder_ids, folders=False)
+        
+        remote_by_folder = {}
+        for folder_id, remote_files in listings.items():
+            if remote_files is None:
+                return None
+            remote_by_name = {}
+            for remote in remote_files:
+                remote_by_name.setdefault(remote['name'], remote)
+            remote_by_folder[folder_id] = remote_by_name
+        
+        if self._manifest is None:
+            self._manifest = SyncManifest(self.manifest_file)
+        
+        uploads = []
+        for file_path, folder_id in placed:
+            remote = remote_by_folder[folder_id].get(file_path.name)
+            if remote is None:
+                uploads.append((file_path, folder_id, None))
+            elif (int(remote.get('size', -1)) == file_path.stat().st_size
+                    and remote.get('md5Checksum') == self._manifest.local_md5(str(file_path))):
+                continue
+            else:
+                uploads.append((file_path, folder_id, remote['id']))
+        return uploads
+    
+    def _upload_files(self, uploads: List[tuple], show_progress: bool, jobs: int) -> Dict[str, int]:
+        """
+        Upload (file_path, parent_id, existing_file_id) entries, jobs at a time.
+        
+        Returns:
+            Dictionary with success and failed counts
+        """
+        stats = {'success': 0, 'failed': 0}
+        
+        if jobs > 1 and len(uploads) > 1:
+            total_bytes = sum(file_path.stat().st_size for file_path, _, _ in uploads)
+            progress = UploadProgress(total_bytes, show_progress)
+            try:
+                with ThreadPoolExecutor(max_workers=min(jobs, len(uploads))) as executor:
+                    futures = [
+                        executor.submit(self.upload_file, str(file_path), parent_id, show_progress,
+                                        progress, existing_id)
+                        for file_path, parent_id, existing_id in uploads
+                    ]
+                    for future in as_completed(futures):
+                        try:
+                            file_id = future.result()
+                        except Exception as e:
+                            progress.write(f"❌ Error uploading: {e}")
+                            file_id = None
+                        if file_id:
+                            stats['success'] += 1
+                        else:
+                            stats['failed'] += 1
+            finally:
+                progress.close()
+        else:
+            for file_path, parent_id, existing_id in uploads:
+                file_id = self.upload_file(str(file_path), parent_id, show_progress, file_id=existing_id)
+                if file_id:
+                    stats['success'] += 1
+                else:
+                    stats['failed'] += 1
         
         return stats
 
@@ -371,6 +1509,15 @@ Examples:
   # Upload with custom credentials file
   python upload_to_google_drive.py ./downloads/my_folder --credentials my_creds.json
 
+  # Upload four files at a time
+  python upload_to_google_drive.py ./downloads/my_folder --jobs 4
+
+  # Re-run on a folder, only uploading new and changed files
+  python upload_to_google_drive.py ./downloads/my_folder --sync
+
+  # Upload the whole downloads/ tree, one Drive folder per meeting
+  python upload_to_google_drive.py ./downloads --recursive --jobs 4
+
 Setup Instructions:
   1. Go to https://console.cloud.google.com/
   2. Create a new project or select existing
@@ -391,14 +1538,84 @@ Setup Instructions:
     parser.add_argument('--token', '-t', default='token.json',
                        help='Path to OAuth token file (default: token.json, only used for OAuth)')
     parser.add_argument('--no-progress', action='store_true', help='Disable progress bars')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                       help='Number of files to upload in parallel (default: 1)')
+    parser.add_argument('--chunk-size', type=float,
+                       help='Resumable upload chunk size in MiB, rounded to a multiple of 256 KiB '
+                            '(default: 100, or the starting size with --adaptive-chunks)')
+    parser.add_argument('--adaptive-chunks', action='store_true',
+                       help='Grow or shrink the chunk size from measured throughput and errors')
+    parser.add_argument('--journal', default='.upload_journal.json',
+                       help='File that records in-flight upload sessions so interrupted uploads resume '
+                            '(default: .upload_journal.json)')
+    parser.add_argument('--recursive', '-r', action='store_true',
+                       help='Also upload subdirectories, recreating them as Drive folders')
+    parser.add_argument('--folder-cache',
+                       help='Keep the Drive folder ID cache in this file between runs')
+    parser.add_argument('--multipart-threshold', type=float, default=MULTIPART_THRESHOLD / MiB,
+                       help='Files smaller than this many MiB are uploaded in one request '
+                            f'instead of a resumable session (default: {MULTIPART_THRESHOLD // MiB})')
+    parser.add_argument('--sync', action='store_true',
+                       help='Skip files already in the Drive folder unchanged and update changed ones in place')
+    parser.add_argument('--manifest', default='.drive_manifest.json',
+                       help='Local cache of file sizes, mtimes and MD5s used by --sync '
+                            '(default: .drive_manifest.json)')
+    parser.add_argument('--no-journal', action='store_true',
+                       help='Don\'t record or resume upload sessions')
+    parser.add_argument('--max-upload-rate', type=float, metavar='MIB_PER_SEC',
+                       help='Cap the combined upload speed of all files, in MiB/s')
+    parser.add_argument('--max-connections-per-host', type=int, metavar='N',
+                       help='Cap the number of open requests to the Drive API (default: no cap)')
+    parser.add_argument('--retries', type=int, default=5,
+                       help='Times to retry a 429/5xx response or dropped connection, with backoff, '
+                            'before a file fails (default: 5)')
+    parser.add_argument('--checksums', metavar='FILE',
+                       help='Record the size, MD5 and Drive file ID of every upload in this JSON file')
+    parser.add_argument('--sha256', action='store_true',
+                       help='Also compute SHA-256 checksums for --checksums')
+    add_metrics_arguments(parser)
     
     args = parser.parse_args()
     
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
+    if args.chunk_size is not None and args.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    
+    if args.retries < 0:
+        parser.error("--retries can't be negative")
+    
+    if args.max_upload_rate is not None and args.max_upload_rate <= 0:
+        parser.error("--max-upload-rate must be positive")
+    
+    if args.max_connections_per_host is not None and args.max_connections_per_host < 1:
+        parser.error("--max-connections-per-host must be at least 1")
+    
+    if args.sha256 and not args.checksums:
+        parser.error("--sha256 needs --checksums")
+    
+    metrics = metrics_from_args(args)
+    
     # Create uploader
     uploader = GoogleDriveUploader(
         auth_method=args.auth,
         credentials_file=args.credentials,
-        token_file=args.token
+        token_file=args.token,
+        chunk_size=round_chunk_size(args.chunk_size * MiB) if args.chunk_size else None,
+        adaptive_chunks=args.adaptive_chunks,
+        journal_file=None if args.no_journal else args.journal,
+        manifest_file=args.manifest,
+        folder_cache_file=args.folder_cache,
+        multipart_threshold=int(args.multipart_threshold * MiB),
+        # Quota errors shrink the number of files uploading at once
+        retry=RetryPolicy(attempts=args.retries, gate=ConcurrencyGate(args.jobs)),
+        limiter=TransferLimiter(
+            rate=args.max_upload_rate * MiB if args.max_upload_rate else None,
+            per_host=args.max_connections_per_host
+        ),
+        checksums=ChecksumManifest(args.checksums, sha256=args.sha256) if args.checksums else None,
+        metrics=metrics
     )
     
     # Authenticate
@@ -407,11 +1624,15 @@ Setup Instructions:
         sys.exit(1)
     
     # Upload folder
-    stats = uploader.upload_folder(
-        local_folder=args.folder,
-        drive_folder_name=args.drive_folder,
-        show_progress=not args.no_progress
-    )
+    with metrics.phase('upload_folder'):
+        stats = uploader.upload_folder(
+            local_folder=args.folder,
+            drive_folder_name=args.drive_folder,
+            show_progress=not args.no_progress,
+            jobs=args.jobs,
+            sync=args.sync,
+            recursive=args.recursive
+        )
     
     # Exit with appropriate code
     if stats['failed'] > 0:
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Zoom to Google Drive
+Downloads all files from a Zoom recording and uploads each one to Google
+Drive as soon as it has finished downloading, in a single process.
+"""
+
+import sys
+import queue
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from transfer_control import RetryPolicy, ConcurrencyGate, TransferLimiter, HostLimiter
+from transfer_integrity import ChecksumManifest
+from transfer_metrics import add_metrics_arguments, metrics_from_args
+from download_zoom_recordings import (
+    SCRAPE_CACHE_TTL, PlaywrightTimeoutError, CombinedProgress, ScrapeCache,
+    create_download_session, download_file, plan_downloads, stream_all,
+    connect_drive, fetch_recording, add_timeout_arguments, timeouts_from_args, add_browser_arguments
+)
+
+
+def transfer(download_links, download_folder, uploader, folder_id, jobs=4, upload_jobs=2,
+             segments=4, session=None, retry=None, limiter=None, checksums=None, on_downloads_done=None,
+             metrics=None):
+    """
+    Download every link into download_folder and upload it to Drive.
+    
+    Downloads run ``jobs`` at a time. Each finished file is handed to the
+    ``upload_jobs`` upload workers through a queue by its exact path, so
+    uploads start while the rest of the recording is still downloading.
+    ``retry`` and ``limiter`` are the RetryPolicy and TransferLimiter for
+    the downloads; uploads use the uploader's own. Downloads record their
+    checksums in ``checksums``, which should be the uploader's manifest
+    too so each file ends up with one entry covering both transfers.
+    Downloads are timed in ``metrics``; uploads in the uploader's.
+    ``on_downloads_done`` is called once every download has finished,
+    while the last uploads may still be running.
+    
+    Returns:
+        Dictionary with downloaded, uploaded and failed counts
+    """
+    planned = plan_downloads(download_links, download_folder)
+    stats = {'downloaded': 0, 'uploaded': 0, 'failed': 0}
+    stats_lock = threading.Lock()
+    ready = queue.Queue()
+    
+    def count(key):
+        with stats_lock:
+            stats[key] += 1
+    
+    download_progress = CombinedProgress(description="  Downloading")
+    upload_progress = CombinedProgress(description="  Uploading")
+    
+    def upload_worker():
+        while True:
+            filepath = ready.get()
+            if filepath is None:
+                return
+            upload_progress.add_total(filepath.stat().st_size)
+            try:
+                file_id = uploader.upload_file(str(filepath), folder_id, progress=upload_progress)
+            except Exception as e:
+                upload_progress.write(f"❌ Error uploading {filepath.name}: {e}")
+                file_id = None
+            count('uploaded' if file_id else 'failed')
+    
+    def download(link, filepath):
+        if download_file(link['url'], filepath, progress=download_progress,
+                         segments=segments, session=session, retry=retry, limiter=limiter,
+                         checksums=checksums, metrics=metrics):
+            count('downloaded')
+            ready.put(filepath)
+        else:
+            download_progress.write(f"  ✗ Failed to download {filepath.name}")
+            count('failed')
+    
+    workers = [threading.Thread(target=upload_worker, daemon=True)
+               for _ in range(max(1, min(upload_jobs, len(planned))))]
+    for worker in workers:
+        worker.start()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(planned)))) as executor:
+            futures = [executor.submit(download, link, filepath)
+                       for link, filename, filepath, file_type in planned]
+            for future in as_completed(futures):
+                future.result()
+        if on_downloads_done is not None:
+            on_downloads_done()
+    finally:
+        # One stop marker per worker, queued behind the files still to upload
+        for _ in workers:
+            ready.put(None)
+        for worker in workers:
+            worker.join()
+        download_progress.close()
+        upload_progress.close()
+    
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Download a Zoom recording and upload it to Google Drive',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  %(prog)s https://zoom.us/rec/share/xxxxx
+  %(prog)s https://zoom.us/rec/share/xxxxx "My Recordings"
+  %(prog)s https://zoom.us/rec/share/xxxxx --stream
+  %(prog)s https://zoom.us/rec/share/xxxxx --engine async
+  %(prog)s https://zoom.us/rec/share/xxxxx --auth service_account
+        """
+    )
+    parser.add_argument('url', help='Zoom recording URL')
+    parser.add_argument('drive_folder', nargs='?', default='Zoom Recordings',
+                       help='Google Drive folder to upload into (default: "Zoom Recordings")')
+    parser.add_argument('--jobs', '-j', type=int, default=4,
+                       help='Number of files to download in parallel (default: 4)')
+    parser.add_argument('--upload-jobs', type=int, default=2,
+                       help='Number of files to upload in parallel (default: 2)')
+    parser.add_argument('--segments', '-s', type=int, default=4,
+                       help='Parallel byte ranges per large file when the server supports it (default: 4)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Upload while downloading without keeping a local copy')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads',
+                       help='Run the transfers on threads or as asyncio tasks on one event loop '
+                            '(async needs httpx; default: threads)')
+    parser.add_argument('--discovery', choices=['auto', 'network', 'dom', 'selectors'], default='auto',
+                       help='How to find download links (default: auto)')
+    parser.add_argument('--visible', action='store_true', help='Show browser window')
+    parser.add_argument('--auth', '-a', choices=['oauth', 'service_account'], default='oauth',
+                       help='Google authentication method (default: oauth)')
+    parser.add_argument('--credentials', '-c',
+                       help='Google credentials file (default: client_secrets.json or service_account.json)')
+    parser.add_argument('--token', '-t', default='token.json',
+                       help='OAuth token file (default: token.json)')
+    parser.add_argument('--retries', type=int, default=5,
+                       help='Times to retry a dropped connection or a 429/5xx response, with backoff, '
+                            'before a file fails (default: 5)')
+    parser.add_argument('--max-download-rate', type=float, metavar='MIB_PER_SEC',
+                       help='Cap the combined download speed, in MiB/s')
+    parser.add_argument('--max-upload-rate', type=float, metavar='MIB_PER_SEC',
+                       help='Cap the combined upload speed, in MiB/s')
+    parser.add_argument('--max-connections-per-host', type=int, metavar='N',
+                       help='Cap the number of open requests to each server (default: no cap)')
+    parser.add_argument('--journal', default='.upload_journal.json',
+                       help='File that records in-flight upload sessions so interrupted uploads resume '
+                            '(default: .upload_journal.json)')
+    parser.add_argument('--cache-file', default='.zoom_scrape_cache.json',
+                       help='Where scraped recording details are cached so a re-run can skip the browser '
+                            'while the download links still work (default: .zoom_scrape_cache.json)')
+    parser.add_argument('--cache-ttl', type=float, default=SCRAPE_CACHE_TTL / 60, metavar='MINUTES',
+                       help='How long cached recording details are reused (default: 30)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always scrape the recording page')
+    parser.add_argument('--checksums', metavar='FILE',
+                       help='Record the size, MD5 and Drive file ID of every file in this JSON file')
+    parser.add_argument('--sha256', action='store_true',
+                       help='Also compute SHA-256 checksums for --checksums')
+    add_timeout_arguments(parser)
+    add_browser_arguments(parser)
+    add_metrics_arguments(parser)
+    
+    args = parser.parse_args()
+    
+    if args.jobs < 1 or args.upload_jobs < 1 or args.segments < 1:
+        parser.error("--jobs, --upload-jobs and --segments must be at least 1")
+    if args.retries < 0:
+        parser.error("--retries can't be negative")
+    for rate in (args.max_download_rate, args.max_upload_rate):
+        if rate is not None and rate <= 0:
+            parser.error("--max-download-rate and --max-upload-rate must be positive")
+    if args.max_connections_per_host is not None and args.max_connections_per_host < 1:
+        parser.error("--max-connections-per-host must be at least 1")
+    if args.sha256 and not args.checksums:
+        parser.error("--sha256 needs --checksums")
+    if args.cache_ttl < 0:
+        parser.error("--cache-ttl can't be negative")
+    if args.engine == 'async' and args.stream:
+        parser.error("--engine async doesn't support --stream")
+    
+    # Each direction has its own bandwidth; the per-host caps are shared
+    hosts = HostLimiter(args.max_connections_per_host) if args.max_connections_per_host else None
+    download_limiter = TransferLimiter(
+        rate=args.max_download_rate * 1024 * 1024 if args.max_download_rate else None, hosts=hosts)
+    upload_limiter = TransferLimiter(
+        rate=args.max_upload_rate * 1024 * 1024 if args.max_upload_rate else None, hosts=hosts)
+    checksums = ChecksumManifest(args.checksums, sha256=args.sha256) if args.checksums else None
+    metrics = metrics_from_args(args)
+    
+    zoom_url = args.url.strip()
+    if not zoom_url.startswith('http'):
+        print(f"Error: Invalid URL. Must start with http:// or https://")
+        sys.exit(1)
+    
+    print(f"=== Zoom to Google Drive ===\n")
+    print(f"📍 URL: {zoom_url}")
+    print(f"☁️  Drive folder: {args.drive_folder}\n")
+    
+    # Authenticate once, before the browser starts
+    uploader, folder_id = connect_drive(
+        args, args.drive_folder, journal_file=args.journal,
+        retry=RetryPolicy(attempts=args.retries, gate=ConcurrencyGate(args.upload_jobs)),
+        limiter=upload_limiter,
+        checksums=checksums,
+        metrics=metrics
+    )
+    
+    cache = None
+    if not args.no_cache:
+        cache = ScrapeCache(args.cache_file, ttl=args.cache_ttl * 60)
+    
+    try:
+        # Only starts the browser when the cache can't be used
+        result = fetch_recording(zoom_url, headless=not args.visible, discovery=args.discovery, cache=cache,
+                                 metrics=metrics, timeouts=timeouts_from_args(args),
+                                 lean=not args.full_browser, storage_state=args.browser_state)
+        
+        if result['status'] == 'auth_failed':
+            print("\n❌ Failed to authenticate. Exiting.")
+            sys.exit(1)
+        if result['status'] == 'no_links':
+            print("\n⚠️  No download links found on the page.")
+            print("   Try download_zoom_recordings.py with --visible to see what the script sees.")
+            sys.exit(1)
+        
+        download_links = result['links']
+        print(f"✓ Found {len(download_links)} file(s)\n")
+        
+        session = None
+        if args.engine == 'threads':
+            session = create_download_session(
+                cookies=result['cookies'],
+                referer=result['page_url'],
+                pool_size=args.jobs * args.segments
+            )
+        
+        if args.stream:
+            with metrics.phase('stream_to_drive'):
+                successful, failed = stream_all(download_links, uploader, folder_id,
+                                                jobs=args.jobs, upload_jobs=args.upload_jobs,
+                                                session=session, retry=RetryPolicy(attempts=args.retries),
+                                                limiter=download_limiter, metrics=metrics)
+            stats = {'downloaded': successful, 'uploaded': successful, 'failed': failed}
+            download_folder = None
+        else:
+            download_folder = Path("downloads") / result['folder_name']
+            download_folder.mkdir(parents=True, exist_ok=True)
+            print(f"📁 Download folder: {download_folder.absolute()}\n")
+            if args.engine == 'async':
+                import async_transfer
+                with metrics.phase('transfer', engine='async'):
+                    stats = async_transfer.transfer(
+                        download_links, download_folder, uploader, folder_id,
+                        cookies=result['cookies'], referer=result['page_url'],
+                        jobs=args.jobs, upload_jobs=args.upload_jobs, segments=args.segments,
+                        retry=RetryPolicy(attempts=args.retries, gate=ConcurrencyGate(args.jobs)),
+                        limiter=download_limiter, checksums=checksums, metrics=metrics
+                    )
+            else:
+                with metrics.phase('transfer'):
+                    stats = transfer(download_links, download_folder, uploader, folder_id,
+                                     jobs=args.jobs, upload_jobs=args.upload_jobs,
+                                     segments=args.segments, session=session,
+                                     retry=RetryPolicy(attempts=args.retries, gate=ConcurrencyGate(args.jobs)),
+                                     limiter=download_limiter, checksums=checksums, metrics=metrics)
+        if session is not None:
+            session.close()
+        if stats['failed'] > 0 and cache is not None:
+            cache.remove(zoom_url)  # The links may have expired; scrape again next time
+    
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Cancelled by user.")
+        sys.exit(130)
+    except PlaywrightTimeoutError:
+        print("\n❌ Error: Timeout loading page. Please check the URL and try again.")
+        sys.exit(1)
+    
+    # Summary
+    print("\n" + "="*60)
+    print(f"📊 Summary:")
+    print(f"  ✓ Downloaded: {stats['downloaded']}")
+    print(f"  ✓ Uploaded: {stats['uploaded']}")
+    if stats['failed'] > 0:
+        print(f"  ✗ Failed: {stats['failed']}")
+    if download_folder is not None:
+        print(f"  📁 Local copy: {download_folder.absolute()}")
+    print(f"  ☁️  Drive folder: {args.drive_folder}")
+    print("="*60)
+    
+    sys.exit(1 if stats['failed'] > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()